@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Benchmark live chat replay conversion.
+
+Usage:
+    python bench_livechat.py path/to/video.live_chat.json
+    python bench_livechat.py --synthetic 500000
+
+Times JSON decoding and the full NDJSON -> CSV conversion with every JSON
+backend that is installed (see json_codec.py), plus the lazy field
+extraction fast path when pysimdjson is installed. --extract instead
+microbenchmarks row extraction alone (decoded objects -> rows, no JSON
+parsing or I/O) and reports the cost per message by renderer type. Use a real replay from a long
+stream where possible; --synthetic writes a temporary replay of N lines shaped
+like yt-dlp's output (mostly liveChatTextMessageRenderer, some Super Chats,
+memberships and non-chat actions).
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import json_codec
+from livechat_to_csv import LiveChatConverter
+
+BASE_TS_USEC = 1_700_000_000_000_000
+
+
+def _text_item(i, ts_usec):
+    return {
+        'liveChatTextMessageRenderer': {
+            'message': {'runs': [
+                {'text': f'message number {i} with a few words of chat '},
+                {'emoji': {
+                    'emojiId': 'UCkszU2WH9gy1mb0dV-11UJg/hfJ8Y8X6OYT6gQSw2YuQDw',
+                    'shortcuts': [':face-blue-smiling:'],
+                    'image': {
+                        'thumbnails': [{'url': 'https://yt3.ggpht.com/emoji=w24-h24-c-k-nd', 'width': 24, 'height': 24}],
+                        'accessibility': {'accessibilityData': {'label': 'face-blue-smiling'}},
+                    },
+                }},
+            ]},
+            'authorName': {'simpleText': f'viewer{i % 5000}'},
+            'authorPhoto': {'thumbnails': [
+                {'url': f'https://yt4.ggpht.com/ytc/photo{i % 5000}=s32-c-k-c0x00ffffff-no-rj', 'width': 32, 'height': 32},
+                {'url': f'https://yt4.ggpht.com/ytc/photo{i % 5000}=s64-c-k-c0x00ffffff-no-rj', 'width': 64, 'height': 64},
+            ]},
+            'contextMenuEndpoint': {
+                'clickTrackingParams': 'CAEQl98BIhMIp5O6lMeXgQMVxw0GAB0bVwXc',
+                'commandMetadata': {'webCommandMetadata': {'ignoreNavigation': True}},
+                'liveChatItemContextMenuEndpoint': {'params': 'Q2g0S0hEb2FRMm8zZDFsSlJVTkpTbmRDUkVkQ1FVRXdRVTV2T1dkUmJrRXhSQ2dGSnVRaVFUVkViVWM1'},
+            },
+            'id': f'ChwKGkNJLWU0WmJIbDRFREZUbkNDZ1FkN{i:08d}',
+            'timestampUsec': str(ts_usec),
+            'authorBadges': [{'liveChatAuthorBadgeRenderer': {
+                'icon': {'iconType': 'MODERATOR'}, 'tooltip': 'Moderator',
+                'accessibility': {'accessibilityData': {'label': 'Moderator'}},
+            }}] if i % 200 == 0 else [],
+            'authorExternalChannelId': f'UC{i % 5000:022d}',
+            'contextMenuAccessibility': {'accessibilityData': {'label': 'Chat actions'}},
+        }
+    }
+
+
+def _paid_item(i, ts_usec):
+    return {
+        'liveChatPaidMessageRenderer': {
+            'id': f'paid{i}',
+            'timestampUsec': str(ts_usec),
+            'authorName': {'simpleText': f'viewer{i % 5000}'},
+            'purchaseAmountText': {'simpleText': '$5.00'},
+            'message': {'runs': [{'text': 'thanks for the stream!'}]},
+            'headerBackgroundColor': 4280191205,
+            'bodyBackgroundColor': 4280150454,
+        }
+    }
+
+
+def _membership_item(i, ts_usec):
+    return {
+        'liveChatMembershipItemRenderer': {
+            'id': f'member{i}',
+            'timestampUsec': str(ts_usec),
+            'authorName': {'simpleText': f'viewer{i % 5000}'},
+            'headerSubtext': {'runs': [{'text': 'Welcome to '}, {'text': 'the channel'}]},
+            'authorBadges': [{'liveChatAuthorBadgeRenderer': {'tooltip': 'New member'}}],
+        }
+    }
+
+
+def write_synthetic_replay(path, lines, seed=0):
+    """Write a replay of the given number of lines shaped like yt-dlp's .live_chat.json."""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(lines):
+            offset_msec = i * 250
+            ts_usec = BASE_TS_USEC + offset_msec * 1000 + rng.randint(0, 3_000_000)
+            roll = rng.random()
+            if roll < 0.04:
+                action = {'markChatItemAsDeletedAction': {'targetItemId': f'id{i}'}}
+            else:
+                if roll < 0.06:
+                    item = _paid_item(i, ts_usec)
+                elif roll < 0.07:
+                    item = _membership_item(i, ts_usec)
+                else:
+                    item = _text_item(i, ts_usec)
+                action = {
+                    'clickTrackingParams': 'CAEQl98BIhMIp5O6lMeXgQMVxw0GAB0bVwXc',
+                    'addChatItemAction': {'item': item, 'clientId': f'CPr{i:010d}'},
+                }
+            obj = {
+                'clickTrackingParams': 'CAEQl98BIhMIp5O6lMeXgQMVxw0GAB0bVwXc',
+                'replayChatItemAction': {'actions': [action], 'videoOffsetTimeMsec': str(offset_msec)},
+                'isLive': True,
+            }
+            f.write(json.dumps(obj, separators=(',', ':')) + '\n')
+
+
+def bench_decode(path):
+    """Decode every line with the current backend. Returns (seconds, lines)."""
+    lines = 0
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                json_codec.loads(line)
+                lines += 1
+    return time.perf_counter() - start, lines
+
+
+def bench_convert(path, csv_path, lazy=False):
+    """Run the full conversion with the current backend. Returns stats dict."""
+    return LiveChatConverter(lazy=lazy).convert(path, csv_path)
+
+
+def bench_extract(path, limit=200_000, repeat=5):
+    """
+    Per-message cost of LiveChatConverter.extract_message_info() on already
+    decoded lines, best of `repeat` runs. Returns {renderer type: (messages, ns per message)}.
+    """
+    by_type = {}
+    with open(path, 'rb') as f:
+        for line in f:
+            if len(by_type) and sum(len(v) for v in by_type.values()) >= limit:
+                break
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                continue
+            info = LiveChatConverter(lazy=False).extract_message_info(obj)
+            kind = info.type if info else 'none'
+            by_type.setdefault(kind, []).append(obj)
+
+    results = {}
+    for kind, objs in sorted(by_type.items()):
+        best = None
+        for _ in range(repeat):
+            converter = LiveChatConverter(lazy=False)
+            extract = converter.extract_message_info
+            start = time.perf_counter()
+            for obj in objs:
+                extract(obj)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[kind] = (len(objs), best / len(objs) * 1e9)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark live chat replay conversion')
+    parser.add_argument('input', nargs='?', help='Path to a .live_chat.json replay')
+    parser.add_argument('--synthetic', type=int, metavar='LINES',
+                        help='Benchmark a generated replay of this many lines instead')
+    parser.add_argument('--backends', nargs='+', choices=json_codec.BACKENDS,
+                        help='Backends to compare (default: all installed)')
+    parser.add_argument('--extract', action='store_true',
+                        help='Only microbenchmark row extraction per message (no JSON decoding)')
+    args = parser.parse_args()
+
+    if not args.input and not args.synthetic:
+        parser.error('pass a replay file or --synthetic LINES')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.input
+        if not path:
+            path = os.path.join(tmp, 'synthetic.live_chat.json')
+            write_synthetic_replay(path, args.synthetic)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        if args.extract:
+            print(f"Input: {path} ({size_mb:,.1f} MB)")
+            print(f"{'type':<14} {'messages':>9} {'ns/msg':>8}")
+            for kind, (count, ns) in bench_extract(path).items():
+                print(f"{kind:<14} {count:>9,} {ns:>8,.0f}")
+            return
+        csv_path = os.path.join(tmp, 'bench.csv')
+        # Stdlib first so the others can be reported as a speedup over it
+        backends = sorted(args.backends or json_codec.available_backends(), key=lambda n: n != 'json')
+
+        print(f"Input: {path} ({size_mb:,.1f} MB)")
+        print(f"{'backend':<10} {'decode s':>9} {'decode MB/s':>12} {'convert s':>10} {'rows/sec':>10} {'speedup':>8}")
+        baseline = None
+        for name in backends:
+            if json_codec.use_backend(name) != name:
+                print(f"{name:<10} not installed")
+                continue
+            decode_s, _ = bench_decode(path)
+            stats = bench_convert(path, csv_path)
+            if name == 'json':
+                baseline = stats['seconds']
+            rate = stats['rows'] / stats['seconds'] if stats['seconds'] else 0.0
+            speedup = f"{baseline / stats['seconds']:.2f}x" if baseline else ''
+            print(f"{name:<10} {decode_s:>9.2f} {size_mb / decode_s:>12.1f} "
+                  f"{stats['seconds']:>10.2f} {rate:>10,.0f} {speedup:>8}")
+
+        if json_codec.LAZY:
+            # Lazy fast path for chat lines; other lines still use the stdlib
+            json_codec.use_backend('json')
+            stats = bench_convert(path, csv_path, lazy=True)
+            rate = stats['rows'] / stats['seconds'] if stats['seconds'] else 0.0
+            speedup = f"{baseline / stats['seconds']:.2f}x" if baseline else ''
+            print(f"{'lazy':<10} {'':>9} {'':>12} {stats['seconds']:>10.2f} {rate:>10,.0f} {speedup:>8}")
+        json_codec.use_backend()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+# Columnar (Parquet) output for the chat converters.
+# Typed columns instead of CSV text: timestamps as int64 microseconds (Arrow
+# timestamp[us, UTC]), type/role as dictionary-encoded categoricals, amounts as
+# decimals. Readers can load just the columns they need.
+# pyarrow is optional and only imported when Parquet output is requested.
+
+import re
+from decimal import Decimal, InvalidOperation
+
+# Rows are buffered and written as one Arrow record batch (Parquet row group
+# chunk) at a time, so memory stays bounded for long streams.
+BATCH_ROWS = 65536
+
+# Amount as shown by the platform: '$5.00', 'CA$10.00', '¥1,000', '100.00 ₹'
+_AMOUNT_RE = re.compile(r'^\s*([^\d\s.,]*)\s*(\d[\d,]*(?:\.\d+)?)\s*([^\d\s.,]*)\s*$')
+_AMOUNT_SCALE = Decimal('0.001')
+
+
+def require_pyarrow():
+    """Import pyarrow and pyarrow.parquet, with an install hint if missing."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet output requires pyarrow: pip install pyarrow") from None
+    return pyarrow, pyarrow.parquet
+
+
+def parse_amount(text):
+    """
+    Split a display amount into (Decimal value, currency symbol).
+    Returns (None, '') for empty or unrecognised amounts.
+    """
+    if not text:
+        return None, ''
+    match = _AMOUNT_RE.match(str(text))
+    if not match:
+        return None, ''
+    prefix, number, suffix = match.groups()
+    try:
+        value = Decimal(number.replace(',', '')).quantize(_AMOUNT_SCALE)
+    except InvalidOperation:
+        return None, ''
+    return value, prefix or suffix
+
+
+def _categorical(pa):
+    return pa.dictionary(pa.int16(), pa.string())
+
+
+def replay_schema():
+    """Schema for YouTube live chat replays (livechat_to_csv.py)."""
+    pa, _ = require_pyarrow()
+    return pa.schema([
+        ('timestamp', pa.timestamp('us', tz='UTC')),
+        ('author', pa.string()),
+        ('message', pa.string()),
+        ('type', _categorical(pa)),
+        ('amount', pa.decimal128(18, 3)),
+        ('currency', _categorical(pa)),
+        ('extra', pa.string()),
+        ('role', _categorical(pa)),
+    ])
+
+
+def kick_chat_schema():
+    """Schema for Kick VOD chat (kick_vod_downloader.py)."""
+    pa, _ = require_pyarrow()
+    return pa.schema([
+        ('vod_offset', pa.duration('s')),
+        ('timestamp', pa.timestamp('us', tz='UTC')),
+        ('username', pa.string()),
+        ('user_id', pa.int64()),
+        ('message', pa.string()),
+        ('type', _categorical(pa)),
+        ('badges', pa.string()),
+        ('color', _categorical(pa)),
+        ('amount', pa.decimal128(18, 3)),
+        ('message_id', pa.string()),
+        ('metadata', pa.string()),
+    ])
+
+
+class ParquetChatWriter:
+    """Write dict rows (keyed by schema column name) to a Parquet file in batches."""
+
+    def __init__(self, path, schema, batch_rows=BATCH_ROWS):
+        self._pa, pq = require_pyarrow()
+        self.schema = schema
+        self.batch_rows = batch_rows
+        self._columns = {name: [] for name in schema.names}
+        self._pending = 0
+        self._writer = pq.ParquetWriter(path, schema, compression='zstd')
+
+    def write(self, row):
+        for name, column in self._columns.items():
+            column.append(row.get(name))
+        self._pending += 1
+        if self._pending >= self.batch_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        arrays = [
+            self._pa.array(self._columns[field.name], type=field.type)
+            for field in self.schema
+        ]
+        self._writer.write_batch(self._pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        for column in self._columns.values():
+            column.clear()
+        self._pending = 0
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,116 @@
+# Per-file instrumentation for the conversion steps (live chat, transcripts,
+# comments): counters for lines read, rows written and rows skipped by reason,
+# per-renderer counts, and time split into decode / extract / write.
+# Collecting is opt-in: a converter given no ConversionMetrics does no extra work.
+
+import json
+import sys
+import time
+from collections import Counter
+
+PHASES = ('decode', 'extract', 'write')
+# Only the first few error messages are kept; the rest are just counted
+MAX_ERRORS = 20
+
+
+class ConversionMetrics:
+    """
+    Counters and phase timings for one converted file.
+    The converter fills it in as it goes; to_dict() gives the JSON-ready summary.
+    In multi-process runs each worker fills its own and the parent merge()s them,
+    so phase times are summed over workers and can exceed the wall-clock seconds.
+    """
+
+    def __init__(self, kind, input_path=None, output_path=None):
+        self.kind = kind
+        self.input_path = input_path
+        self.output_path = output_path
+        self.lines = 0
+        self.rows = 0
+        self.skipped = Counter()
+        self.renderers = Counter()
+        self.timings = dict.fromkeys(PHASES, 0.0)
+        self.seconds = 0.0
+        self.errors = []
+
+    def skip(self, reason, count=1):
+        self.skipped[reason] += count
+
+    def error(self, exc):
+        """Count a row lost to an exception, keeping the first MAX_ERRORS messages."""
+        self.skipped['error'] += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(f"{type(exc).__name__}: {exc}")
+
+    def merge(self, other):
+        """Add another ConversionMetrics (or its to_dict()) for part of the same file."""
+        if isinstance(other, ConversionMetrics):
+            other = other.to_dict()
+        self.lines += other['lines']
+        self.rows += other['rows']
+        self.skipped.update(other['skipped'])
+        self.renderers.update(other['renderers'])
+        for phase in PHASES:
+            self.timings[phase] += other['timings'][phase]
+        self.errors.extend(other['errors'][:MAX_ERRORS - len(self.errors)])
+
+    def to_dict(self):
+        return {
+            'kind': self.kind,
+            'input': self.input_path,
+            'output': self.output_path,
+            'lines': self.lines,
+            'rows': self.rows,
+            'skipped': dict(self.skipped.most_common()),
+            'renderers': dict(self.renderers.most_common()),
+            'timings': {phase: round(self.timings[phase], 6) for phase in PHASES},
+            'seconds': round(self.seconds, 6),
+            'errors': list(self.errors),
+        }
+
+
+class Stopwatch:
+    """Times consecutive phases: lap('decode') charges the time since the previous lap."""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self.start = self.last = time.perf_counter()
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.metrics.timings[phase] += now - self.last
+        self.last = now
+
+    def stop(self):
+        self.metrics.seconds += time.perf_counter() - self.start
+
+
+def summarize(files):
+    """JSON-ready summary of several files' metrics (ConversionMetrics or dicts), with totals."""
+    files = [m.to_dict() if isinstance(m, ConversionMetrics) else m for m in files]
+    totals = {'files': len(files), 'lines': 0, 'rows': 0, 'seconds': 0.0}
+    skipped = Counter()
+    timings = dict.fromkeys(PHASES, 0.0)
+    for m in files:
+        totals['lines'] += m['lines']
+        totals['rows'] += m['rows']
+        totals['seconds'] += m['seconds']
+        skipped.update(m['skipped'])
+        for phase in PHASES:
+            timings[phase] += m['timings'][phase]
+    totals['seconds'] = round(totals['seconds'], 6)
+    totals['skipped'] = dict(skipped.most_common())
+    totals['timings'] = {phase: round(timings[phase], 6) for phase in PHASES}
+    return {'files': files, 'totals': totals}
+
+
+def write_summary(path, files):
+    """Write summarize(files) as JSON to path, or to stdout if path is '-'."""
+    summary = summarize(files)
+    if path == '-':
+        json.dump(summary, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+    return summary
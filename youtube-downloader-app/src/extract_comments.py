@@ -4,19 +4,26 @@
 
 import json
 import csv
-from datetime import datetime, timezone
-import pytz
+
+import timefmt
+from conversion_metrics import Stopwatch
 
 def convert_to_eastern(timestamp):
     """Convert UTC timestamp (seconds) to US/Eastern time string."""
-    utc_dt = datetime.fromtimestamp(int(timestamp), tz=timezone.utc)
-    eastern_dt = utc_dt.astimezone(pytz.timezone('US/Eastern'))
-    return eastern_dt.strftime('%Y-%m-%d %H:%M:%S')
+    return timefmt.formatter('US/Eastern').format_epoch(int(timestamp))
 
-def extract_comments_to_csv(json_path, csv_path):
+def extract_comments_to_csv(json_path, csv_path, metrics=None):
+    """
+    Write the comments in a yt-dlp .info.json to CSV.
+    With metrics (a conversion_metrics.ConversionMetrics), records comments
+    read and written and load/extract/write timings.
+    """
+    watch = Stopwatch(metrics) if metrics is not None else None
     with open(json_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
     comments = data.get('comments', [])
+    if watch:
+        watch.lap('decode')
     columns = [
         'id', 'parent', 'text', 'like_count', 'author', 'author_id', 'author_url',
         'author_is_uploader', 'author_is_verified', 'is_favorited', 'is_pinned',
@@ -32,5 +39,16 @@ def extract_comments_to_csv(json_path, csv_path):
             # Construct author_url if missing
             if not row['author_url'] and row['author_id']:
                 row['author_url'] = f"https://www.youtube.com/channel/{row['author_id']}"
+            if watch:
+                watch.lap('extract')
             writer.writerow(row)
+            if watch:
+                watch.lap('write')
+    if watch:
+        watch.lap('write')  # Final flush on close
+        watch.stop()
+        metrics.input_path = json_path
+        metrics.output_path = csv_path
+        metrics.lines += len(comments)
+        metrics.rows += len(comments)
     print(f"CSV file '{csv_path}' created with {len(comments)} comments.")
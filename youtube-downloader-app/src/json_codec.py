@@ -0,0 +1,137 @@
+# Pluggable JSON decoding for the chat parsers.
+# Uses the fastest backend that is installed: orjson, then pysimdjson, then the
+# standard library. Set CHAT_JSON_BACKEND=orjson|simdjson|json to force one.
+
+import json
+import os
+import threading
+
+BACKENDS = ('orjson', 'simdjson', 'json')
+
+# Every backend raises a ValueError subclass on malformed input (json and
+# orjson raise JSONDecodeError, simdjson raises ValueError, and undecodable
+# bytes raise UnicodeDecodeError), so callers catch this one type.
+DecodeError = ValueError
+
+BACKEND = 'json'
+loads = json.loads
+
+try:
+    import simdjson as _simdjson
+except ImportError:
+    _simdjson = None
+
+# True when parse_lazy() can skip building the object tree (pysimdjson installed)
+LAZY = _simdjson is not None
+_local = threading.local()
+
+
+def _backend_loads(name):
+    """Return the loads() function for a backend, or raise ImportError."""
+    if name == 'orjson':
+        import orjson
+        return orjson.loads
+    if name == 'simdjson':
+        import simdjson
+        return simdjson.loads
+    if name == 'json':
+        return json.loads
+    raise ImportError(f"Unknown JSON backend: {name!r}")
+
+
+def available_backends():
+    """Names of the installed backends, fastest first."""
+    names = []
+    for name in BACKENDS:
+        try:
+            _backend_loads(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def use_backend(name=None):
+    """
+    Switch the module-level loads() to the named backend, or to the fastest
+    installed one if name is None. An unavailable name falls back to the
+    automatic choice. Returns the backend actually selected.
+    """
+    global BACKEND, loads
+    candidates = ((name,) if name else ()) + BACKENDS
+    for candidate in candidates:
+        try:
+            loads = _backend_loads(candidate)
+        except ImportError:
+            continue
+        BACKEND = candidate
+        break
+    return BACKEND
+
+
+def parse_lazy(data):
+    """
+    Parse a document without materialising it, when pysimdjson is installed;
+    otherwise decode it fully with loads(). Pull fields out with JsonPath.
+    A lazy document is only valid until the next parse_lazy() call in the
+    same thread, and that call fails while any part of the previous document
+    is still referenced — convert values you keep with to_python().
+    """
+    if _simdjson is None:
+        return loads(data)
+    parser = getattr(_local, 'parser', None)
+    if parser is None:
+        parser = _local.parser = _simdjson.Parser()
+    return parser.parse(data)
+
+
+def prefer_lazy():
+    """
+    Whether parse_lazy() + JsonPath beats a full loads() for pulling a few
+    fields out of a chat line. True when pysimdjson is installed and the
+    loads() backend is not orjson: orjson's full decode is faster than lazy
+    pointer lookups driven from Python.
+    """
+    return LAZY and BACKEND != 'orjson'
+
+
+def to_python(value):
+    """Convert a lazy object or array to plain dicts and lists; other values pass through."""
+    if _simdjson is not None:
+        if isinstance(value, _simdjson.Object):
+            return value.as_dict()
+        if isinstance(value, _simdjson.Array):
+            return value.as_list()
+    return value
+
+
+class JsonPath:
+    """
+    A precompiled path of keys and list indexes into a document.
+    Works on decoded dicts/lists and on lazy pysimdjson documents, where it
+    becomes a single JSON Pointer lookup instead of a chain of .get() calls.
+    """
+
+    __slots__ = ('keys', 'pointer')
+
+    def __init__(self, *keys):
+        self.keys = keys
+        self.pointer = ''.join(
+            '/' + str(key).replace('~', '~0').replace('/', '~1') for key in keys
+        )
+
+    def get(self, doc, default=None):
+        if isinstance(doc, (dict, list)):
+            try:
+                for key in self.keys:
+                    doc = doc[key]
+            except (KeyError, IndexError, TypeError):
+                return default
+            return doc
+        try:
+            return doc.at_pointer(self.pointer)
+        except (KeyError, IndexError, TypeError, ValueError, AttributeError):
+            return default
+
+
+use_backend(os.environ.get('CHAT_JSON_BACKEND') or None)
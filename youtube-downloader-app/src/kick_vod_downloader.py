@@ -1,4 +1,4 @@
-# Downloads a Kick.com VOD video and its full chat history to CSV + NDJSON.
+# Downloads a Kick.com VOD video and its full chat history to CSV (or Parquet) + NDJSON.
 # Chat is fetched via time-windowed polling of the Kick chat history API.
 
 import csv
@@ -150,7 +150,7 @@ def extract_message_row(msg: dict) -> dict:
 
 
 def download_chat(channel_id: int, start_dt: datetime, duration_secs: int,
-                  output_base: str, chat_delay_ms: int):
+                  output_base: str, chat_delay_ms: int, chat_format: str = "csv"):
     end_dt = start_dt + timedelta(seconds=duration_secs)
     total_windows = (duration_secs + CHAT_WINDOW_SECS - 1) // CHAT_WINDOW_SECS
     current = start_dt
@@ -193,6 +193,10 @@ def download_chat(channel_id: int, start_dt: datetime, duration_secs: int,
             f.write(json.dumps(msg, ensure_ascii=False) + "\n")
     click.echo(f"  Raw NDJSON: {ndjson_path}")
 
+    if chat_format == "parquet":
+        _write_chat_parquet(all_messages, start_dt, output_base + "_chat.parquet")
+        return
+
     csv_path = output_base + "_chat.csv"
     fieldnames = ["vod_offset", "timestamp", "username", "user_id", "message", "type",
                   "badges", "color", "amount", "message_id", "metadata"]
@@ -201,18 +205,49 @@ def download_chat(channel_id: int, start_dt: datetime, duration_secs: int,
         writer.writeheader()
         for msg in all_messages:
             row = extract_message_row(msg)
-            try:
-                msg_dt = parse_kick_datetime(msg.get("created_at", ""))
-                offset_secs = int((msg_dt - start_dt).total_seconds())
-                h, rem = divmod(max(offset_secs, 0), 3600)
+            offset_secs = _vod_offset_secs(msg, start_dt)
+            if offset_secs is None:
+                row["vod_offset"] = ""
+            else:
+                h, rem = divmod(offset_secs, 3600)
                 m, s = divmod(rem, 60)
                 row["vod_offset"] = f"{h}:{m:02}:{s:02}"
-            except (click.ClickException, ValueError):
-                row["vod_offset"] = ""
             writer.writerow(row)
     click.echo(f"  Chat CSV:   {csv_path}")
 
 
+def _vod_offset_secs(msg: dict, start_dt: datetime) -> int | None:
+    """Seconds from VOD start to the message (clamped at 0), or None if unparseable."""
+    try:
+        msg_dt = parse_kick_datetime(msg.get("created_at", ""))
+    except (click.ClickException, ValueError):
+        return None
+    return max(int((msg_dt - start_dt).total_seconds()), 0)
+
+
+def _write_chat_parquet(all_messages: list, start_dt: datetime, parquet_path: str):
+    """Write chat as typed Parquet columns (see chat_columnar.py)."""
+    from chat_columnar import ParquetChatWriter, kick_chat_schema, parse_amount
+
+    with ParquetChatWriter(parquet_path, kick_chat_schema()) as writer:
+        for msg in all_messages:
+            row = extract_message_row(msg)
+            row["vod_offset"] = _vod_offset_secs(msg, start_dt)
+            try:
+                row["timestamp"] = parse_kick_datetime(msg.get("created_at", ""))
+            except (click.ClickException, ValueError):
+                row["timestamp"] = None
+            try:
+                row["user_id"] = int(row["user_id"])
+            except (TypeError, ValueError):
+                row["user_id"] = None
+            row["amount"], _ = parse_amount(row["amount"])
+            for key in ("type", "color"):
+                row[key] = row[key] or None
+            writer.write(row)
+    click.echo(f"  Chat Parquet: {parquet_path}")
+
+
 def get_new_output_folder(base_name="kick_output"):
     i = 1
     while True:
@@ -231,7 +266,9 @@ def get_new_output_folder(base_name="kick_output"):
               help="Download chat only, skip video.")
 @click.option("--chat-delay", default=DEFAULT_CHAT_DELAY_MS, show_default=True,
               help="Delay between chat API requests in milliseconds (min 100).")
-def main(url, video_only, chat_only, chat_delay):
+@click.option("--chat-format", type=click.Choice(["csv", "parquet"]), default="csv", show_default=True,
+              help="Chat output format; parquet writes typed columns and needs pyarrow.")
+def main(url, video_only, chat_only, chat_delay, chat_format):
     """Download a Kick.com VOD and its full chat history.
 
     URL must be a Kick VOD URL containing a UUID:
@@ -242,6 +279,7 @@ def main(url, video_only, chat_only, chat_delay):
       - metadata.json        Raw VOD metadata from Kick API
       - <title>_chat.ndjson  Raw chat messages (one JSON object per line)
       - <title>_chat.csv     Chat in CSV (timestamp, username, message, type, badges, ...)
+                             or <title>_chat.parquet with --chat-format parquet
       - <title>.mp4          Video (unless --chat-only)
     """
     if video_only and chat_only:
@@ -321,6 +359,7 @@ def main(url, video_only, chat_only, chat_delay):
                 duration_secs=duration_secs,
                 output_base=safe_title,
                 chat_delay_ms=chat_delay,
+                chat_format=chat_format,
             )
 
     finally:
@@ -1,30 +1,95 @@
-import json
+import argparse
 import csv
-from datetime import datetime, timezone
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
 
-BASE_STREAM_TS_USEC = None
+import json_codec
+import timefmt
+from conversion_metrics import ConversionMetrics, write_summary
 
+# Read buffer for the NDJSON input. Lines are decoded and written one at a
+# time, so this (plus the csv writer's own buffer) bounds memory use no matter
+# how large the replay file is.
+READ_BUFFER_BYTES = 1 << 20
+# Target shard size for --workers mode. Shards are parsed in a process pool and
+# written back in order, so only a few shards' rows are in memory at once.
+SHARD_BYTES = 32 << 20
+# With resume=True, progress is saved to <output>.checkpoint after about this
+# much input, so an interrupted conversion redoes at most this much work.
+CHECKPOINT_BYTES = 16 << 20
+CHECKPOINT_SUFFIX = '.checkpoint'
+# The checkpoint fingerprints the start of the input to detect a replaced file
+FINGERPRINT_BYTES = 4096
+# follow_livechat() checks a growing replay for new lines this often
+FOLLOW_POLL_SECONDS = 0.5
+FIELDNAMES = ['timestamp', 'author', 'message', 'type', 'amount', 'currency', 'extra', 'role']
+# Rows passed to the output sinks: the CSV columns plus the raw timestamp in
+# microseconds, which the Parquet output stores as a typed column.
+ROW_FIELDS = FIELDNAMES + ['timestamp_usec']
+ChatRow = namedtuple('ChatRow', ROW_FIELDS)
+OUTPUT_FORMATS = ('csv', 'parquet')
 
-def _update_base_timestamp(ts_usec, offset_msec):
-    global BASE_STREAM_TS_USEC
-    if not ts_usec or offset_msec is None:
-        return
+# Only lines containing this key can produce a row or move the base
+# timestamp; the rest (deletions, tickers, banners...) are skipped undecoded.
+_ADD_CHAT_ITEM_KEY = b'"addChatItemAction"'
+# Precompiled paths for the liveChatTextMessageRenderer fast path, which pulls
+# the dozen fields a chat row needs out of a lazily parsed line.
+_TEXT_RENDERER_MARKER = b'"liveChatTextMessageRenderer"'
+_GIFT_MARKER = b'"giftMessageViewModel"'
+_TIMESTAMP_KEY = b'"timestampUsec"'
+_TEXT_RENDERER = json_codec.JsonPath(
+    'replayChatItemAction', 'actions', 0, 'addChatItemAction', 'item', 'liveChatTextMessageRenderer',
+)
+_OFFSET_MSEC = json_codec.JsonPath('replayChatItemAction', 'videoOffsetTimeMsec')
+_ACTION_TIMESTAMP_USEC = json_codec.JsonPath('replayChatItemAction', 'actions', 0, 'timestampUsec')
+_TIMESTAMP_USEC = json_codec.JsonPath('timestampUsec')
+_AUTHOR_NAME = json_codec.JsonPath('authorName', 'simpleText')
+_MESSAGE_RUNS = json_codec.JsonPath('message', 'runs')
+_AUTHOR_BADGES = json_codec.JsonPath('authorBadges')
+
+
+def _min_base(a, b):
+    """Running-minimum reduce for base timestamps, where None means 'not seen yet'."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
+
+
+def _usec(ts_usec):
+    """timestampUsec as an int, or None if missing or malformed."""
     try:
-        base_candidate = int(ts_usec) - int(offset_msec) * 1000
+        return int(ts_usec) if ts_usec else None
     except (ValueError, TypeError):
-        return
-    if base_candidate <= 0:
-        return
-    if BASE_STREAM_TS_USEC is None or base_candidate < BASE_STREAM_TS_USEC:
-        BASE_STREAM_TS_USEC = base_candidate
+        return None
 
 
-def _format_ts(ts_usec, offset_msec):
-    """Update base timestamp and return a formatted datetime string."""
-    _update_base_timestamp(ts_usec, offset_msec)
-    if not ts_usec:
+def _gift_usec(base_usec, offset_msec):
+    """Gift rows carry no timestampUsec; place them at base + videoOffsetTimeMsec."""
+    if offset_msec is None or base_usec is None:
+        return None
+    try:
+        return base_usec + int(offset_msec) * 1000
+    except (ValueError, TypeError):
+        return None
+
+
+def _gift_timestamp(base_usec, offset_msec):
+    absolute_usec = _gift_usec(base_usec, offset_msec)
+    if absolute_usec is None:
+        return ''
+    try:
+        return timefmt.formatter('UTC').format_epoch(absolute_usec // 1000000)
+    except (ValueError, OverflowError, OSError):
         return ''
-    return datetime.fromtimestamp(int(ts_usec) // 1000000, tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
 
 
 def _extract_runs_text(renderer):
@@ -49,158 +114,927 @@ def _extract_role(renderer):
     return ''
 
 
-def extract_message_info(obj):
+# Renderer handlers: (converter, renderer dict, videoOffsetTimeMsec) -> ChatRow.
+# Each renderer type's timestamp goes through converter.format_ts() so it also
+# moves the base stream timestamp.
+
+def _gift_row(converter, gift, offset_msec):
+    """Gift messages (e.g., Jewels purchases); placed at base + offset, see _gift_usec."""
+    return ChatRow(
+        _gift_timestamp(converter.base_ts_usec, offset_msec),
+        gift.get('authorName', {}).get('content', '').strip(),
+        gift.get('text', {}).get('content', ''),
+        'gift', '', '', '',
+        _extract_role(gift),
+        _gift_usec(converter.base_ts_usec, offset_msec),
+    )
+
+
+def _text_row(converter, renderer, offset_msec):
+    """Normal chat messages."""
+    ts_usec = renderer.get('timestampUsec')
+    return ChatRow(
+        converter.format_ts(ts_usec, offset_msec),
+        renderer.get('authorName', {}).get('simpleText', ''),
+        _extract_runs_text(renderer),
+        'chat', '', '', '',
+        _extract_role(renderer),
+        _usec(ts_usec),
+    )
+
+
+def _paid_row(converter, renderer, offset_msec):
+    """Super Chat messages."""
+    ts_usec = renderer.get('timestampUsec')
+    return ChatRow(
+        converter.format_ts(ts_usec, offset_msec),
+        renderer.get('authorName', {}).get('simpleText', ''),
+        _extract_runs_text(renderer),
+        'superchat',
+        renderer.get('purchaseAmountText', {}).get('simpleText', ''),
+        '', '',
+        _extract_role(renderer),
+        _usec(ts_usec),
+    )
+
+
+def _membership_row(converter, renderer, offset_msec):
+    """Memberships."""
+    ts_usec = renderer.get('timestampUsec')
+    header = renderer.get('headerSubtext', {}).get('runs', [])
+    return ChatRow(
+        converter.format_ts(ts_usec, offset_msec),
+        renderer.get('authorName', {}).get('simpleText', ''),
+        ''.join(run.get('text', '') for run in header),
+        'membership', '', '',
+        renderer.get('authorBadges', [{}])[0].get('tooltip', ''),
+        '',
+        _usec(ts_usec),
+    )
+
+
+def _engagement_row(converter, renderer, offset_msec):
+    """System/moderator messages."""
+    ts_usec = renderer.get('timestampUsec')
+    runs = renderer.get('message', {}).get('runs', [])
+    return ChatRow(
+        converter.format_ts(ts_usec, offset_msec),
+        '[SYSTEM]',
+        ''.join(run.get('text', '') for run in runs),
+        'system', '', '', '', '',
+        _usec(ts_usec),
+    )
+
+
+def _sticker_row(converter, renderer, offset_msec):
+    """Stickers (Super Stickers)."""
+    ts_usec = renderer.get('timestampUsec')
+    sticker = renderer.get('sticker', {}).get('accessibility', {}).get('accessibilityData', {}).get('label', '')
+    return ChatRow(
+        converter.format_ts(ts_usec, offset_msec),
+        renderer.get('authorName', {}).get('simpleText', ''),
+        '[STICKER] ' + sticker,
+        'supersticker',
+        renderer.get('purchaseAmountText', {}).get('simpleText', ''),
+        '', '', '',
+        _usec(ts_usec),
+    )
+
+
+# Chat item renderer key -> handler. When an item carries several keys, the
+# first one in this order wins.
+RENDERER_HANDLERS = {
+    'giftMessageViewModel': _gift_row,
+    'liveChatTextMessageRenderer': _text_row,
+    'liveChatPaidMessageRenderer': _paid_row,
+    'liveChatMembershipItemRenderer': _membership_row,
+    'liveChatViewerEngagementMessageRenderer': _engagement_row,
+    'liveChatPaidStickerRenderer': _sticker_row,
+}
+
+
+class LiveChatConverter:
     """
-    Extracts info from a single chat JSON object.
-    Returns a dict with keys: timestamp, author, message, type, amount, currency, extra, role.
+    Converts one live chat replay.
+    Holds the per-file base stream timestamp (used to place gift rows, which
+    have no timestampUsec of their own), so separate converters can run
+    concurrently in threads or processes without sharing any state.
+    Pass a ConversionMetrics to record skip reasons, renderer counts and
+    decode/extract/write timings; without one, nothing extra is done per line.
     """
+
+    def __init__(self, lazy=None, metrics=None):
+        self.base_ts_usec = None
+        # Use the lazy fast path for plain chat lines (needs pysimdjson)
+        self.lazy = json_codec.prefer_lazy() if lazy is None else lazy
+        self.metrics = metrics
+
+    def update_base_timestamp(self, ts_usec, offset_msec):
+        if not ts_usec or offset_msec is None:
+            return
+        try:
+            base_candidate = int(ts_usec) - int(offset_msec) * 1000
+        except (ValueError, TypeError):
+            return
+        if base_candidate <= 0:
+            return
+        if self.base_ts_usec is None or base_candidate < self.base_ts_usec:
+            self.base_ts_usec = base_candidate
+
+    def format_ts(self, ts_usec, offset_msec):
+        """Update base timestamp and return a formatted datetime string."""
+        self.update_base_timestamp(ts_usec, offset_msec)
+        if not ts_usec:
+            return ''
+        return timefmt.formatter('UTC').format_epoch(int(ts_usec) // 1000000)
+
+    def extract_message_info(self, obj):
+        """
+        Extracts info from a single chat JSON object.
+        Returns a ChatRow (timestamp, author, message, type, amount, currency,
+        extra, role, timestamp_usec), or None if it holds no chat item.
+        With metrics, renderer keys are counted, and a line that yields no row
+        is recorded as 'unhandled_item' (or 'error' if a handler raised).
+        """
+        metrics = self.metrics
+        try:
+            replay = obj.get('replayChatItemAction', {})
+            offset_msec = replay.get('videoOffsetTimeMsec')
+            for action in replay.get('actions', []):
+                add_action = action.get('addChatItemAction')
+                if not add_action:
+                    continue
+                item = add_action.get('item', {})
+                self.update_base_timestamp(action.get('timestampUsec') or obj.get('timestampUsec'), offset_msec)
+
+                if len(item) == 1:
+                    # The usual case: one renderer key, one dict lookup
+                    (key, renderer), = item.items()
+                    if metrics is not None:
+                        metrics.renderers[key] += 1
+                    handler = RENDERER_HANDLERS.get(key)
+                    if handler is not None and renderer:
+                        return handler(self, renderer, offset_msec)
+                    continue
+                for key, handler in RENDERER_HANDLERS.items():
+                    renderer = item.get(key)
+                    if renderer:
+                        if metrics is not None:
+                            metrics.renderers[key] += 1
+                        return handler(self, renderer, offset_msec)
+                if metrics is not None:
+                    metrics.renderers.update(item.keys())
+
+        except Exception as e:
+            if metrics is None:
+                print(f"Error processing message: {e}")
+            else:
+                metrics.error(e)
+            return None
+        if metrics is not None:
+            metrics.skip('unhandled_item')
+        return None
+
+    def _extract_text_message(self, line, doc=None):
+        """
+        Fast path for a line whose first action is a liveChatTextMessageRenderer:
+        read only the needed fields from a lazily parsed document (doc, or
+        parsed here). Returns the same ChatRow as extract_message_info(), or
+        None if the line doesn't fit.
+        """
+        if doc is None:
+            doc = json_codec.parse_lazy(line)
+        renderer = _TEXT_RENDERER.get(doc)
+        if renderer is None:
+            return None
+        offset_msec = _OFFSET_MSEC.get(doc)
+        if line.count(_TIMESTAMP_KEY) > 1:
+            # Base timestamp candidates from the action or the line itself
+            # (absent from replays, where only the renderer has one)
+            ts_usec = _ACTION_TIMESTAMP_USEC.get(doc) or _TIMESTAMP_USEC.get(doc)
+            self.update_base_timestamp(ts_usec, offset_msec)
+        fields = {
+            'message': {'runs': json_codec.to_python(_MESSAGE_RUNS.get(renderer, []))},
+            'authorBadges': json_codec.to_python(_AUTHOR_BADGES.get(renderer, [])),
+        }
+        ts_usec = _TIMESTAMP_USEC.get(renderer)
+        return ChatRow(
+            self.format_ts(ts_usec, offset_msec), _AUTHOR_NAME.get(renderer, ''), _extract_runs_text(fields),
+            'chat', '', '', '', _extract_role(fields), _usec(ts_usec),
+        )
+
+    def extract_line(self, line):
+        """
+        Decode one raw NDJSON line (bytes) and extract its chat row.
+        Returns the extract_message_info() ChatRow, or None for lines without a
+        chat item or that are not valid JSON.
+        """
+        if self.metrics is not None:
+            return self._extract_line_measured(line)
+        if _ADD_CHAT_ITEM_KEY not in line:
+            return None
+        if self.lazy and _TEXT_RENDERER_MARKER in line and _GIFT_MARKER not in line:
+            try:
+                info = self._extract_text_message(line)
+            except (json_codec.DecodeError, TypeError, AttributeError, KeyError):
+                info = None  # Let the full decode below handle or report it
+            if info is not None:
+                return info
+        try:
+            obj = json_codec.loads(line)
+        except json_codec.DecodeError:
+            return None
+        return self.extract_message_info(obj)
+
+    def _extract_line_measured(self, line):
+        """extract_line() that also records skip reasons and decode/extract time in self.metrics."""
+        metrics = self.metrics
+        timings = metrics.timings
+        clock = time.perf_counter
+        if _ADD_CHAT_ITEM_KEY not in line:
+            metrics.skip('no_chat_item')
+            return None
+        if self.lazy and _TEXT_RENDERER_MARKER in line and _GIFT_MARKER not in line:
+            t = clock()
+            info = None
+            try:
+                doc = json_codec.parse_lazy(line)
+                decoded = clock()
+                timings['decode'] += decoded - t
+                t = decoded
+                info = self._extract_text_message(line, doc)
+            except (json_codec.DecodeError, TypeError, AttributeError, KeyError):
+                pass  # Let the full decode below handle or report it
+            timings['extract'] += clock() - t
+            if info is not None:
+                metrics.renderers['liveChatTextMessageRenderer'] += 1
+                return info
+        t = clock()
+        try:
+            obj = json_codec.loads(line)
+        except json_codec.DecodeError:
+            timings['decode'] += clock() - t
+            metrics.skip('invalid_json')
+            return None
+        decoded = clock()
+        timings['decode'] += decoded - t
+        info = self.extract_message_info(obj)
+        timings['extract'] += clock() - decoded
+        return info
+
+    def convert(self, json_file_path, csv_file_path, output_format='csv', resume=False):
+        """
+        Stream a live chat NDJSON replay to CSV (or Parquet).
+        Each line is read, decoded and written before the next one is read,
+        so memory stays flat for multi-GB replays.
+        With resume=True (CSV only), continue from the checkpoint saved next
+        to the output by an earlier run, if it still matches, and keep saving
+        one as the conversion goes. Only complete lines are converted, so a
+        rerun on a file that is still being written picks up the new lines.
+        Returns a dict with keys: lines, rows, seconds (plus resumed_from,
+        the starting byte offset, with resume=True).
+        """
+        start = time.perf_counter()
+        state = _start_state(json_file_path, csv_file_path, output_format, resume)
+        self.base_ts_usec = state['base_ts_usec']
+        pos = state['offset']
+        lines_read = 0
+        rows_written = 0
+        next_checkpoint = pos + CHECKPOINT_BYTES
+
+        sink = _open_sink(csv_file_path, output_format, state['output_bytes'] if resume else None, self.metrics)
+        try:
+            with open(json_file_path, 'rb', buffering=READ_BUFFER_BYTES) as f:
+                f.seek(pos)
+                for line in f:
+                    if resume and not line.endswith(b'\n'):
+                        break  # Partial line still being written; convert it next run
+                    lines_read += 1
+                    info = self.extract_line(line)
+                    if info:
+                        sink.writerow(info)
+                        rows_written += 1
+                    pos += len(line)
+                    if resume and pos >= next_checkpoint:
+                        _save_checkpoint(json_file_path, csv_file_path, state, pos, lines_read, rows_written,
+                                         self.base_ts_usec, sink.flush())
+                        next_checkpoint = pos + CHECKPOINT_BYTES
+            if resume:
+                _save_checkpoint(json_file_path, csv_file_path, state, pos, lines_read, rows_written,
+                                 self.base_ts_usec, sink.flush())
+        finally:
+            sink.close()
+
+        stats = {
+            'lines': lines_read,
+            'rows': rows_written,
+            'seconds': time.perf_counter() - start,
+        }
+        if resume:
+            stats['resumed_from'] = state['offset']
+        _record_stats(self.metrics, stats)
+        return stats
+
+
+def peak_rss_mb():
+    """Return this process's peak resident set size in MB, or None if unavailable."""
     try:
-        offset_msec = obj.get('replayChatItemAction', {}).get('videoOffsetTimeMsec')
-        actions = obj.get('replayChatItemAction', {}).get('actions', [])
-        for action in actions:
-            add_action = action.get('addChatItemAction')
-            if not add_action:
-                continue
-            item = add_action.get('item', {})
-            _update_base_timestamp(action.get('timestampUsec') or obj.get('timestampUsec'), offset_msec)
-
-            # Gift messages (e.g., Jewels purchases)
-            gift = item.get('giftMessageViewModel')
-            if gift:
-                timestamp = ''
-                if offset_msec is not None and BASE_STREAM_TS_USEC is not None:
-                    try:
-                        absolute_usec = BASE_STREAM_TS_USEC + int(offset_msec) * 1000
-                        timestamp = datetime.fromtimestamp(absolute_usec / 1000000, tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
-                    except (ValueError, TypeError, OSError):
-                        timestamp = ''
-
-                author = gift.get('authorName', {}).get('content', '').strip()
-                message = gift.get('text', {}).get('content', '')
-                role = ''
-                for badge in gift.get('authorBadges', []):
-                    badge_type = badge.get('liveChatAuthorBadgeRenderer', {}).get('icon', {}).get('iconType', '')
-                    if badge_type in ('OWNER', 'MODERATOR'):
-                        role = badge_type.lower()
-                        break
-
-                return {
-                    'timestamp': timestamp,
-                    'author': author,
-                    'message': message,
-                    'type': 'gift',
-                    'amount': '',
-                    'currency': '',
-                    'extra': '',
-                    'role': role,
-                }
-
-            # Normal chat messages
-            renderer = item.get('liveChatTextMessageRenderer')
-            if renderer:
-                ts_usec = renderer.get('timestampUsec')
-                return {
-                    'timestamp': _format_ts(ts_usec, offset_msec),
-                    'author': renderer.get('authorName', {}).get('simpleText', ''),
-                    'message': _extract_runs_text(renderer),
-                    'type': 'chat',
-                    'amount': '',
-                    'currency': '',
-                    'extra': '',
-                    'role': _extract_role(renderer),
-                }
-
-            # Super Chat messages
-            renderer = item.get('liveChatPaidMessageRenderer')
-            if renderer:
-                ts_usec = renderer.get('timestampUsec')
-                return {
-                    'timestamp': _format_ts(ts_usec, offset_msec),
-                    'author': renderer.get('authorName', {}).get('simpleText', ''),
-                    'message': _extract_runs_text(renderer),
-                    'type': 'superchat',
-                    'amount': renderer.get('purchaseAmountText', {}).get('simpleText', ''),
-                    'currency': '',
-                    'extra': '',
-                    'role': _extract_role(renderer),
-                }
-
-            # Memberships
-            renderer = item.get('liveChatMembershipItemRenderer')
-            if renderer:
-                ts_usec = renderer.get('timestampUsec')
-                header = renderer.get('headerSubtext', {}).get('runs', [])
-                return {
-                    'timestamp': _format_ts(ts_usec, offset_msec),
-                    'author': renderer.get('authorName', {}).get('simpleText', ''),
-                    'message': ''.join(run.get('text', '') for run in header),
-                    'type': 'membership',
-                    'amount': '',
-                    'currency': '',
-                    'extra': renderer.get('authorBadges', [{}])[0].get('tooltip', ''),
-                    'role': '',
-                }
-
-            # System/moderator messages
-            renderer = item.get('liveChatViewerEngagementMessageRenderer')
-            if renderer:
-                ts_usec = renderer.get('timestampUsec')
-                runs = renderer.get('message', {}).get('runs', [])
-                return {
-                    'timestamp': _format_ts(ts_usec, offset_msec),
-                    'author': '[SYSTEM]',
-                    'message': ''.join(run.get('text', '') for run in runs),
-                    'type': 'system',
-                    'amount': '',
-                    'currency': '',
-                    'extra': '',
-                    'role': '',
-                }
-
-            # Stickers (Super Stickers)
-            renderer = item.get('liveChatPaidStickerRenderer')
-            if renderer:
-                ts_usec = renderer.get('timestampUsec')
-                sticker = renderer.get('sticker', {}).get('accessibility', {}).get('accessibilityData', {}).get('label', '')
-                return {
-                    'timestamp': _format_ts(ts_usec, offset_msec),
-                    'author': renderer.get('authorName', {}).get('simpleText', ''),
-                    'message': '[STICKER] ' + sticker,
-                    'type': 'supersticker',
-                    'amount': renderer.get('purchaseAmountText', {}).get('simpleText', ''),
-                    'currency': '',
-                    'extra': '',
-                    'role': '',
-                }
-
-    except Exception as e:
-        print(f"Error processing message: {e}")
-    return None
-
-def livechat_json_to_csv(json_file_path, csv_file_path):
-    global BASE_STREAM_TS_USEC
-    BASE_STREAM_TS_USEC = None
-    with open(json_file_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-
-    with open(csv_file_path, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['timestamp', 'author', 'message', 'type', 'amount', 'currency', 'extra', 'role']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for line in lines:
-            if not line.strip():
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class _CsvSink:
+    """
+    Writes ChatRows as CSV (dropping timestamp_usec).
+    With append_at, the existing file is cut back to that many bytes (the
+    size recorded in a checkpoint) and appended to without a new header.
+    """
+
+    def __init__(self, path, append_at=None):
+        if append_at is None:
+            self._file = open(path, 'w', newline='', encoding='utf-8')
+        else:
+            with open(path, 'r+b') as f:
+                f.truncate(append_at)
+            self._file = open(path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        if append_at is None:
+            self._writer.writerow(FIELDNAMES)
+        self._width = len(FIELDNAMES)
+
+    def writerow(self, row):
+        self._writer.writerow(row[:self._width])
+
+    def writerows(self, rows):
+        width = self._width
+        self._writer.writerows(row[:width] for row in rows)
+
+    def flush(self):
+        """Flush buffered rows to disk and return the file size in bytes."""
+        self._file.flush()
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetSink:
+    """Writes ChatRows as typed Parquet columns (see chat_columnar.py)."""
+
+    def __init__(self, path):
+        import chat_columnar
+        self._columnar = chat_columnar
+        self._writer = chat_columnar.ParquetChatWriter(path, chat_columnar.replay_schema())
+
+    def writerow(self, row):
+        timestamp, author, message, type_, amount, currency, extra, role, ts_usec = row
+        value, symbol = self._columnar.parse_amount(amount)
+        self._writer.write({
+            'timestamp': ts_usec,
+            'author': author,
+            'message': message,
+            'type': type_,
+            'amount': value,
+            'currency': currency or symbol or None,
+            'extra': extra,
+            'role': role or None,
+        })
+
+    def writerows(self, rows):
+        for row in rows:
+            self.writerow(row)
+
+    def close(self):
+        self._writer.close()
+
+
+class _TimedSink:
+    """Wraps a sink to charge its writes (and the final flush on close) to metrics' write phase."""
+
+    def __init__(self, sink, metrics):
+        self._sink = sink
+        self._timings = metrics.timings
+
+    def writerow(self, row):
+        start = time.perf_counter()
+        self._sink.writerow(row)
+        self._timings['write'] += time.perf_counter() - start
+
+    def writerows(self, rows):
+        start = time.perf_counter()
+        self._sink.writerows(rows)
+        self._timings['write'] += time.perf_counter() - start
+
+    def flush(self):
+        start = time.perf_counter()
+        size = self._sink.flush()
+        self._timings['write'] += time.perf_counter() - start
+        return size
+
+    def close(self):
+        start = time.perf_counter()
+        self._sink.close()
+        self._timings['write'] += time.perf_counter() - start
+
+
+def _open_sink(path, output_format, append_at=None, metrics=None):
+    if output_format == 'parquet':
+        sink = _ParquetSink(path)
+    elif output_format == 'csv':
+        sink = _CsvSink(path, append_at)
+    else:
+        raise ValueError(f"Unknown output format: {output_format!r}")
+    return sink if metrics is None else _TimedSink(sink, metrics)
+
+
+def _record_stats(metrics, stats):
+    """Add a finished conversion's line/row counts and wall time to metrics, if any."""
+    if metrics is not None:
+        metrics.lines += stats['lines']
+        metrics.rows += stats['rows']
+        metrics.seconds += stats['seconds']
+
+
+def checkpoint_path_for(output_path):
+    return output_path + CHECKPOINT_SUFFIX
+
+
+def _head_sha1(source, length):
+    """SHA-1 of the first length bytes of a path, or of an open binary file (keeping its position)."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return hashlib.sha1(f.read(length)).hexdigest()
+    here = source.tell()
+    source.seek(0)
+    head = source.read(length)
+    source.seek(here)
+    return hashlib.sha1(head).hexdigest()
+
+
+def load_checkpoint(json_file_path, output_path):
+    """
+    Read the checkpoint saved next to output_path. Returns its dict (offset,
+    lines, rows, base_ts_usec, output_bytes...), or None if there is none or
+    it no longer matches the input (replaced or truncated) or the output
+    (deleted or shorter than recorded).
+    """
+    try:
+        with open(checkpoint_path_for(output_path), encoding='utf-8') as f:
+            state = json.load(f)
+        if state['offset'] > os.path.getsize(json_file_path):
+            return None
+        if os.path.getsize(output_path) < state['output_bytes']:
+            return None
+        if _head_sha1(json_file_path, state['head_bytes']) != state['head_sha1']:
+            return None
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return state
+
+
+def _start_state(json_file_path, output_path, output_format, resume):
+    """Where a conversion starts: the saved checkpoint when resuming, else the top of the file."""
+    fresh = {'offset': 0, 'lines': 0, 'rows': 0, 'base_ts_usec': None, 'output_bytes': None}
+    if not resume:
+        # A full rewrite of the output makes any earlier checkpoint meaningless
+        try:
+            os.remove(checkpoint_path_for(output_path))
+        except OSError:
+            pass
+        return fresh
+    if output_format != 'csv':
+        raise ValueError("resume needs CSV output: a Parquet file can't be appended to")
+    return load_checkpoint(json_file_path, output_path) or fresh
+
+
+def _save_checkpoint(json_file_path, output_path, start_state, offset, lines, rows, base_ts_usec, output_bytes,
+                     input_file=None):
+    """
+    Atomically record progress; lines and rows are counts for this run, added
+    to start_state's. Pass the open input_file when the path may have been
+    renamed away (follow mode).
+    """
+    head_bytes = min(offset, FINGERPRINT_BYTES)
+    state = {
+        'input': os.path.abspath(json_file_path),
+        'offset': offset,
+        'lines': start_state['lines'] + lines,
+        'rows': start_state['rows'] + rows,
+        'base_ts_usec': base_ts_usec,
+        'output_bytes': output_bytes,
+        'head_bytes': head_bytes,
+        'head_sha1': _head_sha1(input_file or json_file_path, head_bytes),
+    }
+    path = checkpoint_path_for(output_path)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(path + '.tmp', path)
+
+
+def _complete_end(path, start):
+    """Byte offset just past the last newline at or after start (start if there is none)."""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        pos = size
+        while pos > start:
+            chunk_start = max(start, pos - READ_BUFFER_BYTES)
+            f.seek(chunk_start)
+            chunk = f.read(pos - chunk_start)
+            newline = chunk.rfind(b'\n')
+            if newline >= 0:
+                return chunk_start + newline + 1
+            pos = chunk_start
+    return start
+
+
+def _shard_ranges(path, shard_count, start=0, end=None):
+    """Split a file (or its start..end part) into byte ranges that begin and end on line boundaries."""
+    if end is None:
+        end = os.path.getsize(path)
+    bounds = [start]
+    with open(path, 'rb') as f:
+        for i in range(1, shard_count):
+            f.seek(start + (end - start) * i // shard_count)
+            f.readline()  # Move to the start of the next full line
+            pos = f.tell()
+            if bounds[-1] < pos < end:
+                bounds.append(pos)
+    bounds.append(end)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _convert_shard(task):
+    """
+    Worker for --workers mode: parse one byte range of the NDJSON file.
+    Gift timestamps depend on the running-minimum base timestamp of every
+    earlier line, so they are returned unresolved as (row index, shard-local
+    base, offset) and fixed up by the parent once earlier shards are known.
+    Returns (rows, gifts, shard_base, lines_read, metrics), where metrics is
+    the shard's ConversionMetrics.to_dict() if measure is set, else None.
+    """
+    path, start, end, measure = task
+    converter = LiveChatConverter(metrics=ConversionMetrics('livechat') if measure else None)
+    rows = []
+    gifts = []
+    lines_read = 0
+
+    with open(path, 'rb', buffering=READ_BUFFER_BYTES) as f:
+        f.seek(start)
+        pos = start
+        while pos < end:
+            line = f.readline()
+            if not line:
+                break
+            pos += len(line)
+            lines_read += 1
+            info = converter.extract_line(line)
+            if not info:
                 continue
-            try:
-                obj = json.loads(line)
-            except json.JSONDecodeError:
-                continue  # Skip lines that are not valid JSON
-            info = extract_message_info(obj)
-            if info:
-                writer.writerow(info)
+            if info.type == 'gift':
+                # Gifts never take the lazy path, so the line is valid JSON
+                offset_msec = _OFFSET_MSEC.get(json_codec.loads(line))
+                gifts.append((len(rows), converter.base_ts_usec, offset_msec))
+            rows.append(info)
+
+    metrics = converter.metrics.to_dict() if measure else None
+    return rows, gifts, converter.base_ts_usec, lines_read, metrics
+
+
+def _livechat_json_to_csv_parallel(json_file_path, writer, workers, start=0, end=None, base=None, on_shard=None,
+                                   metrics=None):
+    """
+    Parse shards in a process pool and write their rows back in file order.
+    start, end and base (the base timestamp before start) restrict the work to
+    part of the file; on_shard(offset, lines, rows, base) is called after each
+    shard is written. With metrics, each shard's skip reasons, renderer counts
+    and decode/extract times are merged into it.
+    """
+    if end is None:
+        end = os.path.getsize(json_file_path)
+    shard_count = max(workers * 4, (end - start) // SHARD_BYTES + 1)
+    measure = metrics is not None
+    tasks = [(json_file_path, a, b, measure) for a, b in _shard_ranges(json_file_path, shard_count, start, end)]
+    lines_read = 0
+    rows_written = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Keep a bounded window of shards in flight so finished shards waiting
+        # on a slow predecessor can't pile up in memory.
+        pending = deque()
+        tasks = iter(tasks)
+        for task in tasks:
+            pending.append((task[2], pool.submit(_convert_shard, task)))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            shard_end, future = pending.popleft()
+            rows, gifts, shard_base, shard_lines, shard_metrics = future.result()
+            for task in tasks:
+                pending.append((task[2], pool.submit(_convert_shard, task)))
+                break
+
+            for index, local_base, offset_msec in gifts:
+                gift_base = _min_base(base, local_base)
+                rows[index] = rows[index]._replace(
+                    timestamp=_gift_timestamp(gift_base, offset_msec),
+                    timestamp_usec=_gift_usec(gift_base, offset_msec),
+                )
+            writer.writerows(rows)
+            if shard_metrics is not None:
+                # Lines and rows are added once for the whole run
+                shard_metrics['lines'] = shard_metrics['rows'] = 0
+                metrics.merge(shard_metrics)
+            base = _min_base(base, shard_base)
+            lines_read += shard_lines
+            rows_written += len(rows)
+            if on_shard is not None:
+                on_shard(shard_end, lines_read, rows_written, base)
+
+    return lines_read, rows_written
+
+
+def livechat_json_to_csv(json_file_path, csv_file_path, workers=1, output_format='csv', resume=False,
+                         metrics=None):
+    """
+    Convert a live chat NDJSON replay to CSV, or to Parquet with
+    output_format='parquet' (typed columns, needs pyarrow).
+    With workers > 1, the file is split into line-aligned shards that are
+    parsed in a process pool; the output is identical to the single-process run.
+    With resume=True, continue from the checkpoint of an interrupted or
+    earlier run and save progress as it goes (see LiveChatConverter.convert).
+    Pass a ConversionMetrics as metrics to have it filled in for this file.
+    Returns a dict with keys: lines, rows, seconds.
+    """
+    if metrics is not None:
+        metrics.input_path = metrics.input_path or json_file_path
+        metrics.output_path = metrics.output_path or csv_file_path
+    if workers <= 1:
+        return LiveChatConverter(metrics=metrics).convert(json_file_path, csv_file_path, output_format, resume)
+
+    start = time.perf_counter()
+    state = _start_state(json_file_path, csv_file_path, output_format, resume)
+    end = _complete_end(json_file_path, state['offset']) if resume else None
+    sink = _open_sink(csv_file_path, output_format, state['output_bytes'] if resume else None, metrics)
+
+    def save(offset, lines, rows, base):
+        _save_checkpoint(json_file_path, csv_file_path, state, offset, lines, rows, base, sink.flush())
+
+    try:
+        if resume and end == state['offset']:
+            # No new complete lines; still record a checkpoint for a fresh output
+            lines_read, rows_written = 0, 0
+            save(end, 0, 0, state['base_ts_usec'])
+        else:
+            lines_read, rows_written = _livechat_json_to_csv_parallel(
+                json_file_path, sink, workers, state['offset'], end, state['base_ts_usec'],
+                save if resume else None, metrics,
+            )
+    finally:
+        sink.close()
+    stats = {
+        'lines': lines_read,
+        'rows': rows_written,
+        'seconds': time.perf_counter() - start,
+    }
+    if resume:
+        stats['resumed_from'] = state['offset']
+    _record_stats(metrics, stats)
+    return stats
+
+
+def _file_replaced(path, f):
+    """True if path no longer names the open file f (renamed, removed or swapped)."""
+    try:
+        return os.stat(path).st_ino != os.fstat(f.fileno()).st_ino
+    except OSError:
+        return True
+
+
+def follow_livechat(json_file_path, csv_file_path, poll_interval=FOLLOW_POLL_SECONDS,
+                    idle_timeout=None, stop_event=None, metrics=None):
+    """
+    Tail a replay that is still being written (yt-dlp appends to it while a
+    stream is live) and convert each complete line as it arrives. Rows are
+    flushed to the CSV at every poll, so they appear within poll_interval
+    seconds; a trailing partial line waits for the rest of it. Progress is
+    checkpointed at every poll like resume=True, so following can be stopped
+    and restarted, and a later resume=True conversion finishes the file.
+    Waits for the file to appear. Stops after draining the file once it is
+    renamed or removed (yt-dlp renames .live_chat.json.part when done), once
+    stop_event (a threading.Event) is set, after idle_timeout seconds
+    without new data, or on Ctrl+C. metrics (a ConversionMetrics) is filled
+    in as for livechat_json_to_csv(); its seconds include time spent waiting.
+    Returns a dict with keys: lines, rows, seconds, resumed_from.
+    """
+    if metrics is not None:
+        metrics.input_path = metrics.input_path or json_file_path
+        metrics.output_path = metrics.output_path or csv_file_path
+    start = time.perf_counter()
+    wait = stop_event.wait if stop_event is not None else time.sleep
+    while not os.path.exists(json_file_path):
+        if stop_event is not None and stop_event.is_set():
+            return {'lines': 0, 'rows': 0, 'seconds': time.perf_counter() - start, 'resumed_from': 0}
+        wait(poll_interval)
+
+    state = _start_state(json_file_path, csv_file_path, 'csv', True)
+    converter = LiveChatConverter(metrics=metrics)
+    converter.base_ts_usec = state['base_ts_usec']
+    pos = state['offset']
+    saved_pos = pos
+    lines_read = 0
+    rows_written = 0
+    pending = b''
+    last_data = time.monotonic()
+
+    sink = _open_sink(csv_file_path, 'csv', state['output_bytes'], metrics)
+    try:
+        with open(json_file_path, 'rb') as f:
+            f.seek(pos)
+            while True:
+                chunk = f.read(READ_BUFFER_BYTES)
+                if chunk:
+                    last_data = time.monotonic()
+                    pending += chunk
+                    end = pending.rfind(b'\n')
+                    if end < 0:
+                        continue
+                    complete, pending = pending[:end], pending[end + 1:]
+                    for line in complete.split(b'\n'):
+                        lines_read += 1
+                        info = converter.extract_line(line)
+                        if info:
+                            sink.writerow(info)
+                            rows_written += 1
+                        pos += len(line) + 1
+                    continue
+
+                # Caught up: publish the rows, then decide whether to keep waiting
+                if pos != saved_pos:
+                    _save_checkpoint(json_file_path, csv_file_path, state, pos, lines_read, rows_written,
+                                     converter.base_ts_usec, sink.flush(), f)
+                    saved_pos = pos
+                finished = (
+                    _file_replaced(json_file_path, f)
+                    or (stop_event is not None and stop_event.is_set())
+                    or (idle_timeout is not None and time.monotonic() - last_data >= idle_timeout)
+                )
+                if finished:
+                    # One last read: lines written just before the rename or stop
+                    if f.read(1):
+                        f.seek(-1, os.SEEK_CUR)
+                        continue
+                    break
+                wait(poll_interval)
+    except KeyboardInterrupt:
+        pass  # The checkpoint from the last poll is consistent with the CSV
+    finally:
+        sink.close()
+
+    stats = {
+        'lines': lines_read,
+        'rows': rows_written,
+        'seconds': time.perf_counter() - start,
+        'resumed_from': state['offset'],
+    }
+    _record_stats(metrics, stats)
+    return stats
+
+
+def output_path_for(json_file_path, output_format='csv'):
+    """Default output path: <name>_livechat.csv (or .parquet) next to the replay."""
+    return json_file_path.rsplit('.', 1)[0] + '_livechat.' + output_format
+
+
+def _convert_file(json_file_path, output_format='csv', collect_metrics=False):
+    metrics = ConversionMetrics('livechat') if collect_metrics else None
+    stats = livechat_json_to_csv(
+        json_file_path, output_path_for(json_file_path, output_format), output_format=output_format,
+        metrics=metrics,
+    )
+    if metrics is not None:
+        stats['metrics'] = metrics.to_dict()
+    return stats
+
+
+def convert_directory(directory, jobs=4, use_processes=False, pattern='*.live_chat.json', output_format='csv',
+                      collect_metrics=False):
+    """
+    Convert every replay matching pattern in directory, several files at once.
+    Each file gets its own LiveChatConverter, so threads share no mutable
+    state; use_processes=True runs the files in a process pool instead, which
+    also spreads the JSON parsing across cores.
+    Each output is written next to its replay as <name>_livechat.csv (or .parquet).
+    Returns {json path: stats dict} in sorted path order; with collect_metrics,
+    each stats dict also has the file's ConversionMetrics.to_dict() as 'metrics'.
+    """
+    paths = sorted(str(p) for p in Path(directory).glob(pattern))
+    if not paths:
+        return {}
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_class(max_workers=max(1, min(jobs, len(paths)))) as pool:
+        convert = partial(_convert_file, output_format=output_format, collect_metrics=collect_metrics)
+        return dict(zip(paths, pool.map(convert, paths)))
+
+
+def format_stats(stats):
+    """One-line throughput summary: rows, rows/sec and peak RSS."""
+    seconds = stats['seconds']
+    rate = stats['rows'] / seconds if seconds > 0 else 0.0
+    summary = f"{stats['rows']:,} rows from {stats['lines']:,} lines in {seconds:.1f}s ({rate:,.0f} rows/sec)"
+    rss = peak_rss_mb()
+    if rss is not None:
+        summary += f", peak RSS {rss:.0f} MB"
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert a YouTube live chat NDJSON replay to CSV or Parquet')
+    parser.add_argument(
+        'input', nargs='?',
+        help='Path to a .live_chat.json file, or a directory of them (prompted for if omitted)',
+    )
+    parser.add_argument('-o', '--output', help='Output file (default: <input>_livechat.csv; ignored for directories)')
+    parser.add_argument(
+        '--chat-format', choices=OUTPUT_FORMATS, default='csv',
+        help='Output format; parquet writes typed columns and needs pyarrow',
+    )
+    parser.add_argument(
+        '--workers', type=int, default=1, metavar='N',
+        help='Parse the file in N processes (output order is preserved)',
+    )
+    parser.add_argument(
+        '--resume', action='store_true',
+        help='CSV only: continue from <output>.checkpoint left by an interrupted or earlier run, '
+             'appending only the lines added since (start one if missing)',
+    )
+    parser.add_argument(
+        '--follow', action='store_true',
+        help='Keep converting new lines as yt-dlp appends them (live streams) until the file is '
+             'renamed or --idle-timeout passes; CSV only, checkpointed like --resume',
+    )
+    parser.add_argument(
+        '--idle-timeout', type=float, metavar='SECS',
+        help='With --follow, stop after this long without new lines (default: wait until Ctrl+C)',
+    )
+    parser.add_argument(
+        '--jobs', type=int, default=4, metavar='N',
+        help='Directory input: convert up to N files at once',
+    )
+    parser.add_argument(
+        '--processes', action='store_true',
+        help='Directory input: convert files in processes instead of threads',
+    )
+    parser.add_argument(
+        '--metrics-json', metavar='PATH',
+        help="Write per-file counters (lines, rows, skips by reason, renderer types) and "
+             "decode/extract/write timings as JSON to PATH ('-' for stdout)",
+    )
+    args = parser.parse_args()
+
+    in_file = args.input or input("Enter path to live chat NDJSON file: ").strip()
+    if os.path.isdir(in_file):
+        results = convert_directory(
+            in_file, jobs=args.jobs, use_processes=args.processes, output_format=args.chat_format,
+            collect_metrics=bool(args.metrics_json),
+        )
+        if not results:
+            print(f"No .live_chat.json files found in {in_file}")
+        for path, stats in results.items():
+            print(f"{output_path_for(path, args.chat_format)}: {format_stats(stats)}")
+        if args.metrics_json:
+            write_summary(args.metrics_json, [stats['metrics'] for stats in results.values()])
+        return
+
+    metrics = ConversionMetrics('livechat') if args.metrics_json else None
+
+    if args.follow:
+        if args.chat_format != 'csv':
+            parser.error('--follow writes CSV only')
+        # yt-dlp writes <name>.live_chat.json.part until the stream ends
+        out_file = args.output or output_path_for(in_file.removesuffix('.part'))
+        print(f"Following {in_file} -> {out_file} (Ctrl+C to stop)")
+        stats = follow_livechat(in_file, out_file, idle_timeout=args.idle_timeout, metrics=metrics)
+        print(format_stats(stats))
+        if metrics is not None:
+            write_summary(args.metrics_json, [metrics])
+        return
+
+    out_file = args.output or output_path_for(in_file, args.chat_format)
+    stats = livechat_json_to_csv(
+        in_file, out_file, workers=max(1, args.workers), output_format=args.chat_format, resume=args.resume,
+        metrics=metrics,
+    )
+    if stats.get('resumed_from'):
+        print(f"Resumed at byte {stats['resumed_from']:,}")
+    print(f"Saved to: {out_file}")
+    print(format_stats(stats))
+    if metrics is not None:
+        write_summary(args.metrics_json, [metrics])
+
 
 if __name__ == '__main__':
-    in_file = input("Enter path to live chat NDJSON file: ").strip()
-    out_file = in_file.rsplit('.', 1)[0] + '_livechat.csv'
-    livechat_json_to_csv(in_file, out_file)
-    print(f"CSV saved to: {out_file}")
+    main()
@@ -6,11 +6,13 @@ import glob
 import os
 import re
 import subprocess
+import threading
 import click
+from conversion_metrics import ConversionMetrics, write_summary
 from downloader import YouTubeDownloader
 from extract_comments import extract_comments_to_csv
 from vtt_to_text import vtt_to_text
-from livechat_to_csv import livechat_json_to_csv
+from livechat_to_csv import livechat_json_to_csv, follow_livechat, format_stats, output_path_for, OUTPUT_FORMATS
 from remove_dupe_lines import remove_duplicate_lines
 
 def get_new_output_folder(base_name="output"):
@@ -23,33 +25,83 @@ def get_new_output_folder(base_name="output"):
             return folder
         i += 1
 
-def convert_transcripts():
-    """Convert all VTT files to text and deduplicate."""
+METRICS_FILE = "conversion_metrics.json"
+
+def _new_metrics(metrics_log, kind):
+    """A ConversionMetrics appended to metrics_log, or None when metrics are off."""
+    if metrics_log is None:
+        return None
+    metrics = ConversionMetrics(kind)
+    metrics_log.append(metrics)
+    return metrics
+
+def convert_transcripts(metrics_log=None):
+    """Convert all VTT files to text and deduplicate.
+
+    With a metrics_log list, one ConversionMetrics per step is appended to it.
+    """
     vtt_files = glob.glob("*.vtt")
     if not vtt_files:
         click.echo("No .vtt subtitle files found to convert.", err=True)
     for vtt_file in vtt_files:
-        txt_file = vtt_to_text(vtt_file)
+        txt_file = vtt_to_text(vtt_file, metrics=_new_metrics(metrics_log, "transcript"))
         if not txt_file:
             txt_file = os.path.splitext(vtt_file)[0] + ".txt"
         deduped_file = os.path.splitext(txt_file)[0] + "_deduped.txt"
-        remove_duplicate_lines(txt_file, deduped_file)
+        remove_duplicate_lines(txt_file, deduped_file, metrics=_new_metrics(metrics_log, "dedupe"))
 
 
-def convert_livechat():
-    """Convert all live chat NDJSON files to CSV."""
+def convert_livechat(workers=1, chat_format="csv", resume=False, metrics_log=None):
+    """Convert all live chat NDJSON files to CSV (or Parquet).
+
+    With resume=True, continue from the checkpoint left by --follow-chat
+    instead of converting from the start.
+    """
     livechat_json_files = glob.glob("*.live_chat.json")
     for livechat_file in livechat_json_files:
-        csv_file = livechat_file.rsplit('.', 1)[0] + '_livechat.csv'
-        livechat_json_to_csv(livechat_file, csv_file)
+        out_file = output_path_for(livechat_file, chat_format)
+        stats = livechat_json_to_csv(
+            livechat_file, out_file, workers=workers, output_format=chat_format, resume=resume,
+            metrics=_new_metrics(metrics_log, "livechat"),
+        )
+        click.echo(f"Live chat {chat_format.upper()}: {out_file} — {format_stats(stats)}")
+
+def start_livechat_follower():
+    """Convert the live chat to CSV while yt-dlp is still writing it.
+
+    Watches the current folder for the first *.live_chat.json(.part) and tails
+    it in a background thread. Returns (stop_event, thread); set the event
+    and join the thread once the download is done.
+    """
+    stop = threading.Event()
+
+    def run():
+        while not stop.is_set():
+            found = glob.glob("*.live_chat.json.part") or glob.glob("*.live_chat.json")
+            if found:
+                out_file = output_path_for(found[0].removesuffix(".part"))
+                click.echo(f"Following live chat: {found[0]} -> {out_file}")
+                follow_livechat(found[0], out_file, stop_event=stop)
+                return
+            stop.wait(1.0)
+
+    thread = threading.Thread(target=run, name="livechat-follow", daemon=True)
+    thread.start()
+    return stop, thread
+
+def _stop_follower(follower):
+    if follower is not None:
+        stop, thread = follower
+        stop.set()
+        thread.join()
 
-def extract_comments():
+def extract_comments(metrics_log=None):
     """Extract comments from info.json to CSV. Returns the info.json path, or None."""
     info_json_files = glob.glob("*.info.json")
     if info_json_files:
         latest_info_json = max(info_json_files, key=os.path.getctime)
         comments_csv = latest_info_json.replace('.info.json', '_comments.csv')
-        extract_comments_to_csv(latest_info_json, comments_csv)
+        extract_comments_to_csv(latest_info_json, comments_csv, metrics=_new_metrics(metrics_log, "comments"))
         return latest_info_json
     click.echo("No .info.json file found for comment extraction.", err=True)
     return None
@@ -149,7 +201,20 @@ def _fallback_kick_live(url: str, out: str) -> bool:
                    'yt-dlp in venv-sabr. Works around YouTube limiting regular downloads '
                    'to a few hundred KB on distrusted IPs (e.g. VPN exits). Slower: '
                    'YouTube paces SABR delivery.')
-def main(url, cookies, comments, metadata_only, transcript_only, comments_only, video_only, chat_only, chat_delay, sabr):
+@click.option('--workers', default=1, show_default=True, type=click.IntRange(min=1),
+              help='Worker processes for converting YouTube live chat to CSV. '
+                   'Useful for multi-GB replays of long streams.')
+@click.option('--chat-format', type=click.Choice(OUTPUT_FORMATS), default='csv', show_default=True,
+              help='Format for converted chat (YouTube live chat and Kick VOD chat). '
+                   'parquet writes typed, compressed columns and needs pyarrow.')
+@click.option('--follow-chat', is_flag=True, default=False,
+              help='(YouTube only) Convert the live chat to CSV while it is being downloaded, '
+                   'so rows from a live stream appear within a second instead of at the end.')
+@click.option('--metrics', is_flag=True, default=False,
+              help=f'(YouTube only) Write per-file conversion counters (lines, rows, skips by reason, '
+                   f'chat renderer types) and decode/extract/write timings to {METRICS_FILE} '
+                   'in the output folder.')
+def main(url, cookies, comments, metadata_only, transcript_only, comments_only, video_only, chat_only, chat_delay, sabr, workers, chat_format, follow_chat, metrics):
     """Download a YouTube video (or just its metadata/transcript) and convert outputs.
 
     URL is the full video URL. Always quote it in zsh/bash to prevent
@@ -186,6 +251,8 @@ def main(url, cookies, comments, metadata_only, transcript_only, comments_only,
         )
     if sabr and (_is_kick_vod_url(url) or _is_kick_live_url(url)):
         raise click.UsageError("--sabr is YouTube-only.")
+    if follow_chat and chat_format != "csv":
+        raise click.UsageError("--follow-chat writes CSV only.")
 
     if _is_kick_vod_url(url):
         click.echo(f"Detected Kick VOD URL: {url}")
@@ -195,13 +262,14 @@ def main(url, cookies, comments, metadata_only, transcript_only, comments_only,
             args.append("--video-only")
         if chat_only:
             args.append("--chat-only")
-        args += ["--chat-delay", str(chat_delay)]
+        args += ["--chat-delay", str(chat_delay), "--chat-format", chat_format]
         kick_vod_main(args, standalone_mode=False)
         return
 
     output_folder = get_new_output_folder()
     original_cwd = os.getcwd()
     os.chdir(output_folder)
+    metrics_log = [] if metrics else None
 
     try:
         if _is_kick_live_url(url):
@@ -218,12 +286,17 @@ def main(url, cookies, comments, metadata_only, transcript_only, comments_only,
                 )
         elif sabr:
             click.echo("Downloading via SABR dev build (venv-sabr)...")
-            if not _download_youtube_sabr(url, cookies, comments):
+            follower = start_livechat_follower() if follow_chat else None
+            try:
+                ok = _download_youtube_sabr(url, cookies, comments)
+            finally:
+                _stop_follower(follower)
+            if not ok:
                 raise click.ClickException("SABR download failed.")
-            convert_transcripts()
-            convert_livechat()
+            convert_transcripts(metrics_log)
+            convert_livechat(workers, chat_format, resume=follow_chat, metrics_log=metrics_log)
             if comments:
-                extract_comments()
+                extract_comments(metrics_log)
         else:
             downloader = YouTubeDownloader(
                 use_cookies=cookies,
@@ -232,19 +305,27 @@ def main(url, cookies, comments, metadata_only, transcript_only, comments_only,
                 transcript_only=transcript_only,
                 comments_only=comments_only,
             )
-            downloader.download_video_info_comments([url])
+            follow = follow_chat and not (transcript_only or comments_only)
+            follower = start_livechat_follower() if follow else None
+            try:
+                downloader.download_video_info_comments([url])
+            finally:
+                _stop_follower(follower)
 
             if comments_only:
                 # Keep the .info.json — useful for debugging and re-extracting the CSV.
-                extract_comments()
+                extract_comments(metrics_log)
             else:
-                convert_transcripts()
+                convert_transcripts(metrics_log)
                 if not transcript_only:
-                    convert_livechat()
+                    convert_livechat(workers, chat_format, resume=follow, metrics_log=metrics_log)
                     if comments:
-                        extract_comments()
+                        extract_comments(metrics_log)
 
     finally:
+        if metrics_log:
+            write_summary(METRICS_FILE, metrics_log)
+            click.echo(f"Conversion metrics: {os.path.join(output_folder, METRICS_FILE)}")
         os.chdir(original_cwd)
         if os.listdir(output_folder):
             click.echo(f"All output files saved in: {output_folder}")
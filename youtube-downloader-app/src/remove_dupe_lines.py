@@ -1,13 +1,33 @@
 import os
+import time
 
-def remove_duplicate_lines(input_path, output_path):
+def remove_duplicate_lines(input_path, output_path, metrics=None):
+    """
+    Copy input_path to output_path, dropping lines identical to the one before.
+    With metrics (a conversion_metrics.ConversionMetrics), records lines read,
+    lines written and duplicates dropped. Reading and writing are interleaved,
+    so only the total time is recorded.
+    """
+    start = time.perf_counter()
+    lines_read = 0
+    lines_written = 0
     with open(input_path, 'r', encoding='utf-8') as infile, \
          open(output_path, 'w', encoding='utf-8') as outfile:
         prev_line = None
         for line in infile:
+            lines_read += 1
             if line != prev_line:
                 outfile.write(line)
+                lines_written += 1
             prev_line = line
+    if metrics is not None:
+        metrics.input_path = input_path
+        metrics.output_path = output_path
+        metrics.lines += lines_read
+        metrics.rows += lines_written
+        if lines_read > lines_written:
+            metrics.skip('duplicate', lines_read - lines_written)
+        metrics.seconds += time.perf_counter() - start
 
 if __name__ == "__main__":
     input_file = input("Enter the input file path: ")
@@ -0,0 +1,146 @@
+# Fast timestamp formatting for chat and comment exports.
+# Converting each message with dateutil.parser.parse() + pytz + strftime()
+# costs tens of microseconds; here ISO 8601 strings in the fixed layout the
+# APIs send are parsed by slicing, the zone's UTC offset is looked up once
+# per hour of UTC time and cached, and the common layouts are formatted with
+# integer arithmetic. Anything unusual falls back to the exact slow path.
+# Keep this file identical in ytdownload/ and youtube-downloader-app/src/.
+
+import functools
+from datetime import date, datetime, timedelta, timezone
+
+import pytz
+
+DEFAULT_FORMAT = '%Y-%m-%d %H:%M:%S'
+ZONE_FORMAT = '%Y-%m-%d %H:%M:%S %Z'
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# Cache sizes; chats span hours or days, so these are never reached in practice
+_MAX_BUCKETS = 4096
+_MAX_DAYS = 4096
+
+# 'YYYY-MM-DD' -> days since the epoch
+_epoch_days_cache = {}
+
+
+def _epoch_days(ymd):
+    days = _epoch_days_cache.get(ymd)
+    if days is None:
+        if len(_epoch_days_cache) >= _MAX_DAYS:
+            _epoch_days_cache.clear()
+        days = date(int(ymd[:4]), int(ymd[5:7]), int(ymd[8:10])).toordinal() - _EPOCH_ORDINAL
+        _epoch_days_cache[ymd] = days
+    return days
+
+
+def _parse_iso_slow(text):
+    try:
+        dt = datetime.fromisoformat(text.replace('Z', '+00:00').replace('z', '+00:00'))
+    except ValueError:
+        try:
+            from dateutil import parser
+        except ImportError:
+            raise ValueError(f"Unrecognised timestamp: {text!r}") from None
+        dt = parser.parse(text)
+    # Only assume UTC if no timezone info is present
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() // 1)
+
+
+def parse_iso(text):
+    """
+    Whole seconds since the epoch for an ISO 8601 timestamp such as the
+    Data API's publishedAt ('2024-01-15T19:30:22.123+00:00', '...Z').
+    The fraction is dropped; a timestamp without an offset is taken as UTC.
+    """
+    try:
+        if text[4] == '-' and text[7] == '-' and text[10] in 'T ' and text[13] == ':' and text[16] == ':':
+            hour, minute, second = int(text[11:13]), int(text[14:16]), int(text[17:19])
+            if hour < 24 and minute < 60 and second < 60:
+                seconds = _epoch_days(text[:10]) * 86400 + hour * 3600 + minute * 60 + second
+                rest = text[19:]
+                if rest[:1] in ('.', ','):
+                    i = 1
+                    while i < len(rest) and rest[i].isdigit():
+                        i += 1
+                    rest = rest[i:]
+                if not rest or rest in ('Z', 'z'):
+                    return seconds
+                if len(rest) == 6 and rest[0] in '+-' and rest[3] == ':':
+                    offset = int(rest[1:3]) * 3600 + int(rest[4:6]) * 60
+                    return seconds - offset if rest[0] == '+' else seconds + offset
+    except (ValueError, IndexError):
+        pass
+    return _parse_iso_slow(text)
+
+
+class TimestampFormatter:
+    """
+    Formats UTC instants as local time strings in one zone.
+    The zone's offset and abbreviation are cached per hour of UTC time. An
+    hour in which the offset changes (a DST switch off the hour boundary)
+    is not cached and is converted exactly on every call.
+    DEFAULT_FORMAT and ZONE_FORMAT are built by hand; other strftime formats
+    use a datetime with the cached offset.
+    """
+
+    def __init__(self, tz='US/Eastern', fmt=DEFAULT_FORMAT):
+        self.tz = pytz.timezone(tz) if isinstance(tz, str) else tz
+        self.fmt = fmt
+        self._fast = fmt in (DEFAULT_FORMAT, ZONE_FORMAT)
+        self._with_zone = fmt == ZONE_FORMAT
+        # UTC hour -> (offset seconds, zone abbreviation, fixed-offset tzinfo), or None if the offset changes in it
+        self._buckets = {}
+        # Local days since the epoch -> 'YYYY-MM-DD'
+        self._dates = {}
+
+    def _exact(self, seconds):
+        local = datetime.fromtimestamp(seconds, tz=self.tz)
+        offset = int(local.utcoffset().total_seconds())
+        name = local.tzname()
+        return offset, name, timezone(timedelta(seconds=offset), name)
+
+    def zone_at(self, seconds):
+        """(offset seconds, zone abbreviation, fixed-offset tzinfo) in effect at a UTC instant."""
+        bucket = int(seconds // 3600)
+        try:
+            zone = self._buckets[bucket]
+        except KeyError:
+            if len(self._buckets) >= _MAX_BUCKETS:
+                self._buckets.clear()
+            start = self._exact(bucket * 3600)
+            end = self._exact(bucket * 3600 + 3599)
+            zone = self._buckets[bucket] = start if start[:2] == end[:2] else None
+        return zone if zone is not None else self._exact(seconds)
+
+    def to_datetime(self, seconds):
+        """A timezone-aware local datetime (with a fixed-offset tzinfo) for an epoch timestamp."""
+        return datetime.fromtimestamp(seconds, tz=self.zone_at(seconds)[2])
+
+    def format_epoch(self, seconds):
+        """Local time string for seconds since the epoch (the fraction is dropped)."""
+        offset, name, tzinfo = self.zone_at(seconds)
+        if not self._fast:
+            return datetime.fromtimestamp(seconds, tz=tzinfo).strftime(self.fmt)
+        day, second_of_day = divmod(int(seconds // 1) + offset, 86400)
+        ymd = self._dates.get(day)
+        if ymd is None:
+            if len(self._dates) >= _MAX_DAYS:
+                self._dates.clear()
+            ymd = self._dates[day] = date.fromordinal(day + _EPOCH_ORDINAL).isoformat()
+        hour, rest = divmod(second_of_day, 3600)
+        minute, second = divmod(rest, 60)
+        if self._with_zone:
+            return f"{ymd} {hour:02d}:{minute:02d}:{second:02d} {name}"
+        return f"{ymd} {hour:02d}:{minute:02d}:{second:02d}"
+
+    def format_iso(self, text):
+        """Local time string for an ISO 8601 timestamp (see parse_iso())."""
+        return self.format_epoch(parse_iso(text))
+
+
+@functools.lru_cache(maxsize=None)
+def formatter(tz='US/Eastern', fmt=DEFAULT_FORMAT):
+    """A shared TimestampFormatter per (zone name, format), so every caller reuses one cache."""
+    return TimestampFormatter(tz, fmt)
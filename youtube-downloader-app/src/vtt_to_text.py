@@ -1,7 +1,10 @@
 import os
 import re
+from collections import Counter
 from html import unescape
 
+from conversion_metrics import Stopwatch
+
 def clean_line(line):
     # Remove HTML tags
     line = re.sub(r'<.*?>', '', line)
@@ -10,24 +13,40 @@ def clean_line(line):
     # Remove extra whitespace
     return line.strip()
 
-def vtt_to_text(vtt_file_path):
+def vtt_to_text(vtt_file_path, metrics=None):
+    """
+    Convert a .vtt subtitle file to plain text next to it (.txt).
+    With metrics (a conversion_metrics.ConversionMetrics), records cue lines
+    read, text lines written, what was skipped, and read/clean/write timings.
+    """
+    watch = Stopwatch(metrics) if metrics is not None else None
     with open(vtt_file_path, 'r', encoding='utf-8') as f:
         lines = f.readlines()
+    if watch:
+        watch.lap('decode')
 
     text_lines = []
     last_line = None
+    skipped = Counter()
     for line in lines:
         line = line.strip()
         if not line or line == "WEBVTT":
+            skipped['blank_or_header'] += 1
             continue
         if "-->" in line:
+            skipped['cue_timing'] += 1
             continue
         if line.isdigit():
+            skipped['cue_number'] += 1
             continue
         cleaned = clean_line(line)
         if cleaned and cleaned != last_line:
             text_lines.append(cleaned)
             last_line = cleaned
+        else:
+            skipped['duplicate' if cleaned else 'markup_only'] += 1
+    if watch:
+        watch.lap('extract')
 
     # Join with newlines for plain text output
     plain_text = '\n'.join(text_lines)
@@ -37,6 +56,14 @@ def vtt_to_text(vtt_file_path):
     output_file_path = base + ".txt"
     with open(output_file_path, 'w', encoding='utf-8') as f:
         f.write(plain_text)
+    if watch:
+        watch.lap('write')
+        watch.stop()
+        metrics.input_path = vtt_file_path
+        metrics.output_path = output_file_path
+        metrics.lines += len(lines)
+        metrics.rows += len(text_lines)
+        metrics.skipped.update(skipped)
     print(f"Transcript saved to: {output_file_path}")
     return output_file_path
 
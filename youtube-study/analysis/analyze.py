@@ -4,6 +4,7 @@
 # and counts the number of messages sent by each author.
 # It generates a markdown table with the results.
 # added logging functionality to track errors and warnings
+# also reads Parquet chat files (needs pyarrow), loading only the columns it uses
 
 import csv
 from datetime import datetime, timedelta
@@ -27,6 +28,48 @@ def parse_superchat_value(message):
         return currency, value
     return None, 0
 
+def iter_parquet_rows(source):
+    """
+    Yields (message, author, timestamp, superchat_info) from a Parquet chat file,
+    reading only the columns needed. Supports ytdownload/download.py output
+    (Message, Author, Timestamp) and youtube-downloader-app replays
+    (author, message, timestamp, type, amount, currency).
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet requires pyarrow: pip install pyarrow") from None
+
+    names = set(pq.read_schema(source).names)
+    if {'Message', 'Author', 'Timestamp'} <= names:
+        table = pq.read_table(source, columns=['Message', 'Author', 'Timestamp'])
+        for row_num, (message, author, timestamp) in enumerate(zip(
+                *(table.column(name).to_pylist() for name in table.column_names)), start=1):
+            if not (message and author and timestamp):
+                logging.warning(f"Incomplete data in row {row_num}")
+                continue
+            superchat_info = None
+            if message.startswith('[Superchat'):
+                currency, value = parse_superchat_value(message)
+                if currency and value:
+                    superchat_info = (currency, value)
+                else:
+                    logging.warning(f"Unable to parse Superchat value in row {row_num}: {message}")
+            yield message, author, timestamp, superchat_info
+        return
+
+    columns = ['message', 'author', 'timestamp', 'type', 'amount', 'currency']
+    table = pq.read_table(source, columns=columns)
+    for row_num, (message, author, timestamp, type_, amount, currency) in enumerate(zip(
+            *(table.column(name).to_pylist() for name in columns)), start=1):
+        if not (author and timestamp):
+            logging.warning(f"Incomplete data in row {row_num}")
+            continue
+        superchat_info = None
+        if type_ in ('superchat', 'supersticker') and amount is not None:
+            superchat_info = (currency or '', float(amount))
+        yield message, author, timestamp, superchat_info
+
 def seconds_to_hms(seconds):
     return str(timedelta(seconds=int(seconds)))
 
@@ -82,16 +125,20 @@ def analyze_csv(filename: str) -> Tuple[int, Dict[str, float], Dict[str, int], f
             logging.error(f"Error processing row {row_num}: {row}. Error: {e}")
             return None
 
-    # Open and read the CSV file
+    # Open and read the CSV (or Parquet) file
+    is_parquet = filename.endswith('.parquet')
     try:
-        with open(filename, 'r', newline='', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            
-            # Create a generator expression to process each row
-            processed_rows = (
-                process_row(row, row_num)
-                for row_num, row in enumerate(reader, start=1)
-            )
+        with (open(filename, 'rb') if is_parquet else open(filename, 'r', newline='', encoding='utf-8')) as file:
+            if is_parquet:
+                processed_rows = iter_parquet_rows(file)
+            else:
+                reader = csv.DictReader(file)
+
+                # Create a generator expression to process each row
+                processed_rows = (
+                    process_row(row, row_num)
+                    for row_num, row in enumerate(reader, start=1)
+                )
 
             # Iterate over the generator to update counts and lists
             for processed in processed_rows:
@@ -146,7 +193,7 @@ def generate_markdown_table(data):
     return markdown
 
 def main():
-    input_file = input("Live chat CSV filename? ")
+    input_file = input("Live chat CSV (or .parquet) filename? ")
     output_file = input_file+'_analysis_results.md'
 
     try:
@@ -10,6 +10,10 @@ Filters applied (in order):
      time window, the repeat is dropped.
   4. Reaction flood: short messages (reactions/memes) that have already
      appeared many times within a time window are dropped.
+
+Parquet input (kick_vod_downloader.py --chat-format parquet, needs pyarrow) is
+filtered using only the message, user_id and vod_offset columns; the kept rows
+are written as Parquet with all columns.
 """
 
 import csv
@@ -17,6 +21,7 @@ import re
 import sys
 import argparse
 from collections import defaultdict, deque
+from contextlib import ExitStack
 from pathlib import Path
 
 EMOTE_RE = re.compile(r'\[emote:\d+:[^\]]+\]')
@@ -53,13 +58,41 @@ def parse_vod_offset(s):
     return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
 
 
+def offset_seconds(value):
+    """vod_offset as whole seconds: 'H:MM:SS' from CSV, timedelta or int from Parquet."""
+    if value is None or value == '':
+        raise ValueError('blank vod_offset')
+    if isinstance(value, str):
+        return parse_vod_offset(value)
+    if hasattr(value, 'total_seconds'):
+        return int(value.total_seconds())
+    return int(value)
+
+
+def read_parquet(path):
+    """Read a Parquet chat file into a pyarrow Table."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        print('Error: Parquet input requires pyarrow (pip install pyarrow)', file=sys.stderr)
+        sys.exit(1)
+    return pq.read_table(path)
+
+
+def parquet_rows(table):
+    """Yield (index, message, user_id, vod_offset) from just those columns of table."""
+    columns = (table.column(name).to_pylist() for name in ('message', 'user_id', 'vod_offset'))
+    for index, (message, user_id, vod_offset) in enumerate(zip(*columns)):
+        yield index, message or '', user_id, vod_offset
+
+
 def main():
     parser = argparse.ArgumentParser(
-        description='Filter repetitive and emote-only messages from Kick chat CSV',
+        description='Filter repetitive and emote-only messages from Kick chat CSV or Parquet',
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
-    parser.add_argument('input', help='Input CSV file')
-    parser.add_argument('-o', '--output', help='Output CSV (default: <input>_filtered.csv)')
+    parser.add_argument('input', help='Input CSV or .parquet file')
+    parser.add_argument('-o', '--output', help='Output file (default: <input>_filtered.csv, or .parquet for Parquet input)')
     parser.add_argument(
         '--user-dedup-window', type=int, default=120, metavar='SECS',
         help='Suppress same user posting the same message within this window',
@@ -105,25 +138,30 @@ def main():
     dropped_reaction = 0
     total = 0
 
-    with open(input_path, newline='', encoding='utf-8') as inf, \
-         open(output_path, 'w', newline='', encoding='utf-8') as outf:
-
-        reader = csv.DictReader(inf)
-        if reader.fieldnames is None:
-            print('Error: empty or invalid CSV', file=sys.stderr)
-            sys.exit(1)
-
-        writer = csv.DictWriter(outf, fieldnames=reader.fieldnames)
-        writer.writeheader()
-
-        for row in reader:
+    is_parquet = input_path.suffix == '.parquet'
+    with ExitStack() as stack:
+        if is_parquet:
+            table = read_parquet(input_path)
+            rows = parquet_rows(table)
+            kept_indices = []
+        else:
+            inf = stack.enter_context(open(input_path, newline='', encoding='utf-8'))
+            reader = csv.DictReader(inf)
+            if reader.fieldnames is None:
+                print('Error: empty or invalid CSV', file=sys.stderr)
+                sys.exit(1)
+
+            outf = stack.enter_context(open(output_path, 'w', newline='', encoding='utf-8'))
+            writer = csv.DictWriter(outf, fieldnames=reader.fieldnames)
+            writer.writeheader()
+            rows = ((row, row['message'], row['user_id'], row.get('vod_offset', '')) for row in reader)
+
+        for row, message, user_id, vod_offset in rows:
             total += 1
-            message = row['message']
-            user_id = row['user_id']
             # vod_offset can be blank when the source timestamp was unparseable;
             # such rows skip the time-window filters (3 and 4) but keep 1 and 2.
             try:
-                offset_s = parse_vod_offset(row.get('vod_offset', ''))
+                offset_s = offset_seconds(vod_offset)
             except (ValueError, IndexError):
                 offset_s = None
 
@@ -160,9 +198,16 @@ def main():
                     continue
                 q.append(offset_s)
 
-            writer.writerow(row)
+            if is_parquet:
+                kept_indices.append(row)
+            else:
+                writer.writerow(row)
             kept += 1
 
+        if is_parquet:
+            import pyarrow.parquet as pq
+            pq.write_table(table.take(kept_indices), output_path, compression='zstd')
+
     print(f'Input:  {total:,} messages')
     print(f'Output: {kept:,} messages kept ({kept / total * 100:.1f}%)')
     print(f'  Emote-only dropped:        {dropped_emote:,}')
@@ -0,0 +1,239 @@
+# bench_captions.py
+#   - Benchmarks for captions.py on a recorded audio file instead of a live
+#     stream (any format ffmpeg reads).
+#   - latency: plays the recording through LiveCaptionFetcher's ffmpeg pipe
+#     at real-time speed (ffmpeg -re) and reports the time from each chunk
+#     being captured to its CSV rows being written, for chunks handed to
+#     Whisper as float32 arrays (in_memory=True) and as WAV files. Also
+#     times the handoff alone: float32 conversion vs writing a WAV and
+#     decoding it again with ffmpeg, as Whisper does for a file path.
+#   - rtf: real-time factor (transcription time / audio duration; below 1
+#     keeps up with a live stream) of each model size on a recording, cut
+#     into chunk-sized pieces as a live capture would be, with the model
+#     loaded once beforehand. Load time is reported separately.
+#   - vad: runs SpeechDetector on each chunk of a recording and transcribes
+#     every chunk anyway, to measure the CPU and wall time the skipped
+#     chunks would have cost per hour of stream, and the words Whisper
+#     found in them (captions the gate would lose).
+#   - Usage: python bench_captions.py latency RECORDING [--seconds 120] [--chunk 10] [--model base]
+#            python bench_captions.py rtf RECORDING [--backend auto] [--sizes tiny base ...] [--seconds 120]
+#            python bench_captions.py vad RECORDING [--backend auto] [--model base] [--seconds 600]
+
+import argparse
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+import wave
+
+from captions import (
+    BACKENDS, BYTES_PER_SECOND, SAMPLE_RATE, SAMPLE_WIDTH, LiveCaptionFetcher, SpeechDetector, make_backend,
+)
+
+
+class RecordingCaptionFetcher(LiveCaptionFetcher):
+    """LiveCaptionFetcher that 'streams' a local recording at real-time speed."""
+
+    def __init__(self, recording: str, seconds: float, **kwargs):
+        super().__init__(**kwargs)
+        self.recording = recording
+        self.seconds = seconds
+
+    def _get_stream_url(self, video_id):
+        return self.recording
+
+    def _is_stream_live(self, video_id):
+        # Live while the recording is still playing; once ffmpeg exits, the stream has ended
+        return self._ffmpeg_process is None or self._ffmpeg_process.poll() is None
+
+    def _ffmpeg_pipe_command(self, stream_url):
+        command = super()._ffmpeg_pipe_command(stream_url)
+        i = command.index('-i')
+        return command[:i] + ['-re', '-t', str(self.seconds)] + command[i:]
+
+
+def decode_pcm(recording: str, seconds: float) -> bytes:
+    result = subprocess.run(
+        ['ffmpeg', '-nostdin', '-t', str(seconds), '-i', recording, '-vn', '-acodec', 'pcm_s16le',
+         '-ar', str(SAMPLE_RATE), '-ac', '1', '-f', 's16le', '-loglevel', 'error', 'pipe:1'],
+        capture_output=True, check=True,
+    )
+    return result.stdout
+
+
+def wav_round_trip(pcm: bytes, path: str) -> bytes:
+    """What the WAV handoff costs per chunk: write the file, then decode it with ffmpeg like Whisper's load_audio()."""
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(SAMPLE_WIDTH)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm)
+    result = subprocess.run(
+        ['ffmpeg', '-nostdin', '-threads', '0', '-i', path, '-f', 's16le', '-ac', '1',
+         '-acodec', 'pcm_s16le', '-ar', str(SAMPLE_RATE), '-'],
+        capture_output=True, check=True,
+    )
+    os.remove(path)
+    return result.stdout
+
+
+def bench_handoff(recording: str, chunk: int) -> None:
+    pcm = decode_pcm(recording, chunk * 20)
+    chunk_bytes = chunk * BYTES_PER_SECOND
+    chunks = [pcm[i:i + chunk_bytes] for i in range(0, len(pcm) - chunk_bytes + 1, chunk_bytes)]
+    if not chunks:
+        print(f"Recording is shorter than one {chunk}s chunk")
+        return
+    print(f"Handoff only, {len(chunks)} chunks of {chunk}s:")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for label, handoff in (
+            ('float32 array', LiveCaptionFetcher._pcm_to_float32),
+            ('WAV file + ffmpeg decode', lambda c: wav_round_trip(c, os.path.join(temp_dir, 'chunk.wav'))),
+        ):
+            start = time.perf_counter()
+            for c in chunks:
+                handoff(c)
+            per_chunk = (time.perf_counter() - start) / len(chunks)
+            print(f"  {label:<26} {per_chunk * 1000:8.2f} ms/chunk")
+
+
+def bench_latency(args) -> None:
+    bench_handoff(args.recording, args.chunk)
+    print(f"\nCapture to CSV row, {args.seconds:g}s of audio at real-time speed, model {args.model}:")
+    results = {}
+    with tempfile.TemporaryDirectory() as out_dir:
+        cwd = os.getcwd()
+        os.chdir(out_dir)  # The caption CSVs
+        try:
+            for label, in_memory in (('float32 array', True), ('WAV file', False)):
+                fetcher = RecordingCaptionFetcher(
+                    args.recording, args.seconds, model_size=args.model, chunk_duration=args.chunk,
+                    in_memory=in_memory,
+                )
+                fetcher.fetch_live_captions('recording')
+                results[label] = fetcher.latencies
+        finally:
+            os.chdir(cwd)
+    for label, latencies in results.items():
+        if not latencies:
+            print(f"  {label:<14} no chunks")
+            continue
+        latencies = sorted(latencies)
+        print(f"  {label:<14} median {statistics.median(latencies):6.2f}s  "
+              f"p95 {latencies[int(len(latencies) * 0.95)]:6.2f}s  max {latencies[-1]:6.2f}s  "
+              f"({len(latencies)} chunks)")
+
+
+def bench_rtf(args) -> None:
+    backend = make_backend(args.backend)
+    sizes = args.sizes or list(dict.fromkeys(backend.model_map))
+    pcm = decode_pcm(args.recording, args.seconds)
+    chunk_bytes = args.chunk * BYTES_PER_SECOND
+    chunks = [LiveCaptionFetcher._pcm_to_float32(pcm[i:i + chunk_bytes]) for i in range(0, len(pcm), chunk_bytes)]
+    duration = len(pcm) / BYTES_PER_SECOND
+    print(f"{duration:.0f}s of audio in {len(chunks)} chunks of {args.chunk}s, backend {backend.name}\n")
+    print(f"{'size':<9} {'model':<36} {'load s':>7} {'RTF':>6} {'worst chunk s':>14} {'words':>7}")
+
+    done = set()
+    for size in sizes:
+        model_name = backend.model_name(size)
+        if model_name in done:
+            continue  # e.g. large and large-v3
+        done.add(model_name)
+        backend = make_backend(backend.name)  # Fresh instance, so one model is resident at a time
+        start = time.perf_counter()
+        backend.load(size)
+        load_seconds = time.perf_counter() - start
+        words = 0
+        chunk_times = []
+        for chunk in chunks:
+            start = time.perf_counter()
+            segments = backend.transcribe(chunk, args.language)
+            chunk_times.append(time.perf_counter() - start)
+            words += sum(len(seg.get('text', '').split()) for seg in segments)
+        rtf = sum(chunk_times) / duration if duration else 0.0
+        print(f"{size:<9} {model_name:<36} {load_seconds:7.1f} {rtf:6.3f} {max(chunk_times):14.2f} {words:7,}")
+
+
+def bench_vad(args) -> None:
+    fetcher = LiveCaptionFetcher(model_size=args.model, language=args.language, backend=args.backend)
+    fetcher.load_model()
+    detector = SpeechDetector()
+    pcm = decode_pcm(args.recording, args.seconds)
+    chunk_bytes = args.chunk * BYTES_PER_SECOND
+    chunks = [LiveCaptionFetcher._pcm_to_float32(pcm[i:i + chunk_bytes]) for i in range(0, len(pcm), chunk_bytes)]
+    duration = len(pcm) / BYTES_PER_SECOND
+    if not duration:
+        print("No audio decoded")
+        return
+    print(f"{duration:.0f}s of audio in {len(chunks)} chunks of {args.chunk}s, "
+          f"backend {fetcher.backend.name}, model {args.model}\n")
+
+    totals = {label: {'chunks': 0, 'seconds': 0.0, 'cpu': 0.0, 'wall': 0.0, 'words': 0}
+              for label in ('speech', 'skipped')}
+    vad_cpu = vad_wall = 0.0
+    for chunk in chunks:
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        is_speech = detector.is_speech(chunk)
+        vad_cpu += time.process_time() - cpu_start
+        vad_wall += time.perf_counter() - wall_start
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        segments = fetcher._transcribe_chunk(chunk) or []  # The same filters as a live capture
+        total = totals['speech' if is_speech else 'skipped']
+        total['cpu'] += time.process_time() - cpu_start
+        total['wall'] += time.perf_counter() - wall_start
+        total['chunks'] += 1
+        total['seconds'] += len(chunk) / SAMPLE_RATE
+        total['words'] += sum(len(seg.get('text', '').split()) for seg in segments)
+
+    hours = duration / 3600
+    print(f"{'':<9} {'chunks':>7} {'audio':>6} {'CPU s/hour':>11} {'wall s/hour':>12} {'words':>7}")
+    for label, total in totals.items():
+        print(f"{label:<9} {total['chunks']:7,} {total['seconds'] / duration:6.0%} {total['cpu'] / hours:11.1f} "
+              f"{total['wall'] / hours:12.1f} {total['words']:7,}")
+    skipped = totals['skipped']
+    all_cpu = sum(total['cpu'] for total in totals.values())
+    all_words = sum(total['words'] for total in totals.values())
+    print(f"\nGating saves {(skipped['cpu'] - vad_cpu) / hours / 60:.1f} min of CPU time "
+          f"({skipped['cpu'] / all_cpu if all_cpu else 0:.0%} of transcription) and "
+          f"{(skipped['wall'] - vad_wall) / hours / 60:.1f} min of wall time per hour of stream; "
+          f"the detector costs {vad_cpu / hours:.1f}s of CPU per hour.")
+    lost = f" ({skipped['words'] / all_words:.1%})" if all_words else ''
+    print(f"Words in skipped chunks: {skipped['words']:,} of {all_words:,}{lost}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark captions.py on a recorded audio file')
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+    latency = commands.add_parser('latency', help='Capture-to-CSV latency, float32 vs WAV handoff')
+    latency.add_argument('recording', help='Audio or video file')
+    latency.add_argument('--seconds', type=float, default=120, help='How much of the recording to play')
+    latency.add_argument('--chunk', type=int, default=10, help='Chunk duration in seconds')
+    latency.add_argument('--model', default='base', help='Whisper model size')
+    rtf = commands.add_parser('rtf', help='Real-time factor of each model size')
+    rtf.add_argument('recording', help='Audio or video file')
+    rtf.add_argument('--backend', default='auto', choices=['auto', *BACKENDS])
+    rtf.add_argument('--sizes', nargs='+', help='Model sizes (default: every size the backend maps)')
+    rtf.add_argument('--seconds', type=float, default=120, help='How much of the recording to transcribe')
+    rtf.add_argument('--chunk', type=int, default=10, help='Chunk duration in seconds')
+    rtf.add_argument('--language', default='en')
+    vad = commands.add_parser('vad', help='Transcription time saved by skipping chunks without speech')
+    vad.add_argument('recording', help='Audio or video file')
+    vad.add_argument('--backend', default='auto', choices=['auto', *BACKENDS])
+    vad.add_argument('--model', default='base', help='Whisper model size')
+    vad.add_argument('--seconds', type=float, default=600, help='How much of the recording to use')
+    vad.add_argument('--chunk', type=int, default=10, help='Chunk duration in seconds')
+    vad.add_argument('--language', default='en')
+    args = arg_parser.parse_args()
+
+    if args.command == 'latency':
+        bench_latency(args)
+    elif args.command == 'rtf':
+        bench_rtf(args)
+    elif args.command == 'vad':
+        bench_vad(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+# bench_chat_messages.py
+#   - Microbenchmark for YouTubeLiveChatFetcher.get_chat_message(): per-message
+#     cost of turning a liveChatMessages.list item into a row, by event type.
+#   - "before" is the previous dispatch (handler dict rebuilt on every call,
+#     result returned as a dict), kept here as LegacyChatFormatter for comparison;
+#     "after" is the current MESSAGE_HANDLERS lookup returning a ChatMessage.
+#   - No API key or network needed; items are generated locally.
+#   - "excl. timestamp" skips the publishedAt -> Eastern time conversion to
+#     show the cost of handler dispatch and building the record alone.
+#   - Usage: python bench_chat_messages.py [--messages N]
+
+import argparse
+import time
+from typing import Any, Dict
+
+import livechat
+
+
+def make_item(event_type: str, i: int) -> dict:
+    """A liveChatMessages resource shaped like the Data API's response."""
+    snippet = {
+        'type': event_type,
+        'publishedAt': f'2026-03-01T18:{i // 60 % 60:02d}:{i % 60:02d}.{i % 1000:03d}000+00:00',
+        'displayMessage': f'message number {i}',
+    }
+    if event_type == 'superChatEvent':
+        snippet['superChatDetails'] = {'amountDisplayString': '$5.00', 'userComment': 'thanks!'}
+    elif event_type == 'superStickerEvent':
+        snippet['superStickerDetails'] = {'amountDisplayString': '$2.00',
+                                          'superStickerMetadata': {'altText': 'cat'}}
+    elif event_type == 'memberMilestoneChatEvent':
+        snippet['memberMilestoneChatDetails'] = {'memberMonth': 6, 'userComment': 'half a year'}
+    return {'snippet': snippet, 'authorDetails': {'displayName': f'viewer{i % 500}'}}
+
+
+class LegacyChatFormatter:
+    """get_chat_message() and its handlers as they were before the prebuilt MESSAGE_HANDLERS map."""
+
+    def convert_to_eastern(self, timestamp: str) -> str:
+        return livechat.convert_to_eastern(timestamp)
+
+    def get_chat_message(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        message_type = item['snippet']['type']
+        author = item['authorDetails']['displayName']
+        timestamp = self.convert_to_eastern(item['snippet']['publishedAt'])
+
+        message_handlers = {
+            'textMessageEvent': self._handle_text_message,
+            'superChatEvent': self._handle_super_chat,
+            'superStickerEvent': self._handle_super_sticker,
+            'newSponsorEvent': self._handle_new_sponsor,
+            'memberMilestoneChatEvent': self._handle_member_milestone,
+            'giftMembershipReceivedEvent': self._handle_gift_membership_received,
+            'membershipGiftingEvent': self._handle_membership_gifting,
+            'messageDeletedEvent': self._handle_message_deleted,
+        }
+
+        handler = message_handlers.get(message_type, self._handle_other_event)
+        message, superchat_amount = handler(item)
+
+        return {
+            'timestamp': timestamp,
+            'author': author,
+            'message': message,
+            'type': message_type,
+            'superchat_amount': superchat_amount
+        }
+
+    def _handle_text_message(self, item: Dict[str, Any]) -> tuple:
+        return item['snippet'].get('displayMessage', ''), ''
+
+    def _handle_super_chat(self, item: Dict[str, Any]) -> tuple:
+        superchat_details = item['snippet'].get('superChatDetails', {})
+        return superchat_details.get('userComment', ''), superchat_details.get('amountDisplayString', '')
+
+    def _handle_super_sticker(self, item: Dict[str, Any]) -> tuple:
+        superchat_details = item['snippet'].get('superStickerDetails', {})
+        message = f"Super Sticker: {superchat_details.get('superStickerMetadata', {}).get('altText', '')}"
+        return message, superchat_details.get('amountDisplayString', '')
+
+    def _handle_new_sponsor(self, item: Dict[str, Any]) -> tuple:
+        return "New Sponsor!", ''
+
+    def _handle_member_milestone(self, item: Dict[str, Any]) -> tuple:
+        details = item['snippet'].get('memberMilestoneChatDetails', {})
+        months = details.get('memberMonth', '?')
+        message = details.get('userComment', '')
+        return f"Member Milestone ({months} months): {message}" if message else f"Member Milestone ({months} months)", ''
+
+    def _handle_gift_membership_received(self, item: Dict[str, Any]) -> tuple:
+        details = item['snippet'].get('giftMembershipReceivedDetails', {})
+        gifter = details.get('gifterChannelId', 'Anonymous')
+        tier = details.get('memberLevelName', 'membership')
+        return f"Received gift {tier} from {gifter}", ''
+
+    def _handle_membership_gifting(self, item: Dict[str, Any]) -> tuple:
+        details = item['snippet'].get('membershipGiftingDetails', {})
+        count = details.get('giftMembershipsCount', 1)
+        tier = details.get('giftMembershipsLevelName', 'memberships')
+        return f"Gifted {count} {tier}", ''
+
+    def _handle_message_deleted(self, item: Dict[str, Any]) -> tuple:
+        return "[Message Deleted]", ''
+
+    def _handle_other_event(self, item: Dict[str, Any]) -> tuple:
+        return f"Other event type: {item['snippet']['type']}", ''
+
+
+def bench(items: list, get_chat_message=None, with_timestamp: bool = True, repeat: int = 5) -> float:
+    """Best-of-repeat nanoseconds per get_chat_message() call (the current one by default)."""
+    get_chat_message = get_chat_message or livechat.YouTubeLiveChatFetcher.get_chat_message
+    convert_to_eastern = livechat.convert_to_eastern
+    if not with_timestamp:
+        livechat.convert_to_eastern = lambda timestamp: timestamp
+    try:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for item in items:
+                get_chat_message(item)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        livechat.convert_to_eastern = convert_to_eastern
+    return best / len(items) * 1e9
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Microbenchmark get_chat_message()')
+    arg_parser.add_argument('--messages', type=int, default=20000, help='Messages per event type')
+    args = arg_parser.parse_args()
+
+    event_types = ['textMessageEvent', 'superChatEvent', 'superStickerEvent',
+                   'memberMilestoneChatEvent', 'messageDeletedEvent', 'pollEvent']
+    print(f"{'':<26} {'ns/msg':>17} {'excl. timestamp':>17}")
+    print(f"{'event type':<26} {'before':>8} {'after':>8} {'before':>8} {'after':>8}")
+    legacy = LegacyChatFormatter().get_chat_message
+    for event_type in event_types:
+        items = [make_item(event_type, i) for i in range(args.messages)]
+        print(f"{event_type:<26} {bench(items, legacy):>8,.0f} {bench(items):>8,.0f} "
+              f"{bench(items, legacy, with_timestamp=False):>8,.0f} "
+              f"{bench(items, with_timestamp=False):>8,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# bench_quota.py
+#   - Benchmark for livechat.py's quota managers: aggregate quota calls/sec with
+#     several processes sharing one quota file, as with parallel chat captures.
+#   - Each process loops remaining_quota() + log_consumption(1), the pattern of
+#     one poll; afterwards the total used is checked against the calls made.
+#   - Works on a temporary quota file; no API key or network needed.
+#   - Usage: python bench_quota.py [--processes 1 4 8] [--calls N]
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from livechat import BufferedQuotaManager, QuotaManager
+
+MANAGERS = {'QuotaManager': QuotaManager, 'BufferedQuotaManager': BufferedQuotaManager}
+
+
+def worker(manager_name: str, storage_path: str, calls: int, barrier) -> None:
+    manager = MANAGERS[manager_name](max_daily_quota=10 ** 9, storage_path=Path(storage_path))
+    barrier.wait()
+    for _ in range(calls):
+        manager.remaining_quota()
+        manager.log_consumption(1, 'bench')
+    manager.flush()
+
+
+def run(manager_name: str, processes: int, calls: int) -> tuple:
+    """(calls/sec over all processes, quota used as seen afterwards by a plain QuotaManager)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        storage_path = str(Path(tmp) / '.youtube_quota.json')
+        barrier = multiprocessing.Barrier(processes + 1)
+        procs = [
+            multiprocessing.Process(target=worker, args=(manager_name, storage_path, calls, barrier))
+            for _ in range(processes)
+        ]
+        for proc in procs:
+            proc.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for proc in procs:
+            proc.join()
+        elapsed = time.perf_counter() - start
+        check = QuotaManager(max_daily_quota=10 ** 9, storage_path=Path(storage_path))
+        used = 10 ** 9 - check.remaining_quota()
+    # Two quota calls per loop
+    return processes * calls * 2 / elapsed, used
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark QuotaManager vs BufferedQuotaManager')
+    arg_parser.add_argument('--processes', type=int, nargs='+', default=[1, 4, 8], help='Process counts to try')
+    arg_parser.add_argument('--calls', type=int, default=2000, help='Polls per process')
+    args = arg_parser.parse_args()
+
+    print(f"{'manager':<22} {'procs':>5} {'calls/sec':>11} {'used':>9} {'expected':>9}")
+    for processes in args.processes:
+        for name in MANAGERS:
+            rate, used = run(name, processes, args.calls)
+            expected = processes * args.calls
+            flag = '' if used == expected else '  MISMATCH'
+            print(f"{name:<22} {processes:>5} {rate:>11,.0f} {used:>9,} {expected:>9,}{flag}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# bench_startup.py
+#   - Startup benchmark for livechat.py: how long after launch the first
+#     liveChatMessages.list request could go out. Each measurement runs in a
+#     fresh interpreter, so imports are cold every time.
+#   - "ready" = import livechat, create YouTubeLiveChatFetcher, resolve the API
+#     key, build the API client and a liveChatMessages.list request (not sent).
+#   - "ready after prompts" starts prewarm() as main() does, waits
+#     --prompt-seconds as if the user were typing, then times the rest.
+#   - Uses YOUTUBE_API_KEY from the environment if set (an op:// reference
+#     includes the 1Password CLI in the timings), otherwise a dummy key.
+#   - Usage: python bench_startup.py [--runs 5] [--prompt-seconds 3]
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+IMPORT = "import {module}"
+READY = """
+import livechat
+fetcher = livechat.YouTubeLiveChatFetcher()
+fetcher.youtube.liveChatMessages().list(liveChatId='x', part='snippet,authorDetails', maxResults=200)
+"""
+READY_AFTER_PROMPTS = """
+import time
+import livechat
+livechat.prewarm().join({prompt_seconds})
+start = time.perf_counter()
+fetcher = livechat.YouTubeLiveChatFetcher()
+fetcher.youtube.liveChatMessages().list(liveChatId='x', part='snippet,authorDetails', maxResults=200)
+print(time.perf_counter() - start)
+"""
+TIMED = "import time\nstart = time.perf_counter()\n{body}\nprint(time.perf_counter() - start)\n"
+
+
+def measure(code: str, runs: int) -> float:
+    """Median seconds printed by code over fresh interpreters."""
+    env = dict(os.environ)
+    env.setdefault('YOUTUBE_API_KEY', 'bench-dummy-key')
+    times = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', code], cwd=HERE, env=env,
+                                capture_output=True, text=True, check=True)
+        times.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark livechat.py startup')
+    arg_parser.add_argument('--runs', type=int, default=5)
+    arg_parser.add_argument('--prompt-seconds', type=float, default=3.0,
+                            help='Time the user spends answering the prompts')
+    args = arg_parser.parse_args()
+
+    print(f"Median of {args.runs} fresh interpreters\n")
+    print("Import cost:")
+    for module in ('livechat', 'googleapiclient.discovery', 'googleapiclient.errors', 'pytz', 'dotenv'):
+        seconds = measure(TIMED.format(body=IMPORT.format(module=module)), args.runs)
+        print(f"  import {module:<28} {seconds * 1000:7.1f} ms")
+
+    print("\nTime to first request:")
+    seconds = measure(TIMED.format(body=READY), args.runs)
+    print(f"  {'ready (cold)':<35} {seconds * 1000:7.1f} ms")
+    seconds = measure(READY_AFTER_PROMPTS.format(prompt_seconds=args.prompt_seconds), args.runs)
+    print(f"  {f'ready after {args.prompt_seconds:g} s of prompts':<35} {seconds * 1000:7.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# bench_timefmt.py
+#   - Benchmark for timefmt.py against the per-call conversions it replaced:
+#     dateutil.parser.parse() + pytz astimezone() + strftime() for publishedAt
+#     strings (livechat.py), and fromtimestamp() + pytz.timezone() lookup +
+#     strftime() for epoch seconds (download.py, comments.py, extract_comments.py,
+#     livechat_to_csv.py).
+#   - First checks that both give identical strings for timestamps every 37 s
+#     across the 2024 DST switches in US/Eastern and in Australia/Lord_Howe
+#     (whose 30-minute switch falls mid-hour in UTC).
+#   - Usage: python bench_timefmt.py [--messages N]
+
+import argparse
+import time
+from datetime import datetime, timezone
+
+import pytz
+from dateutil import parser
+
+import timefmt
+
+
+def old_iso_to_eastern(text: str) -> str:
+    dt = parser.parse(text)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=pytz.UTC)
+    return dt.astimezone(pytz.timezone('US/Eastern')).strftime('%Y-%m-%d %H:%M:%S %Z')
+
+
+def old_epoch_to_zone(seconds: int, zone: str = 'US/Eastern', fmt: str = timefmt.DEFAULT_FORMAT) -> str:
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).astimezone(pytz.timezone(zone)).strftime(fmt)
+
+
+def iso(seconds: int, i: int) -> str:
+    """publishedAt in the Data API's layout, varying the fraction and offset spelling."""
+    stamp = datetime.fromtimestamp(seconds, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+    return stamp + ('.%06d+00:00' % (i % 1000000) if i % 3 else 'Z')
+
+
+def check() -> int:
+    checked = 0
+    for zone in ('US/Eastern', 'Australia/Lord_Howe'):
+        for fmt in (timefmt.DEFAULT_FORMAT, timefmt.ZONE_FORMAT, '%d/%m/%Y %I:%M %p %Z'):
+            formatter = timefmt.TimestampFormatter(zone, fmt)
+            for start in (datetime(2024, 3, 9, tzinfo=timezone.utc), datetime(2024, 11, 2, tzinfo=timezone.utc),
+                          datetime(2024, 4, 6, tzinfo=timezone.utc), datetime(2024, 10, 5, tzinfo=timezone.utc)):
+                base = int(start.timestamp())
+                for seconds in range(base, base + 2 * 86400, 37):
+                    expected = old_epoch_to_zone(seconds, zone, fmt)
+                    got = formatter.format_epoch(seconds)
+                    assert got == expected, (zone, fmt, seconds, got, expected)
+                    checked += 1
+    eastern = timefmt.formatter('US/Eastern', timefmt.ZONE_FORMAT)
+    base = int(datetime(2024, 3, 9, tzinfo=timezone.utc).timestamp())
+    for i, seconds in enumerate(range(base, base + 2 * 86400, 37)):
+        text = iso(seconds, i)
+        assert eastern.format_iso(text) == old_iso_to_eastern(text), text
+        checked += 1
+    for text in ('2024-03-10T06:59:59-01:00', '2024-03-10 07:00:00', '2024-03-10T07:00:00.5+0000'):
+        assert eastern.format_iso(text) == old_iso_to_eastern(text), text
+    return checked
+
+
+def run(label: str, func, inputs) -> float:
+    start = time.perf_counter()
+    for value in inputs:
+        func(value)
+    per_call = (time.perf_counter() - start) / len(inputs) * 1e6
+    print(f"  {label:<34} {per_call:7.2f} µs/call")
+    return per_call
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark timefmt against per-call dateutil/pytz conversion')
+    arg_parser.add_argument('--messages', type=int, default=100000)
+    args = arg_parser.parse_args()
+
+    print(f"Checked {check():,} conversions: identical output")
+
+    # A 4-hour chat: one message every 4 h / N seconds
+    base = int(datetime(2026, 3, 1, 18, tzinfo=timezone.utc).timestamp())
+    step = max(4 * 3600 // args.messages, 1)
+    epochs = [base + i * step for i in range(args.messages)]
+    isos = [iso(seconds, i) for i, seconds in enumerate(epochs)]
+
+    print(f"\n{args.messages:,} publishedAt strings -> Eastern (livechat.py)")
+    old = run('dateutil + pytz + strftime', old_iso_to_eastern, isos)
+    new = run('timefmt.format_iso', timefmt.formatter('US/Eastern', timefmt.ZONE_FORMAT).format_iso, isos)
+    print(f"  speedup {old / new:.1f}x")
+
+    print(f"\n{args.messages:,} epoch seconds -> Eastern (comments, download)")
+    old = run('fromtimestamp + pytz + strftime', old_epoch_to_zone, epochs)
+    new = run('timefmt.format_epoch', timefmt.formatter('US/Eastern').format_epoch, epochs)
+    print(f"  speedup {old / new:.1f}x")
+
+    print(f"\n{args.messages:,} epoch seconds -> UTC (livechat_to_csv)")
+    old = run('fromtimestamp + strftime',
+              lambda s: datetime.fromtimestamp(s, tz=timezone.utc).strftime(timefmt.DEFAULT_FORMAT), epochs)
+    new = run('timefmt.format_epoch', timefmt.formatter('UTC').format_epoch, epochs)
+    print(f"  speedup {old / new:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,8 @@
 # livecaptions.py
 #   - Capture live transcriptions from YouTube live streams using yt-dlp + Whisper
 #   - Similar interface to livechat.py
-#   - Uses mlx-whisper (optimized for Apple Silicon)
+#   - Uses mlx-whisper (optimized for Apple Silicon), or faster-whisper on the
+#     CPU elsewhere (int8 CTranslate2 models)
 
 import os
 import sys
@@ -13,11 +14,17 @@ import subprocess
 import tempfile
 import threading
 import queue
+import wave
+from abc import ABC, abstractmethod
+from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
 import pytz
 
+if TYPE_CHECKING:
+    import numpy
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 
@@ -27,7 +34,7 @@ def check_dependencies() -> dict:
     status = {
         'yt-dlp': False,
         'ffmpeg': False,
-        'mlx-whisper': False,
+        'whisper': False,
     }
 
     # Check yt-dlp
@@ -44,12 +51,8 @@ def check_dependencies() -> dict:
     except FileNotFoundError:
         pass
 
-    # Check mlx-whisper
-    try:
-        import mlx_whisper
-        status['mlx-whisper'] = True
-    except ImportError:
-        pass
+    # Check for a transcription backend (mlx-whisper or faster-whisper)
+    status['whisper'] = any(backend.available() for backend in BACKENDS.values())
 
     return status
 
@@ -73,14 +76,381 @@ def extract_video_id(url_or_id: str) -> str:
     return url_or_id
 
 
+# Audio format ffmpeg is asked for: 16 kHz mono signed 16-bit little-endian PCM (what Whisper expects)
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+BYTES_PER_SECOND = SAMPLE_RATE * SAMPLE_WIDTH
+
+
+class PcmRingBuffer:
+    """
+    Fixed-size ring buffer of raw PCM between the thread reading ffmpeg's
+    stdout and the thread cutting it into chunks. The reader never waits:
+    if the chunker falls more than the buffer's length behind, the oldest
+    unread audio is overwritten and counted in dropped_bytes, so ffmpeg
+    keeps reading the live stream instead of stalling on a full pipe.
+    """
+
+    def __init__(self, seconds: float = 120.0):
+        self.capacity = int(seconds * SAMPLE_RATE) * SAMPLE_WIDTH
+        self.dropped_bytes = 0
+        self.closed = False
+        self._buffer = bytearray(self.capacity)
+        self._written = 0  # Bytes written since capture started
+        self._read = 0  # Bytes consumed since capture started
+        self._write_time = 0.0  # Wall-clock time of the latest write
+        self._cond = threading.Condition()
+
+    def write(self, data: bytes) -> None:
+        with self._cond:
+            data = memoryview(data)
+            if len(data) > self.capacity:
+                # Only the newest capacity bytes can be kept
+                self._written += len(data) - self.capacity
+                data = data[-self.capacity:]
+            pos = self._written % self.capacity
+            first = min(len(data), self.capacity - pos)
+            self._buffer[pos:pos + first] = data[:first]
+            self._buffer[:len(data) - first] = data[first:]
+            self._written += len(data)
+            self._write_time = time.time()
+            if self._written - self._read > self.capacity:
+                self.dropped_bytes += self._written - self._read - self.capacity
+                self._read = self._written - self.capacity
+            self._cond.notify_all()
+
+    @property
+    def seconds_written(self) -> float:
+        return self._written / BYTES_PER_SECOND
+
+    def close(self) -> None:
+        """No more writes; read() then returns what is left, then None."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def read(self, size: int, timeout: float = 1.0,
+             advance: Optional[int] = None) -> Optional[Tuple[bytes, float, float]]:
+        """
+        Wait for size bytes and consume the first advance of them (default:
+        all), so the next read overlaps this one by size - advance. Returns
+        (pcm, wall-clock time of its first sample, its offset in seconds
+        from the start of the stream), or None if they don't arrive within
+        timeout. Once closed, returns the remainder (possibly
+        shorter) unless it was all in the previous read's overlap, then None.
+        The first sample's time assumes the latest write is at the live edge:
+        audio that arrives in a burst (ffmpeg catching up on buffered
+        segments) is dated back from there at real-time rate.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._written - self._read >= size or self.closed, timeout):
+                return None
+            overlap = size - (size if advance is None else advance)
+            available = self._written - self._read
+            if available <= 0 or (self.closed and available <= overlap and self._read > 0):
+                return None
+            short = available < size
+            size = min(size, available)
+            start = self._read
+            pos = start % self.capacity
+            first = min(size, self.capacity - pos)
+            pcm = bytes(self._buffer[pos:pos + first]) + bytes(self._buffer[:size - first])
+            self._read += size if advance is None or short else advance
+            return (
+                pcm,
+                self._write_time - (self._written - start) / BYTES_PER_SECOND,
+                start / BYTES_PER_SECOND,
+            )
+
+
+class TranscriptionBackend(ABC):
+    """
+    A Whisper implementation captions.py can transcribe with. load() loads a
+    model once and keeps it resident; transcribe() returns the segments of
+    one chunk as dicts with start, end, text, no_speech_prob and
+    compression_ratio, like openai-whisper's.
+    """
+
+    name = ''
+    module = ''  # Module whose presence means the backend can run
+    model_map: dict = {}
+
+    @classmethod
+    def available(cls) -> bool:
+        import importlib.util
+
+        return importlib.util.find_spec(cls.module) is not None
+
+    def model_name(self, model_size: str) -> str:
+        return self.model_map.get(model_size, self.model_map['base'])
+
+    @abstractmethod
+    def load(self, model_size: str) -> None:
+        ...
+
+    @abstractmethod
+    def transcribe(self, audio: Union[str, 'numpy.ndarray'], language: str) -> List[dict]:
+        ...
+
+
+class MlxWhisperBackend(TranscriptionBackend):
+    """mlx-whisper on the Apple Silicon GPU."""
+
+    name = 'mlx'
+    module = 'mlx_whisper'
+    # Map model sizes to mlx-whisper model names
+    model_map = {
+        'tiny': 'mlx-community/whisper-tiny-mlx',
+        'base': 'mlx-community/whisper-base-mlx',
+        'small': 'mlx-community/whisper-small-mlx',
+        'medium': 'mlx-community/whisper-medium-mlx',
+        'large': 'mlx-community/whisper-large-v3-mlx',
+        'large-v3': 'mlx-community/whisper-large-v3-mlx',
+    }
+
+    def __init__(self):
+        self._model_name = None
+
+    def load(self, model_size: str) -> None:
+        import mlx_whisper
+        import numpy as np
+
+        self._model_name = self.model_name(model_size)
+        # mlx-whisper keeps the last model it used loaded, so transcribing a
+        # second of silence downloads and loads it before the first chunk
+        mlx_whisper.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), path_or_hf_repo=self._model_name)
+
+    def transcribe(self, audio, language):
+        import mlx_whisper
+
+        result: dict = mlx_whisper.transcribe(
+            audio,
+            path_or_hf_repo=self._model_name,
+            language=language,
+            condition_on_previous_text=False,
+        )
+        return result.get('segments', [])
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    """faster-whisper (CTranslate2) on the CPU with int8 weights, for machines without Apple Silicon."""
+
+    name = 'faster-whisper'
+    module = 'faster_whisper'
+    model_map = {
+        'tiny': 'tiny',
+        'base': 'base',
+        'small': 'small',
+        'medium': 'medium',
+        'large': 'large-v3',
+        'large-v3': 'large-v3',
+    }
+
+    def __init__(self, compute_type: str = 'int8', cpu_threads: int = 0):
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads  # 0: CTranslate2's default
+        self._model = None
+
+    def load(self, model_size: str) -> None:
+        from faster_whisper import WhisperModel
+
+        self._model = WhisperModel(
+            self.model_name(model_size), device='cpu', compute_type=self.compute_type, cpu_threads=self.cpu_threads
+        )
+
+    def transcribe(self, audio, language):
+        # Greedy decoding, as mlx-whisper does by default
+        segments, _ = self._model.transcribe(
+            audio, language=language, beam_size=1, condition_on_previous_text=False
+        )
+        return [
+            {
+                'start': seg.start,
+                'end': seg.end,
+                'text': seg.text,
+                'no_speech_prob': seg.no_speech_prob,
+                'compression_ratio': seg.compression_ratio,
+            }
+            for seg in segments
+        ]
+
+
+BACKENDS = {backend.name: backend for backend in (MlxWhisperBackend, FasterWhisperBackend)}
+
+
+def make_backend(name: str = 'auto') -> TranscriptionBackend:
+    """Backend by name; 'auto' is mlx-whisper if installed, otherwise faster-whisper."""
+    if name == 'auto':
+        name = next((n for n, backend in BACKENDS.items() if backend.available()), FasterWhisperBackend.name)
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown transcription backend {name!r}; choose from {', '.join(BACKENDS)}") from None
+
+
+class SegmentStitcher:
+    """
+    Merges the segments of overlapping windows into one transcript.
+    Each window owns the audio from the previous window's cut to its own
+    cut, placed in the middle of its overlap with the next window, away
+    from both windows' edges where words get split. A segment goes to the
+    window whose span holds its midpoint. Segments past a window's cut are
+    held until the next window arrives, and only emitted if that window
+    doesn't cover them (audio dropped while transcription was behind), or
+    flush() is called (a window skipped or failed, or the stream ended). Words at the start of a window that repeat the
+    end of what was already emitted (a segment split differently by the
+    two windows) are trimmed by matching the text.
+    Windows are placed by their offset into the audio stream rather than by
+    wall-clock time, which is compressed when ffmpeg delivers a burst.
+    """
+
+    # Longest run of repeated words looked for
+    MAX_MATCH_WORDS = 12
+
+    def __init__(self, overlap: float):
+        self.overlap = overlap
+        self._cut: Optional[float] = None  # Stream offset up to which the transcript is final
+        self._pending: List[Tuple[float, datetime, dict]] = []
+        self._tail = deque(maxlen=self.MAX_MATCH_WORDS)  # Last words emitted, normalized
+
+    @staticmethod
+    def _normalize(words: List[str]) -> List[str]:
+        return [re.sub(r"[^\w']", '', word.lower()) for word in words]
+
+    @staticmethod
+    def _midpoint(offset: float, segment: dict) -> float:
+        return offset + (segment.get('start', 0) + segment.get('end', 0)) / 2
+
+    def _trim(self, segment: dict, straddles: bool) -> Optional[dict]:
+        """segment without leading words that repeat the emitted tail; None if nothing is left."""
+        words = segment.get('text', '').split()
+        normalized = self._normalize(words)
+        tail = list(self._tail)
+        for k in range(min(len(tail), len(words)), 0, -1):
+            # One matching word is only trusted when the timing says the segment overlaps
+            if tail[-k:] == normalized[:k] and (k >= 2 or straddles):
+                if k == len(words):
+                    return None
+                return dict(segment, text=' ' + ' '.join(words[k:]))
+        return segment
+
+    def _emit(self, pairs: List[Tuple[datetime, dict]]) -> List[Tuple[datetime, dict]]:
+        for _, segment in pairs:
+            self._tail.extend(self._normalize(segment.get('text', '').split()))
+        return pairs
+
+    def add(self, offset: float, window_start: datetime, duration: float,
+            segments: list) -> List[Tuple[datetime, dict]]:
+        """
+        A window's segments, with the window's offset into the stream and
+        wall-clock start. Returns the (window start, segment) pairs that are
+        now final, in order.
+        """
+        uncovered = [(ws, seg) for o, ws, seg in self._pending if self._midpoint(o, seg) < offset]
+        previous_cut = self._cut
+        cut = offset + duration - self.overlap / 2
+        kept = [seg for seg in segments if previous_cut is None or self._midpoint(offset, seg) >= previous_cut]
+        final = [seg for seg in kept if self._midpoint(offset, seg) < cut]
+        self._pending = [(offset, window_start, seg) for seg in kept if self._midpoint(offset, seg) >= cut]
+        self._cut = cut
+
+        pairs = self._emit(uncovered)
+        if final and previous_cut is not None:
+            straddles = offset + final[0].get('start', 0) < previous_cut
+            first = self._trim(final[0], straddles)
+            final = ([first] if first else []) + final[1:]
+        return pairs + self._emit([(window_start, seg) for seg in final])
+
+    def flush(self) -> List[Tuple[datetime, dict]]:
+        """
+        The held segments of the last window, once no more windows are
+        coming, or the next one wasn't transcribed. The window after that
+        doesn't overlap anything emitted, so it starts afresh.
+        """
+        pairs = self._emit([(ws, seg) for _, ws, seg in self._pending])
+        self._pending = []
+        self._cut = None
+        self._tail.clear()
+        return pairs
+
+
+class SpeechDetector:
+    """
+    Cheap voice-activity check run on each chunk before Whisper. The chunk
+    is split into 30 ms frames; a frame counts as speech if it is louder
+    than the stream's noise floor and its zero-crossing rate is in the
+    range of voiced speech (not hum, not hiss). A chunk with less than
+    MIN_SPEECH_SECONDS of such frames is skipped. It is tuned to let
+    doubtful chunks through, since a skipped chunk is lost captions while
+    a transcribed silent one only costs time: anything louder than
+    MAX_THRESHOLD_DB passes, so loud music still goes to Whisper and its
+    no-speech filter.
+    """
+
+    FRAME_SECONDS = 0.03
+    MIN_SPEECH_SECONDS = 0.3
+    ABSOLUTE_FLOOR_DB = -55.0  # dBFS; quieter frames are never speech
+    MAX_THRESHOLD_DB = -35.0  # dBFS; louder frames always count, however loud the noise floor
+    MARGIN_DB = 8.0  # How far above the noise floor speech has to be
+    MIN_ZCR = 0.01  # Zero crossings per sample; mains hum and rumble are below this
+    MAX_ZCR = 0.3  # Hiss and broadband noise are above this
+    FLOOR_CHUNKS = 30  # Chunks the noise floor is tracked over
+
+    def __init__(self):
+        # Quietest 10% of frames in each recent chunk, in dBFS
+        self._floors = deque(maxlen=self.FLOOR_CHUNKS)
+
+    @staticmethod
+    def samples(audio: Union[str, 'numpy.ndarray']) -> 'numpy.ndarray':
+        """A chunk as 16 kHz float32 samples, reading it if it's a WAV path."""
+        if isinstance(audio, str):
+            with wave.open(audio, 'rb') as wav:
+                return LiveCaptionFetcher._pcm_to_float32(wav.readframes(wav.getnframes()))
+        return audio
+
+    @property
+    def threshold_db(self) -> float:
+        floor = min(self._floors) if self._floors else self.ABSOLUTE_FLOOR_DB
+        return max(self.ABSOLUTE_FLOOR_DB, min(floor + self.MARGIN_DB, self.MAX_THRESHOLD_DB))
+
+    def speech_seconds(self, audio: Union[str, 'numpy.ndarray']) -> float:
+        """Seconds of speech-like frames in a chunk; also updates the noise floor."""
+        import numpy as np
+        samples = self.samples(audio)
+        frame = int(self.FRAME_SECONDS * SAMPLE_RATE)
+        count = len(samples) // frame
+        if not count:
+            return 0.0
+        frames = samples[:count * frame].reshape(count, frame)
+        level_db = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+        zcr = np.mean(np.signbit(frames[:, 1:]) != np.signbit(frames[:, :-1]), axis=1)
+        self._floors.append(float(np.percentile(level_db, 10)))
+        speech = (level_db > self.threshold_db) & (zcr >= self.MIN_ZCR) & (zcr <= self.MAX_ZCR)
+        return float(np.count_nonzero(speech)) * self.FRAME_SECONDS
+
+    def is_speech(self, audio: Union[str, 'numpy.ndarray']) -> bool:
+        return self.speech_seconds(audio) >= self.MIN_SPEECH_SECONDS
+
+
 class LiveCaptionFetcher:
     """Fetch and transcribe live captions from YouTube streams."""
 
+    CAPTURE_MODES = ('pipe', 'chunks')
+    # Seconds of audio the pipe mode can buffer while transcription catches up
+    RING_SECONDS = 120
+    # A pipe-mode chunk shorter than this (the tail when capture stops) isn't transcribed
+    MIN_CHUNK_SECONDS = 0.5
+
     def __init__(
         self,
         model_size: str = "base",
         language: str = "en",
         chunk_duration: int = 10,
+        capture_mode: str = 'pipe',
+        in_memory: bool = True,
+        backend: Union[str, TranscriptionBackend] = 'auto',
+        chunk_overlap: float = 0,
+        vad: bool = True,
     ):
         """
         Initialize the caption fetcher.
@@ -89,22 +459,43 @@ class LiveCaptionFetcher:
             model_size: Whisper model size (tiny, base, small, medium, large, large-v3)
             language: Language code for transcription
             chunk_duration: Duration of each audio chunk in seconds
+            capture_mode: 'pipe' (one long-running ffmpeg, chunks cut in memory)
+                or 'chunks' (a new ffmpeg process per chunk)
+            in_memory: In pipe mode, hand chunks to Whisper as float32 arrays
+                instead of WAV files it has to decode again
+            backend: 'mlx', 'faster-whisper', 'auto' (mlx-whisper if installed,
+                otherwise faster-whisper) or a TranscriptionBackend
+            chunk_overlap: Seconds each chunk overlaps the next (pipe mode only);
+                a new chunk starts every chunk_duration - chunk_overlap seconds
+                and their segments are merged by SegmentStitcher
+            vad: Skip chunks SpeechDetector finds no speech in instead of
+                transcribing them
         """
+        if capture_mode not in self.CAPTURE_MODES:
+            raise ValueError(f"capture_mode must be one of {self.CAPTURE_MODES}, not {capture_mode!r}")
+        if not 0 <= chunk_overlap < chunk_duration:
+            raise ValueError("chunk_overlap must be at least 0 and less than chunk_duration")
+        if chunk_overlap and capture_mode != 'pipe':
+            raise ValueError("chunk_overlap needs capture_mode='pipe'")
         self.model_size = model_size
         self.language = language
         self.chunk_duration = chunk_duration
+        self.chunk_overlap = chunk_overlap
+        self.capture_mode = capture_mode
+        self.in_memory = in_memory
+        # Seconds from each chunk being captured to its rows being written
+        self.latencies: List[float] = []
+        self.speech_detector = SpeechDetector() if vad else None
+        # Chunks and seconds of audio skipped or transcribed, and the time spent
+        self.vad_stats: dict = {}
         self.eastern = pytz.timezone('US/Eastern')
         self._stop_event = threading.Event()
+        self._ffmpeg_process: Optional[subprocess.Popen] = None
+        self.backend = make_backend(backend) if isinstance(backend, str) else backend
+        self._loaded_model: Optional[str] = None
 
-        # Map model sizes to mlx-whisper model names
-        self.model_map = {
-            'tiny': 'mlx-community/whisper-tiny-mlx',
-            'base': 'mlx-community/whisper-base-mlx',
-            'small': 'mlx-community/whisper-small-mlx',
-            'medium': 'mlx-community/whisper-medium-mlx',
-            'large': 'mlx-community/whisper-large-v3-mlx',
-            'large-v3': 'mlx-community/whisper-large-v3-mlx',
-        }
+        # Model size -> the backend's model name
+        self.model_map = self.backend.model_map
 
     def _is_stream_live(self, video_id: str) -> bool:
         """Check if a YouTube stream is currently live."""
@@ -202,7 +593,7 @@ class LiveCaptionFetcher:
                 if process.returncode == 0 and os.path.exists(chunk_file):
                     file_size = os.path.getsize(chunk_file)
                     if file_size > 1000:  # Minimum valid file size
-                        audio_queue.put((chunk_file, chunk_capture_start))
+                        audio_queue.put((chunk_file, chunk_capture_start, time.time(), None))
                         chunk_index += 1
                         consecutive_failures = 0
                         # Periodically verify the stream is still live
@@ -253,28 +644,290 @@ class LiveCaptionFetcher:
         # Signal end of stream
         audio_queue.put(None)
 
-    def _transcribe_chunk(self, audio_file: str) -> list:
-        """Transcribe an audio chunk and return segments."""
-        import mlx_whisper
+    def _ffmpeg_pipe_command(self, stream_url: str) -> List[str]:
+        return [
+            'ffmpeg',
+            '-i', stream_url,
+            '-vn',  # No video
+            '-acodec', 'pcm_s16le',
+            '-ar', str(SAMPLE_RATE),  # 16kHz for Whisper
+            '-ac', '1',  # Mono
+            '-f', 's16le',  # Raw samples, no WAV header
+            '-loglevel', 'error',
+            'pipe:1',
+        ]
+
+    def _run_ffmpeg_pipe(self, video_id: str, stream_url: str, ring: PcmRingBuffer) -> None:
+        """
+        Run one ffmpeg process that decodes the stream to raw PCM on stdout,
+        copying it into the ring buffer. If ffmpeg exits, it is restarted
+        (with a fresh URL after a 403) while the stream is still live.
+        Runs in a separate thread; closes the ring buffer when done.
+        """
+        consecutive_failures = 0
+        max_failures = 5
+        restarts = 0
+        process = None
+
+        try:
+            while not self._stop_event.is_set():
+                process = subprocess.Popen(
+                    self._ffmpeg_pipe_command(stream_url), stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+                )
+                self._ffmpeg_process = process
+                # Keep the end of stderr for diagnosing the exit, without letting the pipe fill
+                stderr_tail = deque(maxlen=20)
+                stderr_thread = threading.Thread(
+                    target=lambda: stderr_tail.extend(line.decode('utf-8', 'replace') for line in process.stderr),
+                    daemon=True,
+                )
+                stderr_thread.start()
+
+                received = 0
+                while not self._stop_event.is_set():
+                    data = process.stdout.read1(65536)
+                    if not data:
+                        break
+                    ring.write(data)
+                    received += len(data)
+                if self._stop_event.is_set():
+                    break
+
+                process.wait()
+                stderr_thread.join(timeout=1)
+                stderr = ''.join(stderr_tail)
+                stderr_lower = stderr.lower()
+                if received >= BYTES_PER_SECOND:
+                    consecutive_failures = 0
+                else:
+                    consecutive_failures += 1
+
+                # Check if stream ended or URL expired
+                if '403' in stderr or 'forbidden' in stderr_lower:
+                    if not self._is_stream_live(video_id):
+                        logging.info("Stream has ended")
+                        break
+                    logging.info("Stream URL expired, refreshing...")
+                    new_url = self._get_stream_url(video_id)
+                    if new_url:
+                        stream_url = new_url
+                        logging.info("Got new stream URL")
+                        consecutive_failures = 0
+                        restarts += 1
+                        continue
+                elif not self._is_stream_live(video_id):
+                    logging.info("Stream has ended")
+                    break
 
-        model_name = self.model_map.get(self.model_size, 'mlx-community/whisper-base')
+                if consecutive_failures >= max_failures:
+                    logging.error(f"Too many consecutive failures ({max_failures}), stopping")
+                    break
+                logging.info(f"ffmpeg exited (code {process.returncode}), reconnecting...")
+                restarts += 1
+                time.sleep(1)
 
+        except Exception as e:
+            logging.error(f"Error capturing audio: {e}")
+        finally:
+            if process is not None and process.poll() is None:
+                process.terminate()
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+            ring.close()
+            logging.info(f"Audio pipe: {ring.seconds_written:.0f}s captured, {restarts} reconnects, "
+                         f"{ring.dropped_bytes / BYTES_PER_SECOND:.1f}s dropped while transcription was behind")
+
+    def _stream_audio_pipe(
+        self,
+        video_id: str,
+        temp_dir: str,
+        audio_queue: queue.Queue,
+    ) -> None:
+        """
+        Stream audio from YouTube through one long-running ffmpeg process and
+        cut it into chunk_duration chunks in memory, so there are no gaps
+        between chunks (with chunk_overlap, consecutive chunks overlap).
+        Puts (float32 array or chunk file, start time, time captured, offset
+        into the stream) items on audio_queue, like _stream_audio_chunks().
+        Runs in a separate thread.
+        """
+        stream_url = self._get_stream_url(video_id)
+
+        if not stream_url:
+            audio_queue.put(None)
+            return
+
+        logging.info("Starting audio capture...")
+        ring = PcmRingBuffer(self.RING_SECONDS)
+        reader_thread = threading.Thread(
+            target=self._run_ffmpeg_pipe,
+            args=(video_id, stream_url, ring),
+            daemon=True,
+        )
+        reader_thread.start()
+
+        chunk_index = 0
+        chunk_bytes = int(self.chunk_duration * SAMPLE_RATE) * SAMPLE_WIDTH
+        step_bytes = int((self.chunk_duration - self.chunk_overlap) * SAMPLE_RATE) * SAMPLE_WIDTH
+        try:
+            while not self._stop_event.is_set():
+                chunk = ring.read(chunk_bytes, advance=step_bytes)
+                if chunk is None:
+                    if ring.closed:
+                        break
+                    continue
+                pcm, chunk_start, chunk_offset = chunk
+                if len(pcm) < self.MIN_CHUNK_SECONDS * BYTES_PER_SECOND:
+                    continue
+
+                if self.in_memory:
+                    audio = self._pcm_to_float32(pcm)
+                else:
+                    audio = os.path.join(temp_dir, f"chunk_{chunk_index:05d}.wav")
+                    with wave.open(audio, 'wb') as wav:
+                        wav.setnchannels(1)
+                        wav.setsampwidth(SAMPLE_WIDTH)
+                        wav.setframerate(SAMPLE_RATE)
+                        wav.writeframes(pcm)
+                audio_queue.put((audio, datetime.fromtimestamp(chunk_start, self.eastern), time.time(), chunk_offset))
+                chunk_index += 1
+                # Periodically verify the stream is still live
+                if chunk_index % 10 == 0 and not self._is_stream_live(video_id):
+                    logging.info("Stream is no longer live, stopping")
+                    break
+        except Exception as e:
+            logging.error(f"Error capturing audio: {e}")
+        finally:
+            self._stop_event.set()
+            process = self._ffmpeg_process
+            if process is not None and process.poll() is None:
+                process.terminate()  # Unblocks the reader thread
+            reader_thread.join(timeout=5)
+
+        # Signal end of stream
+        audio_queue.put(None)
+
+    @staticmethod
+    def _pcm_to_float32(pcm: bytes):
+        """s16le PCM as the float32 array in [-1, 1) Whisper's own load_audio() would produce from a file."""
+        import numpy as np
+
+        audio = np.frombuffer(pcm, dtype='<i2').astype(np.float32)
+        audio *= 1 / 32768.0
+        return audio
+
+    def _transcribe_chunk(self, audio_file: Union[str, 'numpy.ndarray']) -> Optional[list]:
+        """Transcribe an audio chunk (a WAV path or 16 kHz float32 samples) and return segments; None if it failed."""
         try:
-            result: dict = mlx_whisper.transcribe(
-                audio_file,
-                path_or_hf_repo=model_name,
-                language=self.language,
-                condition_on_previous_text=False,
-            )
             return [
-                seg for seg in result.get('segments', [])
+                seg for seg in self.backend.transcribe(audio_file, self.language)
                 if seg.get('no_speech_prob', 0) < 0.6
                 and seg.get('compression_ratio', 0) < 2.4
                 and not re.search(r'\b(\w+)\b(?:\s+\1){3,}', seg.get('text', ''), re.IGNORECASE)
             ]
         except Exception as e:
             logging.error(f"Transcription error: {e}")
-            return []
+            return None
+
+    def _transcribe_if_speech(self, audio: Union[str, 'numpy.ndarray']) -> Optional[list]:
+        """
+        _transcribe_chunk(), or None, like a failed transcription, if the
+        speech detector finds no speech. Updates vad_stats.
+        """
+        stats = self.vad_stats
+        stats['chunks'] += 1
+        if not self.speech_detector:
+            return self._transcribe_chunk(audio)
+
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        samples = SpeechDetector.samples(audio)
+        seconds = len(samples) / SAMPLE_RATE
+        is_speech = self.speech_detector.is_speech(samples)
+        stats['vad_cpu'] += time.process_time() - cpu_start
+        stats['vad_wall'] += time.perf_counter() - wall_start
+        stats['audio_seconds'] += seconds
+        # With chunk_overlap, each chunk only moves the stream on by one step
+        stats['stream_seconds'] += min(seconds, self.chunk_duration - self.chunk_overlap)
+        if not is_speech:
+            stats['skipped'] += 1
+            stats['skipped_seconds'] += seconds
+            return None
+
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        segments = self._transcribe_chunk(audio)
+        stats['transcribe_cpu'] += time.process_time() - cpu_start
+        stats['transcribe_wall'] += time.perf_counter() - wall_start
+        stats['transcribed_seconds'] += seconds
+        return segments
+
+    def vad_savings(self) -> dict:
+        """
+        Transcription time the speech detector saved per hour of stream,
+        estimating each skipped second of audio at the average cost of a
+        transcribed one, net of the detector's own time. Empty until a
+        chunk has been both skipped and transcribed.
+        """
+        stats = self.vad_stats
+        hours = stats['stream_seconds'] / 3600
+        per_second = stats['transcribed_seconds']
+        if not stats['skipped_seconds'] or not per_second:
+            return {}
+        return {
+            'skipped_fraction': stats['skipped_seconds'] / stats['audio_seconds'],
+            'cpu_saved_per_hour': (stats['skipped_seconds'] * stats['transcribe_cpu'] / per_second
+                                   - stats['vad_cpu']) / hours,
+            'wall_saved_per_hour': (stats['skipped_seconds'] * stats['transcribe_wall'] / per_second
+                                    - stats['vad_wall']) / hours,
+            'vad_cpu_per_hour': stats['vad_cpu'] / hours,
+        }
+
+    def _log_vad_savings(self) -> None:
+        stats = self.vad_stats
+        message = f"Voice activity: skipped {stats['skipped']} of {stats['chunks']} chunks"
+        savings = self.vad_savings()
+        if not savings:
+            logging.info(message)
+            return
+        logging.info(
+            f"{message} ({savings['skipped_fraction']:.0%} of the audio); saved ~{savings['cpu_saved_per_hour'] / 60:.1f} min "
+            f"of CPU time ({savings['wall_saved_per_hour'] / 60:.1f} min of transcription) per hour of stream, "
+            f"after {savings['vad_cpu_per_hour']:.1f}s/hour for the detector itself"
+        )
+
+    @staticmethod
+    def _write_segments(writer, pairs: List[Tuple[datetime, dict]]) -> bool:
+        """Print and write (chunk start time, segment) pairs; True if any had text."""
+        wrote_speech = False
+        for chunk_start_time, segment in pairs:
+            # Calculate actual timestamp
+            seg_start = segment.get('start', 0)
+            seg_end = segment.get('end', 0)
+            segment_time = chunk_start_time + timedelta(seconds=seg_start)
+            timestamp_str = segment_time.strftime('%Y-%m-%d %H:%M:%S %Z')
+
+            text = segment.get('text', '').strip()
+            if text:
+                print(f"{timestamp_str}: {text}")
+                writer.writerow([
+                    timestamp_str,
+                    f"{seg_start:.2f}",
+                    f"{seg_end:.2f}",
+                    text,
+                ])
+                wrote_speech = True
+        return wrote_speech
+
+    def load_model(self) -> None:
+        """Load the Whisper model once; it stays resident for every chunk and later captures."""
+        if self._loaded_model == self.model_size:
+            return
+        logging.info(f"Loading Whisper model with {self.backend.name} (this may take a moment on first run)...")
+        start = time.time()
+        self.backend.load(self.model_size)
+        self._loaded_model = self.model_size
+        logging.info(f"Model {self.backend.model_name(self.model_size)} loaded in {time.time() - start:.1f}s")
 
     def fetch_live_captions(self, video_id: str, flush_interval: int = 60) -> None:
         """
@@ -285,31 +938,35 @@ class LiveCaptionFetcher:
             flush_interval: How often to flush CSV to disk (seconds)
         """
         self._stop_event.clear()
+        self.latencies = []
+        self.vad_stats = dict.fromkeys(
+            ('chunks', 'skipped', 'audio_seconds', 'stream_seconds', 'skipped_seconds', 'transcribed_seconds',
+             'transcribe_cpu', 'transcribe_wall', 'vad_cpu', 'vad_wall'), 0
+        )
 
         timestamp = datetime.now(self.eastern).strftime("%Y%m%d_%H%M%S")
         filename = f"captions_{video_id}_{timestamp}.csv"
 
         logging.info(f"Starting caption capture for video: {video_id}")
         logging.info(f"Output file: {filename}")
-        logging.info(f"Model: {self.model_size}, Language: {self.language}")
-        logging.info(f"Chunk duration: {self.chunk_duration}s")
+        logging.info(f"Model: {self.model_size} ({self.backend.name}), Language: {self.language}")
+        logging.info(f"Chunk duration: {self.chunk_duration}s, overlap: {self.chunk_overlap:g}s, "
+                     f"capture mode: {self.capture_mode}")
         logging.info("Press Ctrl+C to stop\n")
 
-        # Pre-load model by doing a test transcription
-        logging.info("Loading Whisper model (this may take a moment on first run)...")
-        import mlx_whisper
-        model_name = self.model_map.get(self.model_size, 'mlx-community/whisper-base-mlx')
+        self.load_model()
 
         audio_queue = queue.Queue(maxsize=5)
         last_flush_time = time.time()
         last_output_time = datetime.now(self.eastern)
         silence_marker_interval = 300  # seconds (5 minutes)
         termination_reason = None
+        stitcher = SegmentStitcher(self.chunk_overlap) if self.chunk_overlap else None
 
         with tempfile.TemporaryDirectory() as temp_dir:
             # Start audio streaming thread
             audio_thread = threading.Thread(
-                target=self._stream_audio_chunks,
+                target=self._stream_audio_pipe if self.capture_mode == 'pipe' else self._stream_audio_chunks,
                 args=(video_id, temp_dir, audio_queue),
                 daemon=True,
             )
@@ -334,32 +991,22 @@ class LiveCaptionFetcher:
                             termination_reason = "Stream ended"
                             break
 
-                        chunk_file, chunk_start_time = item
-
-                        # Transcribe the chunk
-                        segments = self._transcribe_chunk(chunk_file)
-
-                        wrote_speech = False
-                        for segment in segments:
-                            # Calculate actual timestamp
-                            seg_start = segment.get('start', 0)
-                            seg_end = segment.get('end', 0)
-                            segment_time = chunk_start_time + timedelta(seconds=seg_start)
-                            timestamp_str = segment_time.strftime('%Y-%m-%d %H:%M:%S %Z')
-
-                            text = segment.get('text', '').strip()
-                            if text:
-                                print(f"{timestamp_str}: {text}")
-                                writer.writerow([
-                                    timestamp_str,
-                                    f"{seg_start:.2f}",
-                                    f"{seg_end:.2f}",
-                                    text,
-                                ])
-                                last_output_time = datetime.now(self.eastern)
-                                wrote_speech = True
-
-                        if not wrote_speech:
+                        chunk_audio, chunk_start_time, chunk_captured, chunk_offset = item
+
+                        # Transcribe the chunk, unless there's no speech in it
+                        segments = self._transcribe_if_speech(chunk_audio)
+                        if stitcher and segments is None:
+                            # Skipped or failed: the chunk covers nothing, so the held segments are final
+                            pairs = stitcher.flush()
+                        elif stitcher:
+                            pairs = stitcher.add(chunk_offset, chunk_start_time, self.chunk_duration, segments)
+                        else:
+                            pairs = [(chunk_start_time, segment) for segment in segments or []]
+
+                        wrote_speech = self._write_segments(writer, pairs)
+                        if wrote_speech:
+                            last_output_time = datetime.now(self.eastern)
+                        else:
                             now = datetime.now(self.eastern)
                             silence_secs = (now - last_output_time).total_seconds()
                             if silence_secs >= silence_marker_interval:
@@ -368,11 +1015,14 @@ class LiveCaptionFetcher:
                                 writer.writerow([timestamp_str, '', '', '[silence]'])
                                 last_output_time = now
 
+                        self.latencies.append(time.time() - chunk_captured)
+
                         # Clean up chunk file
-                        try:
-                            os.remove(chunk_file)
-                        except OSError:
-                            pass
+                        if isinstance(chunk_audio, str):
+                            try:
+                                os.remove(chunk_audio)
+                            except OSError:
+                                pass
 
                         # Periodic flush
                         current_time = time.time()
@@ -389,10 +1039,21 @@ class LiveCaptionFetcher:
                 finally:
                     self._stop_event.set()
 
+                    if stitcher:
+                        self._write_segments(writer, stitcher.flush())
                     if termination_reason:
                         writer.writerow(['Termination Reason:', termination_reason, '', ''])
                     f.flush()
 
+                    if self.speech_detector and self.vad_stats['chunks']:
+                        self._log_vad_savings()
+                    if self.latencies:
+                        latencies = sorted(self.latencies)
+                        logging.info(
+                            f"Capture to CSV latency over {len(latencies)} chunks: "
+                            f"median {latencies[len(latencies) // 2]:.2f}s, "
+                            f"p95 {latencies[int(len(latencies) * 0.95)]:.2f}s, max {latencies[-1]:.2f}s"
+                        )
                     logging.info(f"\nCaption log saved to {filename}")
 
         # Wait for audio thread to finish
@@ -412,9 +1073,10 @@ def print_dependency_instructions(status: dict) -> None:
         print("    Ubuntu:  sudo apt install ffmpeg")
         print("    Windows: https://ffmpeg.org/download.html")
 
-    if not status['mlx-whisper']:
-        print("\n  mlx-whisper: pip install mlx-whisper")
-        print("    (Optimized for Apple Silicon Macs)")
+    if not status['whisper']:
+        print("\n  Whisper (one of):")
+        print("    mlx-whisper:    pip install mlx-whisper    (Apple Silicon Macs, GPU)")
+        print("    faster-whisper: pip install faster-whisper (Linux/Windows/Intel, CPU)")
 
     print()
 
@@ -430,7 +1092,9 @@ def main():
         sys.exit(1)
 
     # Model selection
-    print("Whisper model sizes (runs on Apple Silicon GPU):")
+    backend = make_backend()
+    where = "Apple Silicon GPU" if backend.name == MlxWhisperBackend.name else "CPU, int8"
+    print(f"Whisper model sizes (runs on {where} with {backend.name}):")
     print("  tiny   - Fastest, least accurate")
     print("  base   - Good balance [default]")
     print("  small  - Better accuracy")
@@ -446,13 +1110,15 @@ def main():
     # Chunk duration
     chunk_input = input("Enter chunk duration in seconds [10]: ").strip()
     chunk_duration = int(chunk_input) if chunk_input else 10
+    overlap_input = input("Enter chunk overlap in seconds (e.g. 3 with 10s chunks) [0]: ").strip()
+    chunk_overlap = float(overlap_input) if overlap_input else 0
 
     # Video URL/ID
     url_input = input("Enter YouTube URL or video ID: ").strip()
     video_id = extract_video_id(url_input)
 
     print(f"\nExtracted video ID: {video_id}")
-    print(f"Model: {model_size}, Language: {language}, Chunk: {chunk_duration}s")
+    print(f"Model: {model_size}, Language: {language}, Chunk: {chunk_duration}s, Overlap: {chunk_overlap:g}s")
     print()
 
     # Create fetcher and start
@@ -460,6 +1126,8 @@ def main():
         model_size=model_size,
         language=language,
         chunk_duration=chunk_duration,
+        backend=backend,
+        chunk_overlap=chunk_overlap,
     )
 
     fetcher.fetch_live_captions(video_id)
@@ -0,0 +1,169 @@
+# chat_dedup.py
+#   - Persistent index of the live chat message IDs a capture has written, so
+#     that overlapping pages and restarted captures don't write a message twice,
+#     and a restart for the same video continues the same chat log.
+#   - Exact set of the most recent IDs (what overlapping polls and the first
+#     page after a restart repeat), backed by a rolling Bloom filter for older
+#     ones: two generations, the older dropped when the newer fills. Memory is
+#     bounded (~4 MB plus the recent set) however long the stream runs.
+#   - Saved as .chat_seen_VIDEO_ID.idx next to the chat log: one JSON header
+#     line (settings, counts, recent IDs, log paths) then the two bit arrays.
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import deque
+from typing import List, Optional
+
+
+def seen_index_path(video_id: str) -> str:
+    return f".chat_seen_{video_id}.idx"
+
+
+def bit_positions(key: str) -> List[int]:
+    """BloomFilter.HASHES bit positions for key: consecutive BloomFilter.SIZE_BITS-bit slices of one blake2b digest."""
+    bits = BloomFilter.SIZE_BITS
+    value = int.from_bytes(
+        hashlib.blake2b(key.encode('utf-8'), digest_size=(bits * BloomFilter.HASHES + 7) // 8).digest(), 'little'
+    )
+    mask = (1 << bits) - 1
+    return [(value >> shift) & mask for shift in range(0, bits * BloomFilter.HASHES, bits)]
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over bit positions from bit_positions().
+    2**24 bits (2 MB) with 6 probes holds GENERATION_CAPACITY (250k) IDs at
+    a false-positive rate of ~4e-7.
+    """
+
+    __slots__ = ('bits', 'count')
+
+    SIZE_BITS = 24
+    HASHES = 6
+
+    def __init__(self, bits: Optional[bytearray] = None, count: int = 0) -> None:
+        self.bits = bits if bits is not None else bytearray(1 << (self.SIZE_BITS - 3))
+        self.count = count
+
+    def contains(self, positions: List[int]) -> bool:
+        bits = self.bits
+        for p in positions:
+            if not bits[p >> 3] & (1 << (p & 7)):
+                return False
+        return True
+
+    def add(self, positions: List[int]) -> None:
+        bits = self.bits
+        for p in positions:
+            bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+
+class SeenIndex:
+    """
+    Message IDs already written for one video. add() records an ID and
+    returns False if it was seen before; `in` checks without recording. An ID older than the recent set is
+    matched by the Bloom filter, so a brand-new message is wrongly taken as
+    seen with probability ~FALSE_POSITIVE_RATE. Thread-safe.
+    """
+
+    VERSION = 1
+    RECENT_SIZE = 20000
+    GENERATION_CAPACITY = 250000
+    # (1 - e^(-k*n/m))^k for a full generation; see BloomFilter
+    FALSE_POSITIVE_RATE = 4e-7
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.csv_path: Optional[str] = None
+        self.journal_path: Optional[str] = None
+        self.total = 0
+        self._lock = threading.Lock()
+        self._recent = deque()
+        self._recent_set = set()
+        self._current = BloomFilter()
+        self._previous = BloomFilter()
+        if os.path.exists(path):
+            try:
+                self._load()
+            except (OSError, ValueError, KeyError) as e:
+                logging.warning(f"Ignoring unreadable message index {path}: {e}")
+                self.clear()
+
+    def __len__(self) -> int:
+        return self.total
+
+    def _load(self) -> None:
+        with open(self.path, 'rb') as f:
+            header = json.loads(f.readline())
+            if header['version'] != self.VERSION:
+                raise ValueError(f"unsupported version {header['version']}")
+            if (header['filter_log2_bits'], header['filter_hashes']) != (BloomFilter.SIZE_BITS, BloomFilter.HASHES):
+                raise ValueError("different filter size")
+            length = 1 << (BloomFilter.SIZE_BITS - 3)
+            current, previous = bytearray(f.read(length)), bytearray(f.read(length))
+            if len(current) != length or len(previous) != length:
+                raise ValueError("truncated filter")
+        self._current = BloomFilter(current, header['counts'][0])
+        self._previous = BloomFilter(previous, header['counts'][1])
+        self._recent = deque(header['recent'])
+        self._recent_set = set(self._recent)
+        self.total = header['total']
+        self.csv_path = header.get('csv_path')
+        self.journal_path = header.get('journal_path')
+
+    def clear(self) -> None:
+        with self._lock:
+            self._recent.clear()
+            self._recent_set.clear()
+            self._current = BloomFilter()
+            self._previous = BloomFilter()
+            self.total = 0
+
+    def __contains__(self, message_id: str) -> bool:
+        positions = bit_positions(message_id)
+        with self._lock:
+            return (message_id in self._recent_set or self._current.contains(positions)
+                    or self._previous.contains(positions))
+
+    def add(self, message_id: str) -> bool:
+        """Record message_id; True if it is new, False if it was seen before."""
+        positions = bit_positions(message_id)
+        with self._lock:
+            if message_id in self._recent_set:
+                return False
+            if self._current.contains(positions) or self._previous.contains(positions):
+                return False
+            self._recent.append(message_id)
+            self._recent_set.add(message_id)
+            if len(self._recent) > self.RECENT_SIZE:
+                self._recent_set.discard(self._recent.popleft())
+            if self._current.count >= self.GENERATION_CAPACITY:
+                self._previous = self._current
+                self._current = BloomFilter()
+            self._current.add(positions)
+            self.total += 1
+            return True
+
+    def save(self) -> None:
+        """Write the index atomically (temp file + rename)."""
+        with self._lock:
+            header = {
+                'version': self.VERSION,
+                'total': self.total,
+                'filter_log2_bits': BloomFilter.SIZE_BITS,
+                'filter_hashes': BloomFilter.HASHES,
+                'counts': [self._current.count, self._previous.count],
+                'csv_path': self.csv_path,
+                'journal_path': self.journal_path,
+                'recent': list(self._recent),
+            }
+            data = [json.dumps(header, separators=(',', ':')).encode('utf-8'), b'\n',
+                    bytes(self._current.bits), bytes(self._previous.bits)]
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.writelines(data)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,162 @@
+# chat_journal.py
+#   - Write-ahead journal of the raw liveChatMessages.list responses a live
+#     chat capture receives, so no chat is lost if the process dies between
+#     CSV flushes, and the full API payloads are kept.
+#   - Format: gzip-compressed NDJSON. Each record is one JSON line compressed
+#     as its own gzip member and appended to the file in a single write, so
+#     the file is a valid multi-member gzip stream (zcat works) up to the last
+#     complete record. A crash can only lose the record being written.
+#   - Records: {"type": "response", "received": epoch seconds, "video_id",
+#     "live_chat_id", "response": raw API response}, and a final
+#     {"type": "end", "reason": termination reason or null}.
+#   - A resumed capture (see chat_dedup.py) appends to the same journal, so a
+#     journal can hold several runs, each ending in an end record.
+#   - Replay rebuilds the chat log CSV from a journal without any API calls:
+#     python chat_journal.py chat_journal_VIDEO_ID_TIMESTAMP.ndjson.gz [-o CSV]
+
+import argparse
+import csv
+import gzip
+import json
+import logging
+import os
+import time
+import zlib
+from typing import Any, Dict, Iterator, Optional
+
+JOURNAL_SUFFIX = '.ndjson.gz'
+
+
+class ResponseJournal:
+    """Append-only journal file; see the module comment for the format."""
+
+    def __init__(self, path: str, fsync: bool = False, compresslevel: int = 6) -> None:
+        self.path = path
+        self.fsync = fsync  # Also survive power loss, at the cost of a disk sync per response
+        self.compresslevel = compresslevel
+        self.records = 0
+        self.bytes_written = 0
+        self._fd: Optional[int] = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+        compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, 31)  # 31: gzip container
+        data = memoryview(compressor.compress(line) + compressor.flush())
+        while data:
+            written = os.write(self._fd, data)
+            data = data[written:]
+            self.bytes_written += written
+        if self.fsync:
+            os.fsync(self._fd)
+        self.records += 1
+
+    def record_response(self, video_id: str, live_chat_id: str, response: Dict[str, Any]) -> None:
+        self._append({
+            'type': 'response',
+            'received': time.time(),
+            'video_id': video_id,
+            'live_chat_id': live_chat_id,
+            'response': response,
+        })
+
+    def record_end(self, reason: Optional[str]) -> None:
+        self._append({'type': 'end', 'reason': reason})
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def journal_path_for(video_id: str, timestamp: str) -> str:
+    """Journal filename matching chat_log_{video_id}_{timestamp}.csv."""
+    return f"chat_journal_{video_id}_{timestamp}{JOURNAL_SUFFIX}"
+
+
+def read_journal(path: str) -> Iterator[Dict[str, Any]]:
+    """Records in order. A truncated or corrupt tail (from a crash) ends the iteration with a warning."""
+    with gzip.open(path, 'rb') as f:
+        try:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    logging.warning(f"{path}: skipping an unreadable record")
+        except (EOFError, zlib.error, gzip.BadGzipFile) as e:
+            logging.warning(f"{path}: journal ends in an incomplete record ({e}); earlier records were read")
+
+
+def replay_to_csv(journal_path: str, csv_path: str) -> Dict[str, Any]:
+    """
+    Write the chat log CSV fetch_live_chat() would have written for the
+    responses in a journal: messages already written are skipped by ID, and
+    each run's termination reason follows its messages. Returns counts and
+    the last termination reason.
+    """
+    # The live capture's row formatter; needs no API key or client
+    from livechat import format_chat_item
+
+    stats = {'responses': 0, 'messages': 0, 'duplicates': 0, 'errors': 0, 'runs': 0,
+             'termination_reason': None, 'complete': False}
+    seen = set()
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Timestamp (ET)', 'Author', 'Message', 'Message Type', 'SuperChat Amount'])
+        for record in read_journal(journal_path):
+            if record.get('type') == 'response':
+                stats['responses'] += 1
+                stats['complete'] = False
+                for item in record['response'].get('items', []):
+                    message_id = item.get('id')
+                    if message_id:
+                        if message_id in seen:
+                            stats['duplicates'] += 1
+                            continue
+                        seen.add(message_id)
+                    try:
+                        chat_message = format_chat_item(item)
+                    except Exception as e:  # Skipped by the live capture too (counted in format_errors)
+                        logging.error(f"Error processing message: {e!r}")
+                        stats['errors'] += 1
+                        continue
+                    writer.writerow(chat_message)
+                    stats['messages'] += 1
+            elif record.get('type') == 'end':
+                stats['runs'] += 1
+                stats['complete'] = True
+                stats['termination_reason'] = record.get('reason')
+                if stats['termination_reason']:
+                    writer.writerow(['Termination Reason:', stats['termination_reason']])
+    if not stats['complete']:
+        logging.warning(f"{journal_path}: no end record; the capture was cut off")
+    return stats
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    arg_parser = argparse.ArgumentParser(description='Rebuild a live chat CSV from a raw response journal')
+    arg_parser.add_argument('journal', help=f'chat_journal_*{JOURNAL_SUFFIX} file')
+    arg_parser.add_argument('-o', '--output', help='CSV path (default: chat_log_* next to the journal)')
+    args = arg_parser.parse_args()
+
+    output = args.output
+    if not output:
+        directory, name = os.path.split(args.journal)
+        name = name.removesuffix(JOURNAL_SUFFIX)
+        name = 'chat_log_' + name.removeprefix('chat_journal_') if name.startswith('chat_journal_') else name
+        output = os.path.join(directory, name + '.replay.csv')
+
+    stats = replay_to_csv(args.journal, output)
+    print(f"Wrote {stats['messages']:,} messages from {stats['responses']:,} responses to {output}")
+    if stats['termination_reason']:
+        print(f"Termination reason: {stats['termination_reason']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -19,8 +19,8 @@
 import sys
 from yt_dlp import YoutubeDL
 import csv
-from datetime import datetime
-import pytz
+
+import timefmt
 
 class ProgressLogger:
     def __init__(self):
@@ -42,9 +42,8 @@ class ProgressLogger:
                 self.last_percentage = (percentage // 10) * 10
 
 def convert_to_eastern(timestamp):
-    """Convert UTC timestamp to Eastern Time"""
-    utc_time = datetime.fromtimestamp(timestamp, tz=pytz.utc)
-    return utc_time.astimezone(pytz.timezone('US/Eastern'))
+    """Convert UTC timestamp to an Eastern Time 'YYYY-MM-DD HH:MM:SS' string"""
+    return timefmt.formatter('US/Eastern').format_epoch(timestamp)
 
 def download_comments(url: str) -> str:
     """Download comments from a YouTube video and save them to a CSV file"""
@@ -93,7 +92,7 @@ def download_comments(url: str) -> str:
                             comment.get('author', ''),
                             comment.get('text', ''),
                             timestamp,
-                            eastern_time.strftime('%Y-%m-%d %H:%M:%S'),
+                            eastern_time,
                             comment.get('like_count', 0)
                         ])
                         
@@ -5,15 +5,15 @@
 # `python comments.py "https://www.youtube.com/watch?v=VIDEO_ID"`
 # Alt version: youtube_downloader6.py
 
-import json
 import csv
 import re
 from typing import List, Dict, Any
 from datetime import datetime
-import pytz
 import logging
 from yt_dlp import YoutubeDL
 from extract_functions import extract_text_and_emoji, extract_timestamp
+import json_codec
+import timefmt
 
 class YouTubeDownloader:
     def __init__(self):
@@ -46,9 +46,9 @@ class YouTubeDownloader:
             self.filenames.append(d['filename'])
 
 class YouTubeProcessor:
-    def __init__(self, cookies_file: str = None):
+    def __init__(self, cookies_file: str = None, chat_format: str = 'csv'):
         self.downloader = YouTubeDownloader()
-        self.chat_processor = ChatProcessor()
+        self.chat_processor = ChatProcessor(chat_format)
         self.transcript_processor = TranscriptProcessor()
 
     def process_video(self, url: str):
@@ -63,22 +63,30 @@ class YouTubeProcessor:
                 print(f"Live chat saved as: {output_filename}")
 
 class ChatProcessor:
+    # 'parquet' writes typed columns (Timestamp as a real timestamp) and needs pyarrow
+    def __init__(self, output_format: str = 'csv'):
+        self.output_format = output_format
+
     def process_chat(self, filename: str) -> str:
         json_data = self._load_json_data(filename)
         extracted_data = self._extract_data_from_json(json_data)
-        output_filename = filename + "_extracted.csv"
-        self._save_to_csv(extracted_data, output_filename)
+        if self.output_format == 'parquet':
+            output_filename = filename + "_extracted.parquet"
+            self._save_to_parquet(extracted_data, output_filename)
+        else:
+            output_filename = filename + "_extracted.csv"
+            self._save_to_csv(extracted_data, output_filename)
         return output_filename
 
     def _load_json_data(self, filename: str) -> List[Dict[str, Any]]:
         try:
-            with open(filename, "r") as f:
-                return [json.loads(line.strip()) for line in f]
-        except (json.JSONDecodeError, FileNotFoundError) as e:
+            with open(filename, "rb") as f:
+                return [json_codec.loads(line) for line in f if line.strip()]
+        except (json_codec.DecodeError, FileNotFoundError) as e:
             logging.error(f"Error processing file {filename}: {e}")
             return []
 
-    def _extract_data_from_json(self, json_data: List[Dict[str, Any]]) -> List[List[str]]:
+    def _extract_data_from_json(self, json_data: List[Dict[str, Any]]) -> List[list]:
         extracted_data = []
         for data in json_data:
             actions = data.get('replayChatItemAction', {}).get('actions', [])
@@ -90,21 +98,37 @@ class ChatProcessor:
                     extracted_data.append([message, authorname, timestamp])
         return extracted_data
 
-    def _extract_chat_info(self, chat_renderer: Dict[str, Any]) -> tuple[str, str, str]:
+    def _extract_chat_info(self, chat_renderer: Dict[str, Any]) -> tuple[str, str, datetime]:
         authorname = chat_renderer.get('authorName', {}).get('simpleText', '')
         message = extract_text_and_emoji(chat_renderer)
         if 'purchaseAmountText' in chat_renderer:
             purchase_amount = chat_renderer['purchaseAmountText']['simpleText']
             message = f"[Superchat {purchase_amount}] " + message
         timestamp = extract_timestamp(chat_renderer)
-        eastern_time = convert_to_eastern(timestamp).strftime('%Y-%m-%d %H:%M:%S')
-        return message, authorname, eastern_time
+        return message, authorname, convert_to_eastern(timestamp)
 
-    def _save_to_csv(self, data: List[List[str]], output_filename: str):
+    def _save_to_csv(self, data: List[list], output_filename: str):
         with open(output_filename, 'w', newline='', encoding='utf-8') as csvfile:
             csv_writer = csv.writer(csvfile)
             csv_writer.writerow(['Message', 'Author', 'Timestamp'])
-            csv_writer.writerows(data)
+            csv_writer.writerows(
+                [message, author, timestamp.strftime('%Y-%m-%d %H:%M:%S')]
+                for message, author, timestamp in data
+            )
+
+    def _save_to_parquet(self, data: List[list], output_filename: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow: pip install pyarrow") from None
+        messages, authors, timestamps = (list(column) for column in zip(*data)) if data else ([], [], [])
+        table = pa.table({
+            'Message': pa.array(messages, type=pa.string()),
+            'Author': pa.array(authors, type=pa.string()),
+            'Timestamp': pa.array(timestamps, type=pa.timestamp('us', tz='US/Eastern')),
+        })
+        pq.write_table(table, output_filename, compression='zstd')
 
 class TranscriptProcessor:
     def clean_transcript(self, vtt_filepath: str) -> str:
@@ -137,13 +161,14 @@ class TranscriptProcessor:
                 if line.strip() and line not in lines_seen and not lines_seen.add(line)]
 
 def convert_to_eastern(timestamp: float) -> datetime:
-    utc_time = datetime.fromtimestamp(timestamp, tz=pytz.utc)
-    return utc_time.astimezone(pytz.timezone('US/Eastern'))
+    return timefmt.formatter('US/Eastern').to_datetime(timestamp)
 
 def main():
-    processor = YouTubeProcessor()
     url = input("Enter the full YouTube URL: ")
     download_livechat_only = input("Do you want to download live chat only? (y = yes): ").strip().lower()
+    save_parquet = input("Save live chat as Parquet instead of CSV? (y = yes): ").strip().lower()
+    chat_format = 'parquet' if save_parquet == 'y' else 'csv'
+    processor = YouTubeProcessor(chat_format=chat_format)
 
     if download_livechat_only == 'y':
         downloader = YouTubeDownloader()
@@ -151,7 +176,7 @@ def main():
 
         for file in filenames:
             if file.endswith(".live_chat.json"):
-                chat_processor = ChatProcessor()
+                chat_processor = ChatProcessor(chat_format)
                 output_filename = chat_processor.process_chat(file)
                 print(f"Live chat saved as: {output_filename}")
     else:
@@ -0,0 +1,62 @@
+# Pluggable JSON decoding for the chat parsers.
+# Uses the fastest backend that is installed: orjson, then pysimdjson, then the
+# standard library. Set CHAT_JSON_BACKEND=orjson|simdjson|json to force one.
+
+import json
+import os
+
+BACKENDS = ('orjson', 'simdjson', 'json')
+
+# Every backend raises a ValueError subclass on malformed input (json and
+# orjson raise JSONDecodeError, simdjson raises ValueError, and undecodable
+# bytes raise UnicodeDecodeError), so callers catch this one type.
+DecodeError = ValueError
+
+BACKEND = 'json'
+loads = json.loads
+
+
+def _backend_loads(name):
+    """Return the loads() function for a backend, or raise ImportError."""
+    if name == 'orjson':
+        import orjson
+        return orjson.loads
+    if name == 'simdjson':
+        import simdjson
+        return simdjson.loads
+    if name == 'json':
+        return json.loads
+    raise ImportError(f"Unknown JSON backend: {name!r}")
+
+
+def available_backends():
+    """Names of the installed backends, fastest first."""
+    names = []
+    for name in BACKENDS:
+        try:
+            _backend_loads(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def use_backend(name=None):
+    """
+    Switch the module-level loads() to the named backend, or to the fastest
+    installed one if name is None. An unavailable name falls back to the
+    automatic choice. Returns the backend actually selected.
+    """
+    global BACKEND, loads
+    candidates = ((name,) if name else ()) + BACKENDS
+    for candidate in candidates:
+        try:
+            loads = _backend_loads(candidate)
+        except ImportError:
+            continue
+        BACKEND = candidate
+        break
+    return BACKEND
+
+
+use_backend(os.environ.get('CHAT_JSON_BACKEND') or None)
@@ -4,30 +4,36 @@
 #   - On first run, this script will automatically prompt you to sign in to 1Password if needed.
 
 import os
+import queue
 import sys
+import threading
 import time
 import csv
 import logging
 import json
 import re
 import subprocess
-from datetime import datetime
+from collections import namedtuple
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, Callable, Optional, Tuple
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
 from contextlib import contextmanager
-from dotenv import load_dotenv
-from googleapiclient.discovery import build
+# googleapiclient.discovery (~175 ms to import) and dotenv are imported on first use
 from googleapiclient.errors import HttpError
 import pytz
-from dateutil import parser
 
-# Load environment variables from .env file
-load_dotenv()
+import timefmt
+from chat_dedup import SeenIndex, seen_index_path
+from chat_journal import ResponseJournal, journal_path_for
 
-def ensure_1password_signin() -> bool:
+# Resolved API key, cached for the life of the process (an op:// reference runs the 1Password CLI)
+_api_key: Optional[str] = None
+_api_key_lock = threading.Lock()
+
+def ensure_1password_signin(interactive: bool = True) -> bool:
     """
     Ensure user is signed into 1Password.
-    Automatically prompts for sign-in if not authenticated.
+    Automatically prompts for sign-in if not authenticated (unless interactive is False).
     Returns True if sign-in was successful or already authenticated, False otherwise.
     """
     try:
@@ -43,6 +49,8 @@ def ensure_1password_signin() -> bool:
             return True
     except (subprocess.TimeoutExpired, FileNotFoundError):
         pass
+    if not interactive:
+        return False
     
     # Not signed in, prompt user to sign in
     logging.info("1Password authentication required. Starting sign-in process...")
@@ -71,8 +79,23 @@ def ensure_1password_signin() -> bool:
         logging.error(f"Error during 1Password sign-in: {e}")
         return False
 
-def get_youtube_api_key():
-    """Fetch the YouTube API key from 1Password or environment."""
+def get_youtube_api_key(interactive: bool = True) -> str:
+    """
+    Fetch the YouTube API key from 1Password or environment, once per process.
+    With interactive=False, raises ValueError rather than prompting for a
+    1Password sign-in.
+    """
+    global _api_key
+    with _api_key_lock:
+        if _api_key is None:
+            _api_key = _resolve_youtube_api_key(interactive)
+        return _api_key
+
+def _resolve_youtube_api_key(interactive: bool) -> str:
+    from dotenv import load_dotenv
+
+    # Load environment variables from .env file
+    load_dotenv()
     # Get the API key from environment (which may contain an op:// reference)
     api_key_ref = os.getenv("YOUTUBE_API_KEY")
     if not api_key_ref:
@@ -81,7 +104,7 @@ def get_youtube_api_key():
     # If it's a 1Password secret reference, resolve it using op CLI
     if api_key_ref.startswith("op://"):
         # Ensure user is signed into 1Password
-        if not ensure_1password_signin():
+        if not ensure_1password_signin(interactive):
             raise ValueError(
                 "Failed to authenticate with 1Password. "
                 "Please sign in manually using: op signin"
@@ -110,6 +133,25 @@ def get_youtube_api_key():
         # If it's a plain API key, return it directly
         return api_key_ref
 
+def prewarm(discovery: bool = True) -> threading.Thread:
+    """
+    Resolve the API key and import googleapiclient.discovery on a background
+    thread (e.g. while main() prompts), so the first poll doesn't wait on
+    them. If 1Password needs a sign-in, the key is left to be resolved, with
+    the prompt, on first use.
+    """
+    def warm():
+        try:
+            get_youtube_api_key(interactive=False)
+        except ValueError:
+            pass
+        if discovery:
+            import googleapiclient.discovery  # noqa: F401
+
+    thread = threading.Thread(target=warm, name='livechat-prewarm', daemon=True)
+    thread.start()
+    return thread
+
 class LiveChatEnded(Exception):
     """Custom exception to indicate that the live chat has ended."""
     pass
@@ -143,10 +185,11 @@ class QuotaManager:
             self._lock_module = None
 
     @contextmanager
-    def _locked_file(self):
-        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
-        mode = 'r+' if self.storage_path.exists() else 'w+'
-        with open(self.storage_path, mode) as file_handle:
+    def _locked_file(self, path: Optional[Path] = None):
+        path = path or self.storage_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        mode = 'r+' if path.exists() else 'w+'
+        with open(path, mode) as file_handle:
             if self._lock_module:
                 self._lock_module.flock(file_handle.fileno(), self._lock_module.LOCK_EX)
             try:
@@ -233,114 +276,854 @@ class QuotaManager:
         note = f'Start session video={video_id} expected_hours={hours:.2f}'
         self.log_consumption(0, note)
 
-class YouTubeLiveChatFetcher:
-    def __init__(self, expected_duration_hours: float = 4.0, quota_manager: Optional[QuotaManager] = None):
-        self.api_key = get_youtube_api_key()
-        self.youtube = build('youtube', 'v3', developerKey=self.api_key)
-        self.utc = pytz.UTC
-        self.eastern = pytz.timezone('US/Eastern')
+    def flush(self) -> None:
+        """Persist pending usage. Every call above already writes through, so this is a no-op."""
 
-        # Configure logging for errors and info, excluding extraneous info in the console output
-        logging.basicConfig(level=logging.INFO, format='%(message)s')
+    # Days of history kept in the history file
+    HISTORY_DAYS = 90
+    # Past sessions whose message rates are pooled when a video has none of its own
+    RATE_SESSIONS = 20
 
-        # Quota management
-        self.MAX_DAILY_QUOTA = 10000
-        self.LIVE_CHAT_MESSAGES_COST = 5
-        self.VIDEOS_LIST_COST = 1  # Cost for videos.list API call
-        self.quota_manager = quota_manager or QuotaManager(
-            max_daily_quota=self.MAX_DAILY_QUOTA,
-            timezone=self.eastern,
-        )
+    @property
+    def history_path(self) -> Path:
+        """Per-day usage history next to the quota file (.youtube_quota_history.json)."""
+        return self.storage_path.with_name(f'{self.storage_path.stem}_history.json')
 
-        # Expected live stream duration in seconds
-        self.expected_duration = expected_duration_hours * 3600  # Convert hours to seconds
+    @staticmethod
+    def _read_history_file(file_handle) -> Dict[str, Any]:
+        file_handle.seek(0)
+        raw = file_handle.read()
+        try:
+            history = json.loads(raw) if raw else {}
+        except json.JSONDecodeError:
+            history = {}
+        return history if isinstance(history, dict) else {}
 
-    def convert_to_eastern(self, timestamp: str) -> str:
-        dt = parser.parse(timestamp)
-        # Only set UTC if no timezone info present (dateutil.parser preserves tz if provided)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=self.utc)
-        eastern_time = dt.astimezone(self.eastern)
-        return eastern_time.strftime('%Y-%m-%d %H:%M:%S %Z')
-
-    def get_chat_message(self, item: Dict[str, Any]) -> Dict[str, Any]:
-        message_type = item['snippet']['type']
-        author = item['authorDetails']['displayName']
-        timestamp = self.convert_to_eastern(item['snippet']['publishedAt'])
-
-        message_handlers = {
-            'textMessageEvent': self._handle_text_message,
-            'superChatEvent': self._handle_super_chat,
-            'superStickerEvent': self._handle_super_sticker,
-            'newSponsorEvent': self._handle_new_sponsor,
-            'memberMilestoneChatEvent': self._handle_member_milestone,
-            'giftMembershipReceivedEvent': self._handle_gift_membership_received,
-            'membershipGiftingEvent': self._handle_membership_gifting,
-            'messageDeletedEvent': self._handle_message_deleted,
+    def record_session(
+        self,
+        video_id: str,
+        started: float,
+        expected_duration_seconds: float,
+        polls: int,
+        units: int,
+        messages: int,
+    ) -> None:
+        """
+        Save a capture session's actual usage in the history: polls made,
+        quota units spent and chat messages received since started (epoch
+        seconds). Called again for the same session, it replaces the earlier
+        record, so it can be called periodically and at the end. Sessions are
+        filed under the day they started; each day also keeps the most quota
+        seen used that day.
+        """
+        now = time.time()
+        start = datetime.fromtimestamp(started, self.timezone)
+        session = {
+            'video_id': video_id,
+            'started': start.isoformat(),
+            'seconds': round(max(now - started, 0.0), 1),
+            'expected_hours': round(expected_duration_seconds / 3600.0, 2),
+            'polls': polls,
+            'units': units,
+            'messages': messages,
         }
+        used = self.max_daily_quota - self.remaining_quota()
+        with self._locked_file(self.history_path) as file_handle:
+            history = self._read_history_file(file_handle)
+            day = history.setdefault(start.strftime('%Y-%m-%d'), {'used': 0, 'sessions': []})
+            day['sessions'] = [
+                s for s in day['sessions'] if (s['video_id'], s['started']) != (video_id, session['started'])
+            ] + [session]
+            today = history.setdefault(self._today_key(), {'used': 0, 'sessions': []})
+            today['used'] = max(today['used'], used)
+            for old_day in sorted(history)[:-self.HISTORY_DAYS]:
+                del history[old_day]
+            self._write_state(file_handle, history)
+
+    def history(self) -> Dict[str, Any]:
+        """Day ('YYYY-MM-DD') -> {'used': units, 'sessions': [session records]}, oldest first."""
+        if not self.history_path.exists():
+            return {}
+        with self._locked_file(self.history_path) as file_handle:
+            history = self._read_history_file(file_handle)
+        return dict(sorted(history.items()))
+
+    def message_rate(self, video_id: Optional[str] = None) -> Optional[float]:
+        """
+        Chat messages per second seen in past sessions: video_id's own
+        sessions if it has any (a restarted capture), otherwise the median
+        rate of the last RATE_SESSIONS sessions. None without history.
+        """
+        sessions = [s for day in self.history().values() for s in day['sessions'] if s.get('seconds', 0) > 0]
+        own = [s for s in sessions if s['video_id'] == video_id]
+        if own:
+            return sum(s['messages'] for s in own) / sum(s['seconds'] for s in own)
+        rates = sorted(s['messages'] / s['seconds'] for s in sessions[-self.RATE_SESSIONS:])
+        if not rates:
+            return None
+        middle = len(rates) // 2
+        return rates[middle] if len(rates) % 2 else (rates[middle - 1] + rates[middle]) / 2
 
-        handler = message_handlers.get(message_type, self._handle_other_event)
-        message, superchat_amount = handler(item)
+    def forecast(
+        self,
+        expected_duration_seconds: float,
+        call_cost: int,
+        video_id: Optional[str] = None,
+        hint_ms: Optional[int] = None,
+    ) -> 'PollingPlan':
+        """PollingPlan for a stream starting now, from the quota left and the message rate history predicts."""
+        return PollingPlan.make(
+            self.remaining_quota(),
+            expected_duration_seconds,
+            call_cost,
+            self.message_rate(video_id),
+            hint_ms,
+        )
 
-        return {
-            'timestamp': timestamp,
-            'author': author,
-            'message': message,
-            'type': message_type,
-            'superchat_amount': superchat_amount
-        }
 
-    def _handle_text_message(self, item: Dict[str, Any]) -> tuple:
-        return item['snippet'].get('displayMessage', ''), ''
+class BufferedQuotaManager(QuotaManager):
+    """
+    QuotaManager that keeps usage in memory and persists it write-behind.
+
+    log_consumption() appends one JSON line to a per-day log next to the quota
+    file (.youtube_quota.<date>.log), opened with O_APPEND so appends from
+    several processes never interleave: no lock, parse or fsync per call.
+    remaining_quota() only reads log lines added since the last call (any
+    process's), so every process sees every other's usage immediately.
+    Every flush_interval seconds, and on flush(), the log is fsynced and
+    compacted into the JSON quota file under its lock: the new lines' costs
+    are added to 'used' and 'log_offset' records how much of the log is
+    folded in. The JSON stays readable by plain QuotaManager processes,
+    which see this process's usage as of the last compaction.
+    """
 
-    def _handle_super_chat(self, item: Dict[str, Any]) -> tuple:
-        superchat_details = item['snippet'].get('superChatDetails', {})
-        return superchat_details.get('userComment', ''), superchat_details.get('amountDisplayString', '')
+    def __init__(
+        self,
+        max_daily_quota: int = 10000,
+        storage_path: Optional[Path] = None,
+        timezone: Optional[pytz.BaseTzInfo] = None,
+        flush_interval: float = 60.0,
+    ) -> None:
+        super().__init__(max_daily_quota, storage_path, timezone)
+        self.flush_interval = flush_interval
+        self._next_flush = time.monotonic() + flush_interval
+        self._day = None
+        self._day_ends = 0.0
+        self._log_fd = None
+        self._log_offset = 0
+        self._used = 0
+        self._state_stat = None
+
+    def _log_path(self, day: str) -> Path:
+        return self.storage_path.with_name(f'{self.storage_path.stem}.{day}.log')
+
+    def _state_signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.storage_path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def _read_log(self, start: int) -> Tuple[int, list]:
+        """Complete log lines from byte start on: (end offset, parsed entries)."""
+        size = os.fstat(self._log_fd).st_size
+        if size <= start:
+            return start, []
+        os.lseek(self._log_fd, start, os.SEEK_SET)  # Appends still go to the end (O_APPEND)
+        data = os.read(self._log_fd, size - start)
+        end = data.rfind(b'\n') + 1  # A line still being written waits for its newline
+        entries = []
+        for line in data[:end].splitlines():
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+        return start + end, entries
+
+    def _reload(self) -> None:
+        """Rebuild usage from the JSON quota file plus the log lines it hasn't folded in yet."""
+        now = datetime.now(self.timezone)
+        day = now.strftime('%Y-%m-%d')
+        if day != self._day:
+            if self._log_fd is not None:
+                os.close(self._log_fd)
+            self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+            self._log_fd = os.open(self._log_path(day), os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            self._day = day
+            tomorrow = now.date() + timedelta(days=1)
+            midnight = self.timezone.localize(datetime(tomorrow.year, tomorrow.month, tomorrow.day))
+            self._day_ends = time.time() + max((midnight - now).total_seconds(), 1.0)
+        with self._locked_file() as file_handle:
+            state, dirty = self._read_state(file_handle)
+            if dirty:
+                self._write_state(file_handle, state)
+            self._state_stat = self._state_signature()
+            self._log_offset, entries = self._read_log(state.get('log_offset', 0))
+        self._used = state['used'] + sum(entry.get('cost', 0) for entry in entries)
+
+    def _refresh(self) -> int:
+        if time.time() >= self._day_ends or self._state_signature() != self._state_stat:
+            # New day, first call, or the JSON changed (a compaction or a plain QuotaManager)
+            self._reload()
+        else:
+            self._log_offset, entries = self._read_log(self._log_offset)
+            self._used += sum(entry.get('cost', 0) for entry in entries)
+        if time.monotonic() >= self._next_flush:
+            self.flush()
+        return min(self._used, self.max_daily_quota)
 
-    def _handle_super_sticker(self, item: Dict[str, Any]) -> tuple:
-        superchat_details = item['snippet'].get('superStickerDetails', {})
-        message = f"Super Sticker: {superchat_details.get('superStickerMetadata', {}).get('altText', '')}"
-        return message, superchat_details.get('amountDisplayString', '')
+    def remaining_quota(self) -> int:
+        return max(self.max_daily_quota - self._refresh(), 0)
 
-    def _handle_new_sponsor(self, item: Dict[str, Any]) -> tuple:
-        return "New Sponsor!", ''
+    def log_consumption(self, cost: int, note: str = '') -> int:
+        self._refresh()
+        entry = {'timestamp': datetime.now(self.timezone).isoformat(), 'cost': cost, 'note': note}
+        os.write(self._log_fd, (json.dumps(entry) + '\n').encode('utf-8'))
+        return self._refresh()
+
+    def flush(self) -> None:
+        """fsync the log and compact it into the JSON quota file."""
+        self._next_flush = time.monotonic() + self.flush_interval
+        if self._log_fd is None:
+            return
+        try:
+            os.fsync(self._log_fd)
+        except OSError:
+            pass
+        with self._locked_file() as file_handle:
+            state, _ = self._read_state(file_handle)
+            if state['date'] != self._day:
+                return  # The day rolled over; this log no longer counts
+            end, entries = self._read_log(state.get('log_offset', 0))
+            if entries:
+                state['used'] = min(self.max_daily_quota, state['used'] + sum(e.get('cost', 0) for e in entries))
+                state['entries'] = (state['entries'] + entries)[-100:]
+            if end != state.get('log_offset', 0):
+                state['log_offset'] = end
+                self._write_state(file_handle, state)
+            self._state_stat = self._state_signature()
+        for old_log in self.storage_path.parent.glob(f'{self.storage_path.stem}.*.log'):
+            if old_log != self._log_path(self._day):
+                try:
+                    old_log.unlink()
+                except OSError:
+                    pass
+
+    def close(self) -> None:
+        self.flush()
+        if self._log_fd is not None:
+            os.close(self._log_fd)
+            self._log_fd = None
+            self._day = None
+
+class PollingPolicy:
+    """
+    Seconds to wait before the next liveChatMessages.list call: the server's
+    pollingIntervalMillis hint, or the remaining quota spread evenly over the
+    expected time left, whichever is longer.
+    """
 
-    def _handle_member_milestone(self, item: Dict[str, Any]) -> tuple:
-        details = item['snippet'].get('memberMilestoneChatDetails', {})
-        months = details.get('memberMonth', '?')
-        message = details.get('userComment', '')
-        return f"Member Milestone ({months} months): {message}" if message else f"Member Milestone ({months} months)", ''
+    MIN_INTERVAL = 5.0
+    name = 'budget'
 
-    def _handle_gift_membership_received(self, item: Dict[str, Any]) -> tuple:
-        details = item['snippet'].get('giftMembershipReceivedDetails', {})
-        gifter = details.get('gifterChannelId', 'Anonymous')
-        tier = details.get('memberLevelName', 'membership')
-        return f"Received gift {tier} from {gifter}", ''
+    def __init__(self, expected_duration: float, call_cost: int) -> None:
+        self.expected_duration = expected_duration
+        self.call_cost = call_cost
 
-    def _handle_membership_gifting(self, item: Dict[str, Any]) -> tuple:
-        details = item['snippet'].get('membershipGiftingDetails', {})
-        count = details.get('giftMembershipsCount', 1)
-        tier = details.get('giftMembershipsLevelName', 'memberships')
-        return f"Gifted {count} {tier}", ''
+    def hint_interval(self, hint_ms: Optional[int]) -> float:
+        return max((hint_ms if hint_ms is not None else 5000) / 1000.0, self.MIN_INTERVAL)
 
-    def _handle_message_deleted(self, item: Dict[str, Any]) -> tuple:
-        return "[Message Deleted]", ''
+    def budget_interval(self, elapsed: float, remaining_quota: int) -> float:
+        """Interval that spends the remaining quota evenly over the expected time left."""
+        remaining_time = max(self.expected_duration - elapsed, self.MIN_INTERVAL)
+        remaining_calls = max(remaining_quota // self.call_cost, 1)
+        return remaining_time / remaining_calls
 
-    def _handle_other_event(self, item: Dict[str, Any]) -> tuple:
-        return f"Other event type: {item['snippet']['type']}", ''
+    def steady_interval(self, hint_ms: Optional[int], elapsed: float, remaining_quota: int) -> float:
+        return max(self.hint_interval(hint_ms), self.budget_interval(elapsed, remaining_quota), self.MIN_INTERVAL)
 
-    def fetch_live_chat(self, video_id: str, flush_interval: int = 300) -> None:
-        timestamp = datetime.now(self.eastern).strftime("%Y%m%d_%H%M%S")
-        filename = f"chat_log_{video_id}_{timestamp}.csv"
+    def interval(self, hint_ms: Optional[int], items: int, elapsed: float, remaining_quota: int) -> float:
+        return self.steady_interval(hint_ms, elapsed, remaining_quota)
+
+    def start(self, plan: 'PollingPlan') -> None:
+        """Called before the first poll with the stream's PollingPlan. This rule re-plans at every poll instead."""
+
+
+class AdaptivePollingPolicy(PollingPolicy):
+    """
+    PollingPolicy that also follows how full the last page was. A full page
+    (the API returns at most 200 items) means messages may be piling up, so
+    the interval is halved; a nearly empty one grows it by half, up to
+    MAX_BACKOFF times the steady interval. In between, it moves halfway back
+    toward the steady interval. It never polls faster than the server hint or
+    half the budget interval, and the budget is recomputed from the quota
+    actually left at every poll, so a busy spell is paid for by slower polling
+    later (and quiet spells bank quota for it) instead of running out early.
+    """
+
+    name = 'adaptive'
+    PAGE_SIZE = 200
+    FULL_FRACTION = 0.9
+    QUIET_FRACTION = 0.1
+    SPEEDUP = 0.5
+    BACKOFF = 1.5
+    MAX_BACKOFF = 3.0
+    # Shortest interval, as a fraction of the even-spending budget interval
+    BURST_BUDGET_FRACTION = 0.5
+
+    def __init__(self, expected_duration: float, call_cost: int) -> None:
+        super().__init__(expected_duration, call_cost)
+        self._interval: Optional[float] = None
+
+    def interval(self, hint_ms: Optional[int], items: int, elapsed: float, remaining_quota: int) -> float:
+        steady = self.steady_interval(hint_ms, elapsed, remaining_quota)
+        previous = self._interval if self._interval is not None else steady
+        fill = items / self.PAGE_SIZE
+        if fill >= self.FULL_FRACTION:
+            target = previous * self.SPEEDUP
+        elif fill <= self.QUIET_FRACTION:
+            target = previous * self.BACKOFF
+        else:
+            target = (previous + steady) / 2
+
+        floor = max(
+            self.hint_interval(hint_ms),
+            self.budget_interval(elapsed, remaining_quota) * self.BURST_BUDGET_FRACTION,
+            self.MIN_INTERVAL,
+        )
+        self._interval = min(max(target, floor), steady * self.MAX_BACKOFF)
+        return self._interval
+
+
+class PollingPlan:
+    """
+    Polling plan for a whole stream, made before its first poll: a steady
+    interval that spends the quota left evenly over the expected duration
+    (never faster than the server hint), plus a reserve of burst polls at
+    the hint interval for when a page comes back full. With a message rate
+    (from QuotaManager.message_rate()), it also forecasts messages per poll
+    and how many won't fit in the 200-item pages; with a rate high enough
+    that pages are full anyway, nothing is held back for bursts.
+    """
+
+    PAGE_SIZE = 200
+    FULL_FRACTION = 0.9
+    RESERVE_FRACTION = 0.2
+
+    def __init__(self, remaining_quota: int, expected_duration: float, call_cost: int,
+                 message_rate: Optional[float], interval: float, burst_interval: float, burst_calls: int) -> None:
+        self.remaining_quota = remaining_quota
+        self.expected_duration = expected_duration
+        self.call_cost = call_cost
+        self.message_rate = message_rate
+        self.interval = interval
+        self.burst_interval = burst_interval
+        self.burst_calls = burst_calls
+
+    @classmethod
+    def make(cls, remaining_quota: int, expected_duration: float, call_cost: int,
+             message_rate: Optional[float] = None, hint_ms: Optional[int] = None) -> 'PollingPlan':
+        hint = max((hint_ms if hint_ms is not None else 5000) / 1000.0, PollingPolicy.MIN_INTERVAL)
+        duration = max(expected_duration, PollingPolicy.MIN_INTERVAL)
+        calls = remaining_quota // call_cost
+        reserve = int(calls * cls.RESERVE_FRACTION)
+        if message_rate is not None and message_rate * duration / max(calls - reserve, 1) >= cls.PAGE_SIZE * cls.FULL_FRACTION:
+            reserve = 0  # Every page would be full: bursts can't catch up, so poll steadily with everything
+        interval = max(duration / max(calls - reserve, 1), hint)
+        if interval <= hint:
+            reserve = 0  # Already polling as fast as allowed
+        return cls(remaining_quota, expected_duration, call_cost, message_rate, interval, hint, reserve)
+
+    @property
+    def steady_calls(self) -> int:
+        return min(int(self.expected_duration // self.interval) + 1, self.remaining_quota // self.call_cost)
+
+    @property
+    def units(self) -> int:
+        """Quota the plan spends if every burst poll is used."""
+        return (self.steady_calls + self.burst_calls) * self.call_cost
+
+    @property
+    def quota_lasts(self) -> float:
+        """Seconds until the quota runs out polling steadily at interval, without bursts."""
+        return (self.remaining_quota // self.call_cost) * self.interval
+
+    @property
+    def messages_per_poll(self) -> Optional[float]:
+        return self.message_rate * self.interval if self.message_rate is not None else None
+
+    @property
+    def missed_fraction(self) -> Optional[float]:
+        """Forecast share of messages that don't fit in one page per steady poll."""
+        per_poll = self.messages_per_poll
+        if per_poll is None:
+            return None
+        return max(1.0 - self.PAGE_SIZE / per_poll, 0.0) if per_poll > 0 else 0.0
+
+    def describe(self) -> str:
+        text = (f"Polling plan: every {self.interval:.1f} s for {self.expected_duration / 3600:.2f} h "
+                f"({self.steady_calls:,} polls, {self.steady_calls * self.call_cost:,} of "
+                f"{self.remaining_quota:,} units left)")
+        if self.burst_calls:
+            text += f", {self.burst_calls:,} burst polls held for full pages"
+        if self.quota_lasts < self.expected_duration:
+            text += f"; quota runs out after {self.quota_lasts / 3600:.2f} h"
+        if self.message_rate is not None:
+            text += f"; at {self.message_rate:.2f} msg/s, ~{self.messages_per_poll:.0f} messages per poll"
+            if self.missed_fraction:
+                text += f", ~{self.missed_fraction:.0%} won't fit in the pages"
+        return text + '.'
+
+
+class PlannedPollingPolicy(PollingPolicy):
+    """
+    Follows the PollingPlan made before the first poll instead of re-planning
+    at every poll: it polls at the plan's steady interval, and after a page
+    that would overflow at that interval spends one of the plan's burst
+    polls at the hint interval. Every REPLAN_INTERVAL seconds it re-plans
+    the rest of the stream from the
+    quota actually left and the message rate seen so far, so usage by other
+    captures, or a chat busier than forecast, is absorbed at a checkpoint.
+    """
+
+    name = 'planned'
+    REPLAN_INTERVAL = 900.0
+
+    def __init__(self, expected_duration: float, call_cost: int) -> None:
+        super().__init__(expected_duration, call_cost)
+        self.plan: Optional[PollingPlan] = None
+        self._bursts = 0
+        self._replan_at = 0.0
+        self._messages = 0
+        self._last_interval: Optional[float] = None
+
+    def start(self, plan: PollingPlan) -> None:
+        self.plan = plan
+        self._bursts = plan.burst_calls
+        self._replan_at = self.REPLAN_INTERVAL
+        self._messages = 0
+        self._last_interval = None
+
+    def interval(self, hint_ms: Optional[int], items: int, elapsed: float, remaining_quota: int) -> float:
+        self._messages += items
+        if self.plan is None or elapsed >= self._replan_at:
+            rate = self._messages / elapsed if elapsed > 0 else (self.plan.message_rate if self.plan else None)
+            self.plan = PollingPlan.make(
+                remaining_quota, self.expected_duration - elapsed, self.call_cost, rate, hint_ms
+            )
+            self._bursts = self.plan.burst_calls
+            self._replan_at = elapsed + self.REPLAN_INTERVAL
+        hint = self.hint_interval(hint_ms)
+        steady = max(self.plan.interval, hint)
+        # Would the page overflow if the next poll waited the steady interval?
+        projected = items * steady / (self._last_interval or steady)
+        if projected >= PollingPlan.PAGE_SIZE * PollingPlan.FULL_FRACTION and self._bursts > 0:
+            self._bursts -= 1
+            self._last_interval = hint
+        else:
+            self._last_interval = steady
+        return self._last_interval
+
+
+# One chat row, in CSV column order: Timestamp (ET), Author, Message, Message Type, SuperChat Amount
+ChatMessage = namedtuple('ChatMessage', ['timestamp', 'author', 'message', 'type', 'superchat_amount'])
+
+
+def convert_to_eastern(timestamp: str) -> str:
+    # Timestamps without an offset are taken as UTC
+    return timefmt.formatter('US/Eastern', timefmt.ZONE_FORMAT).format_iso(timestamp)
+
+
+def _handle_text_message(item: Dict[str, Any]) -> tuple:
+    return item['snippet'].get('displayMessage', ''), ''
+
+
+def _handle_super_chat(item: Dict[str, Any]) -> tuple:
+    superchat_details = item['snippet'].get('superChatDetails', {})
+    return superchat_details.get('userComment', ''), superchat_details.get('amountDisplayString', '')
+
+
+def _handle_super_sticker(item: Dict[str, Any]) -> tuple:
+    superchat_details = item['snippet'].get('superStickerDetails', {})
+    message = f"Super Sticker: {superchat_details.get('superStickerMetadata', {}).get('altText', '')}"
+    return message, superchat_details.get('amountDisplayString', '')
+
+
+def _handle_new_sponsor(item: Dict[str, Any]) -> tuple:
+    return "New Sponsor!", ''
+
+
+def _handle_member_milestone(item: Dict[str, Any]) -> tuple:
+    details = item['snippet'].get('memberMilestoneChatDetails', {})
+    months = details.get('memberMonth', '?')
+    message = details.get('userComment', '')
+    return f"Member Milestone ({months} months): {message}" if message else f"Member Milestone ({months} months)", ''
+
+
+def _handle_gift_membership_received(item: Dict[str, Any]) -> tuple:
+    details = item['snippet'].get('giftMembershipReceivedDetails', {})
+    gifter = details.get('gifterChannelId', 'Anonymous')
+    tier = details.get('memberLevelName', 'membership')
+    return f"Received gift {tier} from {gifter}", ''
+
+
+def _handle_membership_gifting(item: Dict[str, Any]) -> tuple:
+    details = item['snippet'].get('membershipGiftingDetails', {})
+    count = details.get('giftMembershipsCount', 1)
+    tier = details.get('giftMembershipsLevelName', 'memberships')
+    return f"Gifted {count} {tier}", ''
+
+
+def _handle_message_deleted(item: Dict[str, Any]) -> tuple:
+    return "[Message Deleted]", ''
+
+
+def _handle_other_event(item: Dict[str, Any]) -> tuple:
+    return f"Other event type: {item['snippet']['type']}", ''
+
+
+# snippet.type -> handler returning (message, superchat_amount); built once
+# rather than on every message
+MESSAGE_HANDLERS = {
+    'textMessageEvent': _handle_text_message,
+    'superChatEvent': _handle_super_chat,
+    'superStickerEvent': _handle_super_sticker,
+    'newSponsorEvent': _handle_new_sponsor,
+    'memberMilestoneChatEvent': _handle_member_milestone,
+    'giftMembershipReceivedEvent': _handle_gift_membership_received,
+    'membershipGiftingEvent': _handle_membership_gifting,
+    'messageDeletedEvent': _handle_message_deleted,
+}
+
+
+def format_chat_item(item: Dict[str, Any]) -> ChatMessage:
+    """
+    One liveChatMessages item as a CSV row. Shared by the live capture
+    (YouTubeLiveChatFetcher.get_chat_message) and journal replay, so both
+    write the same rows.
+    """
+    snippet = item['snippet']
+    message_type = snippet['type']
+    message, superchat_amount = MESSAGE_HANDLERS.get(message_type, _handle_other_event)(item)
+    return ChatMessage(
+        convert_to_eastern(snippet['publishedAt']),
+        item['authorDetails']['displayName'],
+        message,
+        message_type,
+        superchat_amount,
+    )
+
+
+class ChatPipeline:
+    """
+    Formats, prints and writes chat pages on worker threads, so the polling
+    loop only hands each page off with submit() and its cadence doesn't depend
+    on the terminal or the disk.
+
+    Pages go through a bounded queue to a format worker. The format worker
+    passes each page's rows to a CSV writer worker and a console worker. The
+    CSV path is lossless: if writing falls behind, the queues fill and
+    submit() blocks until there is room, which is counted as backpressure.
+    Console lines are dropped instead when the terminal falls behind.
+    If the format or CSV worker fails, its error is raised by the next
+    submit(), or by close() if no submit() raised it.
+    With a SeenIndex, items whose id was already written are skipped. IDs
+    are only added to the index, and the index saved, by the CSV worker
+    once their rows are flushed, so a saved index never names a message
+    that isn't in the file. Until then, the format worker filters them
+    with an in-memory set.
+    """
+
+    PAGE_QUEUE_SIZE = 64
+    ROW_QUEUE_SIZE = 64
+    PRINT_QUEUE_SIZE = 16
+
+    _DONE = object()
+
+    def __init__(self, writer: csv.writer, file_handle, format_item: Callable[[Dict[str, Any]], ChatMessage],
+                 print_message: Callable[[ChatMessage], None], flush_interval: int = 300, name: str = '',
+                 seen: Optional[SeenIndex] = None) -> None:
+        self.writer = writer
+        self.file_handle = file_handle
+        self.format_item = format_item
+        self.print_message = print_message
+        self.flush_interval = flush_interval
+        self.name = name
+        self.seen = seen
+        self.error: Optional[BaseException] = None  # First error from the format or CSV worker
+        # IDs formatted but not yet flushed and added to seen
+        self._unflushed_ids: Set[str] = set()
+        self._error_raised = False
+
+        self._pages = queue.Queue(self.PAGE_QUEUE_SIZE)
+        self._rows = queue.Queue(self.ROW_QUEUE_SIZE)
+        self._lines = queue.Queue(self.PRINT_QUEUE_SIZE)
+        # Each counter is only updated by one thread
+        self.stats = {
+            'pages': 0,
+            'messages': 0,
+            'format_errors': 0,
+            'duplicates': 0,
+            'rows_written': 0,
+            'lines_printed': 0,
+            'lines_dropped': 0,
+            'page_queue_peak': 0,
+            'blocked_submits': 0,
+            'blocked_seconds': 0.0,
+            'max_lag_seconds': 0.0,
+        }
+        self._threads = [
+            threading.Thread(target=target, name=f"chat-{role}-{name}", daemon=True)
+            for role, target in (('format', self._format_worker), ('write', self._write_worker),
+                                 ('print', self._print_worker))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _raise_error(self) -> None:
+        self._error_raised = True
+        raise self.error
+
+    def submit(self, items: List[Dict[str, Any]]) -> None:
+        """Queue one page of raw liveChatMessage items; blocks only while the queue is full."""
+        if self.error is not None:
+            self._raise_error()
+        entry = (time.time(), items)
+        try:
+            self._pages.put_nowait(entry)
+        except queue.Full:
+            started = time.perf_counter()
+            self.stats['blocked_submits'] += 1
+            while True:
+                try:
+                    self._pages.put(entry, timeout=1.0)
+                    break
+                except queue.Full:
+                    if self.error is not None:
+                        self._raise_error()
+            self.stats['blocked_seconds'] += time.perf_counter() - started
+        self.stats['pages'] += 1
+        self.stats['page_queue_peak'] = max(self.stats['page_queue_peak'], self._pages.qsize())
+
+    def close(self) -> Dict[str, Any]:
+        """Write out everything submitted, stop the workers and return the stats."""
+        while True:
+            try:
+                self._pages.put(self._DONE, timeout=1.0)
+                break
+            except queue.Full:
+                if not self._threads[0].is_alive():
+                    break  # The format worker died, so nothing drains the page queue
+        for thread in self._threads:
+            thread.join()
+        stats = self.stats
+        prefix = f"[{self.name}] " if self.name else ''
+        logging.info(
+            f"{prefix}Pipeline: {stats['rows_written']:,} rows from {stats['pages']:,} pages, "
+            f"page queue peak {stats['page_queue_peak']}/{self.PAGE_QUEUE_SIZE}, "
+            f"blocked {stats['blocked_submits']} times ({stats['blocked_seconds']:.1f} s), "
+            f"max lag {stats['max_lag_seconds']:.2f} s, {stats['lines_dropped']:,} console lines dropped, "
+            f"{stats['duplicates']:,} duplicates skipped"
+        )
+        if self.error is not None and not self._error_raised:
+            self._raise_error()
+        return stats
+
+    def _format_worker(self) -> None:
+        try:
+            while True:
+                entry = self._pages.get()
+                if entry is self._DONE:
+                    break
+                submitted, items = entry
+                rows = []
+                ids = []
+                seen = self.seen
+                for item in items:
+                    message_id = item.get('id') if seen is not None else None
+                    if message_id:
+                        if message_id in self._unflushed_ids or message_id in seen:
+                            self.stats['duplicates'] += 1
+                            continue
+                    try:
+                        rows.append(self.format_item(item))
+                    except Exception as e:
+                        logging.error(f"Error processing message: {e!r}")
+                        self.stats['format_errors'] += 1
+                        continue
+                    if message_id:
+                        self._unflushed_ids.add(message_id)
+                        ids.append(message_id)
+                self.stats['messages'] += len(rows)
+                self._rows.put((submitted, rows, ids))
+                try:
+                    self._lines.put_nowait(rows)
+                except queue.Full:
+                    if not self.stats['lines_dropped']:
+                        logging.warning("Console is falling behind; skipping lines (the CSV still gets every message).")
+                    self.stats['lines_dropped'] += len(rows)
+        except Exception as e:
+            logging.error(f"Chat format worker failed: {e!r}")
+            if self.error is None:
+                self.error = e
+        finally:
+            self._rows.put(self._DONE)
+            self._lines.put(self._DONE)
+
+    def _flush(self, ids: List[str]) -> None:
+        """Flush the CSV, then record the IDs of the rows just flushed in seen and save it."""
+        self.file_handle.flush()  # Flush the file buffer to disk
+        if self.seen is not None:
+            for message_id in ids:
+                self.seen.add(message_id)
+            self.seen.save()
+            self._unflushed_ids.difference_update(ids)  # After the add, so the format worker always finds them
+        ids.clear()
+
+    def _write_worker(self) -> None:
         last_flush_time = time.time()
+        unflushed_ids: List[str] = []
+        failed = False
+        while True:
+            entry = self._rows.get()
+            if entry is self._DONE:
+                break
+            if failed:
+                continue  # Keep draining so the format worker never blocks on a dead writer
+            submitted, rows, ids = entry
+            try:
+                self.writer.writerows(rows)
+                unflushed_ids.extend(ids)
+                current_time = time.time()
+                if current_time - last_flush_time >= self.flush_interval:
+                    self._flush(unflushed_ids)
+                    last_flush_time = current_time
+            except Exception as e:
+                logging.error(f"Error writing chat log: {e}")
+                failed = True
+                if self.error is None:
+                    self.error = e
+                continue
+            self.stats['rows_written'] += len(rows)
+            self.stats['max_lag_seconds'] = max(self.stats['max_lag_seconds'], time.time() - submitted)
+        if not failed:
+            try:
+                self._flush(unflushed_ids)
+            except Exception as e:
+                logging.error(f"Error writing chat log: {e}")
+                if self.error is None:
+                    self.error = e
+
+    def _print_worker(self) -> None:
+        printing = True
+        while True:
+            rows = self._lines.get()
+            if rows is self._DONE:
+                break
+            if not printing:
+                continue
+            try:
+                for chat_message in rows:
+                    self.print_message(chat_message)
+            except OSError:
+                printing = False  # Console went away (e.g. closed pipe); keep capturing
+                continue
+            self.stats['lines_printed'] += len(rows)
+
+
+class YouTubeLiveChatFetcher:
+    # Seconds between updates of the session's record in the quota history
+    HISTORY_INTERVAL = 600
+    # Quota units per API call
+    LIVE_CHAT_MESSAGES_COST = 5
+    VIDEOS_LIST_COST = 1
+
+    def __init__(self, expected_duration_hours: float = 4.0, quota_manager: Optional[QuotaManager] = None,
+                 polling_policy: Optional[PollingPolicy] = None, journal: bool = True, resume: bool = True):
+        self._youtube = None
+        self._youtube_lock = threading.Lock()
+        self.utc = pytz.UTC
+        self.eastern = pytz.timezone('US/Eastern')
+
+        # Configure logging for errors and info, excluding extraneous info in the console output
+        logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+        # Quota management
+        self.MAX_DAILY_QUOTA = 10000
+        self.quota_manager = quota_manager or QuotaManager(
+            max_daily_quota=self.MAX_DAILY_QUOTA,
+            timezone=self.eastern,
+        )
+
+        # Expected live stream duration in seconds
+        self.expected_duration = expected_duration_hours * 3600  # Convert hours to seconds
+        self.polling_policy = polling_policy or PlannedPollingPolicy(
+            self.expected_duration, self.LIVE_CHAT_MESSAGES_COST
+        )
+        # Keep every raw liveChatMessages.list response in chat_journal_*.ndjson.gz (see chat_journal.py)
+        self.journal = journal
+        # Skip messages already written and continue an earlier capture's log (see chat_dedup.py)
+        self.resume = resume
+
+    @property
+    def api_key(self) -> str:
+        """The API key, resolved on first use and cached for the process (see get_youtube_api_key())."""
+        return get_youtube_api_key()
+
+    @property
+    def youtube(self):
+        """googleapiclient service object, built on first use (importing and building it is slow)."""
+        if self._youtube is None:
+            with self._youtube_lock:
+                if self._youtube is None:
+                    from googleapiclient.discovery import build
+
+                    self._youtube = build('youtube', 'v3', developerKey=self.api_key)
+        return self._youtube
+
+    # Row formatting needs no fetcher state; see format_chat_item()
+    convert_to_eastern = staticmethod(convert_to_eastern)
+    get_chat_message = staticmethod(format_chat_item)
+    MESSAGE_HANDLERS = MESSAGE_HANDLERS
+
+    def _chat_log_paths(self, video_id: str, timestamp: Optional[str] = None
+                        ) -> Tuple[str, str, Optional[SeenIndex], bool]:
+        """
+        (CSV path, journal path, seen-ID index, resumed) for a capture of
+        video_id. With resume, a video that already has an index with an
+        existing CSV continues that CSV and journal; otherwise new timestamped
+        files are used.
+        """
+        timestamp = timestamp or datetime.now(self.eastern).strftime("%Y%m%d_%H%M%S")
+        filename = f"chat_log_{video_id}_{timestamp}.csv"
+        journal_path = journal_path_for(video_id, timestamp)
+        if not self.resume:
+            return filename, journal_path, None, False
+
+        seen = SeenIndex(seen_index_path(video_id))
+        if seen.csv_path and os.path.exists(seen.csv_path):
+            logging.info(f"Resuming {seen.csv_path} ({len(seen):,} messages already captured)")
+            return seen.csv_path, seen.journal_path or journal_path, seen, True
+        seen.clear()
+        seen.csv_path, seen.journal_path = filename, journal_path
+        return filename, journal_path, seen, False
+
+    def fetch_live_chat(self, video_id: str, flush_interval: int = 300) -> None:
+        filename, journal_path, seen, resumed = self._chat_log_paths(video_id)
         termination_reason = None  # Variable to hold termination reason
         start_time = time.time()
+        polls = messages = 0
+        next_record = start_time + self.HISTORY_INTERVAL
 
         self.quota_manager.register_session(video_id, self.expected_duration)
 
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
+        with open(filename, 'a' if resumed else 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
-            writer.writerow(['Timestamp (ET)', 'Author', 'Message', 'Message Type', 'SuperChat Amount'])
+            if not resumed:
+                writer.writerow(['Timestamp (ET)', 'Author', 'Message', 'Message Type', 'SuperChat Amount'])
+            pipeline = ChatPipeline(writer, f, self.get_chat_message, self._print_chat_message, flush_interval,
+                                    seen=seen)
+            journal = ResponseJournal(journal_path) if self.journal else None
 
             try:
                 live_chat_id = self._get_live_chat_id(video_id)
@@ -354,15 +1137,22 @@ class YouTubeLiveChatFetcher:
                     logging.info(termination_reason)
                     return
 
+                self._start_polling_plan(self.polling_policy, video_id)
                 chat_response = self._get_initial_chat_response(live_chat_id)
 
                 while chat_response:
+                    polls += 1
+                    messages += len(chat_response.get('items', []))
+                    if time.time() >= next_record:
+                        self._record_session(video_id, start_time, polls, messages)
+                        next_record = time.time() + self.HISTORY_INTERVAL
                     remaining_quota = self.quota_manager.remaining_quota()
                     polling_interval = self._calculate_polling_interval(chat_response, start_time, remaining_quota)
                     try:
-                        last_flush_time = self._process_chat_response(
-                            chat_response, writer, f, last_flush_time, flush_interval
-                        )
+                        if journal:
+                            # Journal the raw response before anything else touches it
+                            journal.record_response(video_id, live_chat_id, chat_response)
+                        pipeline.submit(chat_response['items'])
 
                         if remaining_quota < self.LIVE_CHAT_MESSAGES_COST:
                             termination_reason = "Quota exhausted before next poll."
@@ -407,10 +1197,22 @@ class YouTubeLiveChatFetcher:
                 else:
                     termination_reason = f"HTTP error during setup: {e}"
             finally:
-                if termination_reason:
-                    writer.writerow(['Termination Reason:', termination_reason])
-                    f.flush()  # Ensure it's written to disk
-                logging.info(f"Chat log saved to {filename}")
+                self._record_session(video_id, start_time, polls, messages)
+                self.quota_manager.flush()
+                try:
+                    pipeline.close()  # Write out queued pages before the termination reason
+                except Exception as e:
+                    logging.error(f"An unexpected error occurred: {e}")
+                    termination_reason = termination_reason or f"An unexpected error occurred: {e}"
+                finally:
+                    if termination_reason:
+                        writer.writerow(['Termination Reason:', termination_reason])
+                        f.flush()  # Ensure it's written to disk
+                    if journal:
+                        journal.record_end(termination_reason)
+                        journal.close()
+                        logging.info(f"Raw responses saved to {journal.path}")
+                    logging.info(f"Chat log saved to {filename}")
 
     def _get_live_chat_id(self, video_id: str) -> str:
         request = self.youtube.videos().list(
@@ -484,59 +1286,50 @@ class YouTubeLiveChatFetcher:
         self.quota_manager.log_consumption(cost, note)
         return response
 
+    def _start_polling_plan(self, polling_policy: PollingPolicy, video_id: str) -> PollingPlan:
+        """Plan the stream's polling up front from the quota left and its forecast message rate, and log it."""
+        plan = self.quota_manager.forecast(self.expected_duration, self.LIVE_CHAT_MESSAGES_COST, video_id)
+        logging.info(plan.describe())
+        polling_policy.start(plan)
+        return plan
+
+    def _record_session(self, video_id: str, start_time: float, polls: int, messages: int) -> None:
+        """Save the session's usage so far in the quota history (see QuotaManager.record_session())."""
+        try:
+            self.quota_manager.record_session(
+                video_id, start_time, self.expected_duration, polls,
+                self.VIDEOS_LIST_COST + polls * self.LIVE_CHAT_MESSAGES_COST, messages,
+            )
+        except OSError as e:
+            logging.warning(f"Could not update the quota history: {e}")
+
     def _calculate_polling_interval(
         self,
         chat_response: Dict[str, Any],
         start_time: float,
         remaining_quota: int
     ) -> float:
-        interval_hint_ms = chat_response.get('pollingIntervalMillis', 5000)
-        interval_hint = max(interval_hint_ms / 1000.0, 5.0)
-
         elapsed = max(time.time() - start_time, 0.0)
-        remaining_time = max(self.expected_duration - elapsed, 5.0)
-        remaining_calls = max(remaining_quota // self.LIVE_CHAT_MESSAGES_COST, 1)
-
-        budget_interval = remaining_time / remaining_calls if remaining_calls else remaining_time
-        return max(interval_hint, budget_interval, 5.0)
-
-    def _process_chat_response(self, chat_response: Dict[str, Any], writer: csv.writer,
-                               file_handle, last_flush_time: float, flush_interval: int) -> float:
-        for item in chat_response['items']:
-            try:
-                chat_message = self.get_chat_message(item)
-                self._print_chat_message(chat_message)
-                writer.writerow([
-                    chat_message['timestamp'],
-                    chat_message['author'],
-                    chat_message['message'],
-                    chat_message['type'],
-                    chat_message.get('superchat_amount', '')
-                ])
-            except KeyError as e:
-                logging.error(f"Error processing message: {e}")
-                continue
-
-        current_time = time.time()
-        if current_time - last_flush_time >= flush_interval:
-            file_handle.flush()  # Flush the file buffer to disk
-            last_flush_time = current_time
-
-        return last_flush_time
+        return self.polling_policy.interval(
+            chat_response.get('pollingIntervalMillis'),
+            len(chat_response.get('items', [])),
+            elapsed,
+            remaining_quota,
+        )
 
-    def _handle_http_error(self, e: HttpError) -> None:
-        error_content = e.content.decode('utf-8') if isinstance(e.content, bytes) else str(e.content)
+    @staticmethod
+    def _http_error_reason(e: HttpError) -> Tuple[str, str]:
+        """(reason, message) from the first entry of an HttpError's error details."""
         try:
             error_response = e.error_details[0]
             if isinstance(error_response, dict):
-                reason = error_response.get('reason', '')
-                message = error_response.get('message', '')
-            else:
-                reason = ''
-                message = str(error_response)
+                return error_response.get('reason', ''), error_response.get('message', '')
+            return '', str(error_response)
         except (AttributeError, IndexError, KeyError):
-            reason = ''
-            message = ''
+            return '', ''
+
+    def _handle_http_error(self, e: HttpError) -> None:
+        reason, message = self._http_error_reason(e)
 
         if reason == 'rateLimitExceeded':
             logging.warning("Rate limit exceeded. Waiting before retrying...")
@@ -553,11 +1346,11 @@ class YouTubeLiveChatFetcher:
             print(f"An HTTP error occurred: {reason} - {message}")
             raise UnrecoverableAPIError(f"An HTTP error occurred: {reason} - {message}")
 
-    def _print_chat_message(self, chat_message: Dict[str, Any]) -> None:
-        if chat_message['type'] == 'superChatEvent':
-            print(f"{chat_message['timestamp']} - {chat_message['author']} ({chat_message['type']}): {chat_message['superchat_amount']} - {chat_message['message']}")
+    def _print_chat_message(self, chat_message: ChatMessage) -> None:
+        if chat_message.type == 'superChatEvent':
+            print(f"{chat_message.timestamp} - {chat_message.author} ({chat_message.type}): {chat_message.superchat_amount} - {chat_message.message}")
         else:
-            print(f"{chat_message['timestamp']} - {chat_message['author']} ({chat_message['type']}): {chat_message['message']}")
+            print(f"{chat_message.timestamp} - {chat_message.author} ({chat_message.type}): {chat_message.message}")
 
 def extract_video_id(url_or_id: str) -> str:
     """Extract video ID from YouTube URL or return as-is if already an ID."""
@@ -672,8 +1465,10 @@ def open_terminal_with_ytdlp(video_id: str) -> None:
         logging.warning(f"Unsupported platform: {system}. Please run manually: {base_command}")
 
 def main():
+    prewarm()  # Overlap key resolution and the client import with the prompts
     expected_duration_hours = float(input("Enter expected live stream duration in hours (e.g., 4): "))
-    fetcher = YouTubeLiveChatFetcher(expected_duration_hours=expected_duration_hours)
+    quota_manager = BufferedQuotaManager(timezone=pytz.timezone('US/Eastern'))
+    fetcher = YouTubeLiveChatFetcher(expected_duration_hours=expected_duration_hours, quota_manager=quota_manager)
 
     # Accept full YouTube URL or video ID
     url_input = input("Enter YouTube URL or video ID: ")
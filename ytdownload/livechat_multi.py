@@ -0,0 +1,284 @@
+# livechat_multi.py
+#   - Capture live chat from several streams in one process, sharing one daily quota.
+#   - See README_livechat.md ("Multiple streams") for usage.
+#   - Streams are polled from a single thread in due-time order (a heap), since
+#     the googleapiclient service object is not thread-safe; waiting on the API
+#     dominates, so one thread keeps up with many streams.
+#   - QuotaScheduler splits the remaining quota across streams by activity,
+#     never polling a stream faster than its pollingIntervalMillis hint.
+
+import csv
+import heapq
+import logging
+import re
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pytz
+from googleapiclient.errors import HttpError
+
+from chat_dedup import SeenIndex
+from chat_journal import ResponseJournal
+from livechat import (
+    BufferedQuotaManager,
+    ChatMessage,
+    ChatPipeline,
+    LiveChatEnded,
+    QuotaExceeded,
+    UnrecoverableAPIError,
+    YouTubeLiveChatFetcher,
+    extract_video_id,
+    prewarm,
+)
+
+
+class ChatStream:
+    """Polling state and CSV output for one stream's live chat."""
+
+    def __init__(self, video_id: str, live_chat_id: str, filename: str, fetcher: YouTubeLiveChatFetcher,
+                 flush_interval: int = 300, journal_path: Optional[str] = None,
+                 seen: Optional[SeenIndex] = None, resumed: bool = False) -> None:
+        self.video_id = video_id
+        self.live_chat_id = live_chat_id
+        self.filename = filename
+        self.file = open(filename, 'a' if resumed else 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        if not resumed:
+            self.writer.writerow(['Timestamp (ET)', 'Author', 'Message', 'Message Type', 'SuperChat Amount'])
+        # Formatting, printing and writing run on the pipeline's threads, off the polling loop
+        self.pipeline = ChatPipeline(self.writer, self.file, fetcher.get_chat_message, self._print_message,
+                                     flush_interval, name=video_id, seen=seen)
+        self.journal = ResponseJournal(journal_path) if journal_path else None
+        self.page_token: Optional[str] = None
+        self.hint = QuotaScheduler.MIN_INTERVAL  # Server's pollingIntervalMillis, in seconds
+        self.activity = 0.0  # Smoothed messages per second
+        self.last_poll: Optional[float] = None
+        self.started = time.time()
+        self.messages = 0
+        self.polls = 0
+        self.termination_reason: Optional[str] = None
+
+    def record_poll(self, now: float, items: int, hint_ms: Optional[int]) -> None:
+        if self.last_poll is not None and now > self.last_poll:
+            rate = items / (now - self.last_poll)
+            alpha = QuotaScheduler.ACTIVITY_SMOOTHING
+            self.activity = alpha * rate + (1 - alpha) * self.activity
+        self.last_poll = now
+        self.polls += 1
+        self.messages += items
+        if hint_ms is not None:
+            self.hint = max(hint_ms / 1000.0, QuotaScheduler.MIN_INTERVAL)
+
+    def _print_message(self, chat_message: ChatMessage) -> None:
+        print(f"[{self.video_id}] {chat_message.timestamp} - {chat_message.author} "
+              f"({chat_message.type}): {chat_message.message}")
+
+    def close(self) -> None:
+        try:
+            self.pipeline.close()
+        except Exception as e:
+            logging.error(f"[{self.video_id}] An unexpected error occurred: {e}")
+            self.termination_reason = self.termination_reason or f"An unexpected error occurred: {e}"
+        finally:
+            try:
+                if self.termination_reason:
+                    self.writer.writerow(['Termination Reason:', self.termination_reason])
+            finally:
+                self.file.close()
+                if self.journal:
+                    self.journal.record_end(self.termination_reason)
+                    self.journal.close()
+            logging.info(f"[{self.video_id}] Chat log saved to {self.filename} "
+                         f"({self.messages} messages, {self.polls} polls)")
+
+
+class QuotaScheduler:
+    """
+    Central polling plan for several streams sharing one daily quota.
+    The remaining quota is turned into a call rate for the rest of the
+    session and split across streams in proportion to their recent message
+    rate (with a floor, so quiet streams are still checked). No stream gets
+    more than one call per its server hint; what it can't use goes to the
+    others.
+    """
+
+    MIN_INTERVAL = 5.0
+    # Weight of the latest poll in a stream's smoothed message rate
+    ACTIVITY_SMOOTHING = 0.3
+    # Messages/sec a quiet stream is weighted as, so it still gets a share
+    MIN_ACTIVITY = 0.05
+
+    def __init__(self, call_cost: int, session_seconds: float) -> None:
+        self.call_cost = call_cost
+        self.session_end = time.time() + session_seconds
+
+    def intervals(self, streams: List[ChatStream], remaining_quota: int) -> Dict[str, float]:
+        """Seconds between polls for each stream, keyed by video ID."""
+        remaining_time = max(self.session_end - time.time(), self.MIN_INTERVAL)
+        total_rate = (remaining_quota // self.call_cost) / remaining_time
+        caps = {s.video_id: 1.0 / s.hint for s in streams}
+        weights = {s.video_id: max(s.activity, self.MIN_ACTIVITY) for s in streams}
+
+        # Water-filling: proportional shares, capped, with the excess redistributed
+        rates = {}
+        while weights:
+            weight_sum = sum(weights.values())
+            shares = {vid: total_rate * w / weight_sum for vid, w in weights.items()}
+            capped = [vid for vid, share in shares.items() if share >= caps[vid]]
+            if not capped:
+                rates.update(shares)
+                break
+            for vid in capped:
+                rates[vid] = caps[vid]
+                total_rate -= caps[vid]
+                del weights[vid]
+
+        return {
+            vid: max(1.0 / rate if rate > 0 else remaining_time, self.MIN_INTERVAL)
+            for vid, rate in rates.items()
+        }
+
+
+class MultiStreamChatCapture:
+    """Polls several live chats from one loop, each to its own CSV like fetch_live_chat()."""
+
+    def __init__(self, fetcher: YouTubeLiveChatFetcher, flush_interval: int = 300) -> None:
+        self.fetcher = fetcher
+        self.flush_interval = flush_interval
+        self.scheduler = QuotaScheduler(fetcher.LIVE_CHAT_MESSAGES_COST, fetcher.expected_duration)
+
+    def _open_streams(self, video_ids: List[str]) -> List[ChatStream]:
+        timestamp = datetime.now(self.fetcher.eastern).strftime("%Y%m%d_%H%M%S")
+        streams = []
+        for video_id in video_ids:
+            live_chat_id = self.fetcher._get_live_chat_id(video_id)
+            if not live_chat_id:
+                logging.info(f"[{video_id}] Live chat ID not found; skipping.")
+                continue
+            self.fetcher.quota_manager.register_session(video_id, self.fetcher.expected_duration)
+            filename, journal_path, seen, resumed = self.fetcher._chat_log_paths(video_id, timestamp)
+            streams.append(ChatStream(video_id, live_chat_id, filename, self.fetcher, self.flush_interval,
+                                      journal_path if self.fetcher.journal else None, seen, resumed))
+        return streams
+
+    def _poll(self, stream: ChatStream) -> Dict:
+        kwargs = {'pageToken': stream.page_token} if stream.page_token else {}
+        request = self.fetcher.youtube.liveChatMessages().list(
+            liveChatId=stream.live_chat_id,
+            part="snippet,authorDetails",
+            maxResults=200,
+            **kwargs
+        )
+        return self.fetcher._execute_quota_guarded_request(
+            self.fetcher.LIVE_CHAT_MESSAGES_COST,
+            f"liveChatMessages.list live_chat_id={stream.live_chat_id}",
+            request.execute
+        )
+
+    def run(self, video_ids: List[str]) -> Dict[str, str]:
+        """Capture until every chat ends, the quota runs out or Ctrl+C. Returns {video_id: termination reason}."""
+        streams = self._open_streams(list(dict.fromkeys(video_ids)))
+        active = {stream.video_id: stream for stream in streams}
+        # (due time, tie-breaker, video_id); a stream's entry is pushed back if
+        # its interval grew since it was scheduled
+        heap = [(time.time(), i, stream.video_id) for i, stream in enumerate(streams)]
+        sequence = len(heap)
+        quota_manager = self.fetcher.quota_manager
+
+        def finish(stream: ChatStream, reason: str) -> None:
+            logging.info(f"[{stream.video_id}] {reason}")
+            stream.termination_reason = reason
+            del active[stream.video_id]
+
+        try:
+            while heap:
+                due, _, video_id = heapq.heappop(heap)
+                stream = active[video_id]
+                remaining_quota = quota_manager.remaining_quota()
+                if remaining_quota < self.fetcher.LIVE_CHAT_MESSAGES_COST:
+                    for other in list(active.values()):
+                        finish(other, "Quota exhausted before next poll.")
+                    break
+                if stream.last_poll is not None:
+                    interval = self.scheduler.intervals(list(active.values()), remaining_quota)[video_id]
+                    due = max(due, stream.last_poll + interval)
+                delay = due - time.time()
+                if delay > 0:
+                    if heap and heap[0][0] < due:
+                        # Another stream is due first; come back to this one
+                        heapq.heappush(heap, (due, sequence, video_id))
+                        sequence += 1
+                        continue
+                    time.sleep(delay)
+
+                try:
+                    chat_response = self._poll(stream)
+                except HttpError as e:
+                    try:
+                        self.fetcher._handle_http_error(e)
+                    except (LiveChatEnded, UnrecoverableAPIError) as ex:
+                        finish(stream, str(ex))
+                        continue
+                    # Retryable (rate limit, already waited out): try again later
+                    stream.last_poll = time.time()
+                    heapq.heappush(heap, (stream.last_poll, sequence, video_id))
+                    sequence += 1
+                    continue
+
+                try:
+                    if stream.journal:
+                        stream.journal.record_response(video_id, stream.live_chat_id, chat_response)
+                    stream.pipeline.submit(chat_response['items'])
+                except Exception as e:
+                    # The stream's journal or pipeline failed (e.g. disk full); the others carry on
+                    finish(stream, f"An unexpected error occurred: {e}")
+                    continue
+                stream.record_poll(time.time(), len(chat_response['items']),
+                                   chat_response.get('pollingIntervalMillis'))
+                stream.page_token = chat_response.get('nextPageToken')
+                if not stream.page_token:
+                    finish(stream, "Live chat has ended.")
+                    continue
+                heapq.heappush(heap, (stream.last_poll, sequence, video_id))
+                sequence += 1
+        except QuotaExceeded as ex:
+            for other in list(active.values()):
+                finish(other, str(ex))
+        except KeyboardInterrupt:
+            for other in list(active.values()):
+                finish(other, "Interrupted by user.")
+        finally:
+            try:
+                for stream in streams:
+                    # One stream failing to close mustn't leave the others' files open or sessions unrecorded
+                    try:
+                        stream.close()
+                    except Exception as e:
+                        logging.error(f"[{stream.video_id}] Error closing chat log: {e}")
+                    try:
+                        self.fetcher._record_session(stream.video_id, stream.started, stream.polls, stream.messages)
+                    except Exception as e:
+                        logging.error(f"[{stream.video_id}] Error recording session: {e}")
+            finally:
+                quota_manager.flush()
+        return {stream.video_id: stream.termination_reason for stream in streams}
+
+
+def main():
+    prewarm()  # Overlap key resolution and the client import with the prompts
+    expected_duration_hours = float(input("Enter expected live stream duration in hours (e.g., 4): "))
+    quota_manager = BufferedQuotaManager(timezone=pytz.timezone('US/Eastern'))
+    fetcher = YouTubeLiveChatFetcher(expected_duration_hours=expected_duration_hours, quota_manager=quota_manager)
+
+    urls = input("Enter YouTube URLs or video IDs (separated by spaces or commas): ")
+    video_ids = [extract_video_id(url) for url in re.split(r'[\s,]+', urls.strip()) if url]
+    print(f"\nCapturing live chat for: {', '.join(video_ids)}")
+
+    reasons = MultiStreamChatCapture(fetcher).run(video_ids)
+    for video_id, reason in reasons.items():
+        print(f"{video_id}: {reason}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,337 @@
+# livechat_rest.py
+#   - Async transport for live chat capture: calls the videos.list and
+#     liveChatMessages.list REST endpoints directly over a pooled httpx client,
+#     instead of building the googleapiclient discovery client (slow at startup)
+#     and blocking on request.execute().
+#   - Many streams can be captured at once from one event loop.
+#   - Needs httpx (pip install httpx). YOUTUBE_API_BASE_URL points it at another
+#     server, e.g. livechat_stub_server.py for local testing.
+#   - Usage: python livechat_rest.py
+
+import asyncio
+import copy
+import csv
+import functools
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httplib2
+import pytz
+from googleapiclient.errors import HttpError
+
+from chat_journal import ResponseJournal
+from livechat import (
+    BufferedQuotaManager,
+    ChatPipeline,
+    LiveChatEnded,
+    PollingPolicy,
+    QuotaExceeded,
+    QuotaManager,
+    UnrecoverableAPIError,
+    YouTubeLiveChatFetcher,
+    extract_video_id,
+    prewarm,
+)
+
+API_BASE_URL = 'https://www.googleapis.com/youtube/v3'
+# httpx logs each request URL at INFO, which livechat.py's logging shows; the URL carries the API key
+logging.getLogger('httpx').setLevel(logging.WARNING)
+
+
+def _require_httpx():
+    try:
+        import httpx
+    except ImportError:
+        raise ImportError("The async REST transport requires httpx: pip install httpx") from None
+    return httpx
+
+
+class AsyncYouTubeClient:
+    """
+    The two YouTube Data API calls live chat capture makes, over one pooled
+    httpx.AsyncClient (connections are kept alive and shared by all pollers).
+    Error responses are raised as googleapiclient HttpError with the same
+    resp.status, content and error_details the discovery client gives, so
+    YouTubeLiveChatFetcher._handle_http_error() handles them unchanged.
+    """
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None, max_connections: int = 20,
+                 timeout: float = 30.0) -> None:
+        httpx = _require_httpx()
+        self.api_key = api_key
+        self.base_url = (base_url or os.environ.get('YOUTUBE_API_BASE_URL') or API_BASE_URL).rstrip('/')
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=timeout,
+        )
+
+    async def _get(self, resource: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        response = await self._client.get(f'{self.base_url}/{resource}', params={**params, 'key': self.api_key})
+        if response.status_code >= 400:
+            resp = httplib2.Response({'status': response.status_code})
+            resp.reason = response.reason_phrase
+            raise HttpError(resp, response.content, uri=str(response.url.copy_remove_param('key')))
+        return response.json()
+
+    async def videos_list(self, part: str, video_id: str) -> Dict[str, Any]:
+        return await self._get('videos', {'part': part, 'id': video_id})
+
+    async def live_chat_messages_list(self, live_chat_id: str, part: str, max_results: int = 200,
+                                      page_token: Optional[str] = None) -> Dict[str, Any]:
+        params = {'liveChatId': live_chat_id, 'part': part, 'maxResults': max_results}
+        if page_token:
+            params['pageToken'] = page_token
+        return await self._get('liveChatMessages', params)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+
+class AsyncLiveChatFetcher(YouTubeLiveChatFetcher):
+    """
+    YouTubeLiveChatFetcher over AsyncYouTubeClient: fetch_live_chat() is a
+    coroutine with the same output, quota accounting and termination reasons,
+    so several can run concurrently with asyncio.gather(). The discovery
+    client is never built. Blocking work stays off the event loop, so a slow
+    disk or a full chat pipeline only holds up its own stream: quota and
+    history calls (file locks, fsync) run one at a time on a dedicated
+    thread, journal writes and pipeline hand-offs on the default executor.
+    """
+
+    def __init__(self, expected_duration_hours: float = 4.0, quota_manager: Optional[QuotaManager] = None,
+                 polling_policy: Optional[PollingPolicy] = None, journal: bool = True, resume: bool = True,
+                 client: Optional[AsyncYouTubeClient] = None) -> None:
+        super().__init__(expected_duration_hours, quota_manager, polling_policy, journal, resume)
+        self._client = client
+        # One thread, so the quota manager (not thread-safe when buffered) sees one call at a time
+        self._quota_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='quota')
+
+    async def _quota_call(self, func: Callable[..., Any], *args: Any) -> Any:
+        """func(*args) on the quota thread; for quota manager and quota history calls."""
+        return await asyncio.get_running_loop().run_in_executor(self._quota_executor, functools.partial(func, *args))
+
+    @staticmethod
+    async def _off_loop(func: Callable[..., Any], *args: Any) -> Any:
+        """func(*args) on the default executor; for one stream's file I/O and pipeline hand-offs."""
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+
+    @property
+    def client(self) -> AsyncYouTubeClient:
+        """The REST client, created (and the API key resolved) on first use."""
+        if self._client is None:
+            self._client = AsyncYouTubeClient(self.api_key)
+        return self._client
+
+    async def _execute_quota_guarded_request_async(
+        self,
+        cost: int,
+        note: str,
+        request_callable: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        remaining = await self._quota_call(self.quota_manager.remaining_quota)
+        if remaining < cost:
+            raise QuotaExceeded(
+                f"Quota exhausted: needed {cost} units for {note}, remaining={remaining}."
+            )
+
+        response = await request_callable()
+        await self._quota_call(self.quota_manager.log_consumption, cost, note)
+        return response
+
+    async def _handle_http_error_async(self, e: HttpError) -> None:
+        """_handle_http_error(), waiting out a rate limit without blocking the other pollers."""
+        reason, _ = self._http_error_reason(e)
+        if reason == 'rateLimitExceeded':
+            logging.warning("Rate limit exceeded. Waiting before retrying...")
+            await asyncio.sleep(60)
+            return
+        self._handle_http_error(e)
+
+    async def _get_live_chat_id_async(self, video_id: str) -> str:
+        try:
+            video_response = await self._execute_quota_guarded_request_async(
+                self.VIDEOS_LIST_COST,
+                f"videos.list video={video_id}",
+                lambda: self.client.videos_list("liveStreamingDetails", video_id)
+            )
+        except HttpError as e:
+            logging.error(f"An HTTP error {e.resp.status} occurred while fetching live chat ID:\n{e.content}")
+            return ''
+
+        if 'items' not in video_response or not video_response['items']:
+            logging.error(f"Video with id {video_id} not found or not a live stream.")
+            return ''
+
+        live_details = video_response['items'][0].get('liveStreamingDetails', {})
+        live_chat_id = live_details.get('activeLiveChatId', '')
+        if not live_chat_id:
+            logging.error(f"Video {video_id} has no active live chat. Stream may have ended or not started.")
+        return live_chat_id
+
+    async def _get_chat_response_async(self, live_chat_id: str,
+                                       chat_response: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """The first page (chat_response=None) or the page after chat_response; None if there is none."""
+        if chat_response is not None and 'nextPageToken' not in chat_response:
+            return None
+        page_token = chat_response['nextPageToken'] if chat_response is not None else None
+        kind = 'page' if page_token else 'initial'
+        return await self._execute_quota_guarded_request_async(
+            self.LIVE_CHAT_MESSAGES_COST,
+            f"liveChatMessages.list {kind} live_chat_id={live_chat_id}",
+            lambda: self.client.live_chat_messages_list(
+                live_chat_id, "snippet,authorDetails", 200, page_token
+            )
+        )
+
+    async def fetch_live_chat(self, video_id: str, flush_interval: int = 300) -> None:
+        filename, journal_path, seen, resumed = await self._off_loop(self._chat_log_paths, video_id)
+        termination_reason = None  # Variable to hold termination reason
+        start_time = time.time()
+        # Each stream plans and adapts its own polling interval
+        polling_policy = copy.copy(self.polling_policy)
+        polls = messages = 0
+        next_record = start_time + self.HISTORY_INTERVAL
+
+        await self._quota_call(self.quota_manager.register_session, video_id, self.expected_duration)
+
+        with open(filename, 'a' if resumed else 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if not resumed:
+                writer.writerow(['Timestamp (ET)', 'Author', 'Message', 'Message Type', 'SuperChat Amount'])
+            # Formatting and file/console I/O run on the pipeline's threads; submit() runs
+            # off the event loop too, since it blocks while this stream's queue is full
+            pipeline = ChatPipeline(writer, f, self.get_chat_message, self._print_chat_message,
+                                    flush_interval, name=video_id, seen=seen)
+            journal = ResponseJournal(journal_path) if self.journal else None
+
+            try:
+                live_chat_id = await self._get_live_chat_id_async(video_id)
+                if not live_chat_id:
+                    termination_reason = "Live chat ID not found."
+                    return
+
+                remaining_quota = await self._quota_call(self.quota_manager.remaining_quota)
+                if remaining_quota < self.LIVE_CHAT_MESSAGES_COST:
+                    termination_reason = "No quota available for live chat messages."
+                    logging.info(termination_reason)
+                    return
+
+                await self._quota_call(self._start_polling_plan, polling_policy, video_id)
+                chat_response = await self._get_chat_response_async(live_chat_id)
+
+                while chat_response:
+                    polls += 1
+                    messages += len(chat_response.get('items', []))
+                    if time.time() >= next_record:
+                        await self._quota_call(self._record_session, video_id, start_time, polls, messages)
+                        next_record = time.time() + self.HISTORY_INTERVAL
+                    remaining_quota = await self._quota_call(self.quota_manager.remaining_quota)
+                    polling_interval = polling_policy.interval(
+                        chat_response.get('pollingIntervalMillis'),
+                        len(chat_response.get('items', [])),
+                        max(time.time() - start_time, 0.0),
+                        remaining_quota,
+                    )
+                    try:
+                        if journal:
+                            await self._off_loop(journal.record_response, video_id, live_chat_id, chat_response)
+                        await self._off_loop(pipeline.submit, chat_response['items'])
+
+                        if remaining_quota < self.LIVE_CHAT_MESSAGES_COST:
+                            termination_reason = "Quota exhausted before next poll."
+                            logging.info(termination_reason)
+                            break
+
+                        chat_response = await self._get_chat_response_async(live_chat_id, chat_response)
+
+                    except HttpError as e:
+                        try:
+                            await self._handle_http_error_async(e)
+                        except (LiveChatEnded, QuotaExceeded, UnrecoverableAPIError) as ex:
+                            logging.info(str(ex))
+                            termination_reason = str(ex)
+                            break  # Exit the loop gracefully
+                        await asyncio.sleep(polling_interval)
+                        continue  # Retry after handling the error
+                    except QuotaExceeded as ex:
+                        logging.info(str(ex))
+                        termination_reason = str(ex)
+                        break
+                    except Exception as e:
+                        logging.error(f"An unexpected error occurred: {e}")
+                        termination_reason = f"An unexpected error occurred: {e}"
+                        break
+
+                    if chat_response:
+                        await asyncio.sleep(polling_interval)
+
+            except asyncio.CancelledError:
+                logging.info("Interrupted by user.")
+                termination_reason = "Interrupted by user."
+                raise
+            except QuotaExceeded as ex:
+                logging.info(str(ex))
+                termination_reason = str(ex)
+            except HttpError as e:
+                try:
+                    await self._handle_http_error_async(e)
+                except (LiveChatEnded, QuotaExceeded, UnrecoverableAPIError) as ex:
+                    logging.info(str(ex))
+                    termination_reason = str(ex)
+                else:
+                    termination_reason = f"HTTP error during setup: {e}"
+            finally:
+                await self._quota_call(self._record_session, video_id, start_time, polls, messages)
+                await self._quota_call(self.quota_manager.flush)
+                try:
+                    await self._off_loop(pipeline.close)  # Write out queued pages before the termination reason
+                except Exception as e:
+                    logging.error(f"An unexpected error occurred: {e}")
+                    termination_reason = termination_reason or f"An unexpected error occurred: {e}"
+                finally:
+                    if termination_reason:
+                        writer.writerow(['Termination Reason:', termination_reason])
+                        f.flush()  # Ensure it's written to disk
+                    if journal:
+                        await self._off_loop(journal.record_end, termination_reason)
+                        await self._off_loop(journal.close)
+                        logging.info(f"Raw responses saved to {journal.path}")
+                    logging.info(f"Chat log saved to {filename}")
+
+
+async def capture_streams(fetcher: AsyncLiveChatFetcher, video_ids: List[str]) -> None:
+    """Capture several streams concurrently, sharing the fetcher's client and quota manager."""
+    try:
+        await asyncio.gather(*(fetcher.fetch_live_chat(video_id) for video_id in dict.fromkeys(video_ids)))
+    finally:
+        if fetcher._client is not None:
+            await fetcher._client.aclose()
+
+
+def main():
+    prewarm(discovery=False)  # Resolve the key while prompting; this transport never builds the discovery client
+    expected_duration_hours = float(input("Enter expected live stream duration in hours (e.g., 4): "))
+    quota_manager = BufferedQuotaManager(timezone=pytz.timezone('US/Eastern'))
+    fetcher = AsyncLiveChatFetcher(expected_duration_hours=expected_duration_hours, quota_manager=quota_manager)
+
+    urls = input("Enter YouTube URLs or video IDs (separated by spaces or commas): ")
+    video_ids = [extract_video_id(url) for url in re.split(r'[\s,]+', urls.strip()) if url]
+    print(f"\nCapturing live chat for: {', '.join(video_ids)}")
+    try:
+        asyncio.run(capture_streams(fetcher, video_ids))
+    except KeyboardInterrupt:
+        pass  # Each capture has written its termination reason
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+# livechat_stub_server.py
+#   - Local stand-in for the YouTube Data API endpoints live chat capture uses
+#     (videos.list, liveChatMessages.list), for testing livechat_rest.py
+#     without an API key, quota or a live stream.
+#   - Every video has a live chat that serves --pages pages of --items messages,
+#     then fails with liveChatEnded, using the Data API's error format.
+#     Video IDs select other outcomes:
+#       missing*    no such video (empty items)
+#       quota*      403 quotaExceeded
+#       ratelimit*  403 rateLimitExceeded on the first page, then normal
+#       broken*     400 invalidPageToken (unrecoverable)
+#   - Usage: python livechat_stub_server.py [--port 8765] [--pages 20] [--items 50]
+#     then: YOUTUBE_API_BASE_URL=http://127.0.0.1:8765/youtube/v3 python livechat_rest.py
+
+import argparse
+import json
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ERRORS = {
+    'liveChatEnded': (403, 'The live chat is no longer live.'),
+    'quotaExceeded': (403, 'The request cannot be completed because you have exceeded your quota.'),
+    'rateLimitExceeded': (403, 'The request was sent too quickly.'),
+    'invalidPageToken': (400, 'The request specifies an invalid page token.'),
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Set by make_server()
+    pages = 20
+    items = 50
+    polling_interval_ms = 5000
+    rate_limited = None
+
+    def log_message(self, format, *args):
+        pass  # Keep test output quiet
+
+    def _send(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, reason: str) -> None:
+        status, message = ERRORS[reason]
+        self._send(status, {'error': {
+            'code': status,
+            'message': message,
+            'errors': [{'message': message, 'domain': 'youtube.liveChat', 'reason': reason}],
+        }})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if 'key' not in query:
+            self._send(403, {'error': {'code': 403, 'message': 'API key missing', 'errors': []}})
+        elif url.path.endswith('/videos'):
+            self._videos(query.get('id', ''))
+        elif url.path.endswith('/liveChatMessages'):
+            self._messages(query.get('liveChatId', ''), int(query.get('pageToken') or 0))
+        else:
+            self._send(404, {'error': {'code': 404, 'message': 'Not found', 'errors': []}})
+
+    def _videos(self, video_id: str) -> None:
+        if video_id.startswith('missing'):
+            self._send(200, {'kind': 'youtube#videoListResponse', 'items': []})
+            return
+        self._send(200, {'kind': 'youtube#videoListResponse', 'items': [{
+            'id': video_id,
+            'liveStreamingDetails': {'activeLiveChatId': f'chat-{video_id}'},
+        }]})
+
+    def _messages(self, live_chat_id: str, page: int) -> None:
+        video_id = live_chat_id.removeprefix('chat-')
+        if video_id.startswith('quota'):
+            self._error('quotaExceeded')
+            return
+        if video_id.startswith('broken'):
+            self._error('invalidPageToken')
+            return
+        if video_id.startswith('ratelimit'):
+            with self.rate_limited['lock']:
+                first = video_id not in self.rate_limited['seen']
+                self.rate_limited['seen'].add(video_id)
+            if first:
+                self._error('rateLimitExceeded')
+                return
+        if page >= self.pages:
+            self._error('liveChatEnded')
+            return
+        published = datetime.now(timezone.utc).isoformat()
+        items = [{
+            'kind': 'youtube#liveChatMessage',
+            'id': f'{video_id}.{page}.{i}',
+            'snippet': {
+                'type': 'textMessageEvent',
+                'publishedAt': published,
+                'displayMessage': f'{video_id} page {page} message {i}',
+            },
+            'authorDetails': {'displayName': f'viewer{i}'},
+        } for i in range(self.items)]
+        self._send(200, {
+            'kind': 'youtube#liveChatMessageListResponse',
+            'pollingIntervalMillis': self.polling_interval_ms,
+            'nextPageToken': str(page + 1),
+            'items': items,
+        })
+
+
+def make_server(host: str = '127.0.0.1', port: int = 8765, pages: int = 20, items: int = 50,
+                polling_interval_ms: int = 5000) -> ThreadingHTTPServer:
+    """A stub server (not yet serving); port 0 picks a free port, see server.server_address."""
+    handler = type('ConfiguredStubHandler', (StubHandler,), {
+        'pages': pages,
+        'items': items,
+        'polling_interval_ms': polling_interval_ms,
+        'rate_limited': {'lock': threading.Lock(), 'seen': set()},
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Stub YouTube Data API server for live chat testing')
+    arg_parser.add_argument('--port', type=int, default=8765)
+    arg_parser.add_argument('--pages', type=int, default=20, help='Pages before each chat ends')
+    arg_parser.add_argument('--items', type=int, default=50, help='Messages per page')
+    arg_parser.add_argument('--interval-ms', type=int, default=5000, help='pollingIntervalMillis to return')
+    args = arg_parser.parse_args()
+
+    server = make_server(port=args.port, pages=args.pages, items=args.items, polling_interval_ms=args.interval_ms)
+    host, port = server.server_address[:2]
+    print(f"Serving stub YouTube Data API at http://{host}:{port}/youtube/v3 (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
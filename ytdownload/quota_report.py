@@ -0,0 +1,51 @@
+# quota_report.py
+#   - Quota cost accounting from the per-day history livechat.py keeps in
+#     .youtube_quota_history.json: units used per day, and per capture
+#     session the polls, units, messages and message rate.
+#   - With --hours, also prints the polling plan a capture starting now
+#     would use: interval, quota spent, when the quota runs out, and the
+#     messages per poll forecast from the history's message rate.
+#   - Usage: python quota_report.py [--days 14] [--hours 4 [--video VIDEO_ID]]
+
+import argparse
+
+import pytz
+
+from livechat import QuotaManager, YouTubeLiveChatFetcher
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Report and forecast YouTube API quota use by live chat captures')
+    arg_parser.add_argument('--days', type=int, default=14, help='Days of history to show')
+    arg_parser.add_argument('--hours', type=float, help='Plan a capture of this many hours starting now')
+    arg_parser.add_argument('--video', help='Video ID to forecast from (its own sessions, if any)')
+    arg_parser.add_argument('--quota-file', help='Quota file (default: .youtube_quota.json next to livechat.py)')
+    args = arg_parser.parse_args()
+
+    # Same settings as YouTubeLiveChatFetcher's default quota manager
+    quota_manager = QuotaManager(storage_path=args.quota_file, timezone=pytz.timezone('US/Eastern'))
+
+    history = quota_manager.history()
+    days = list(history.items())[-args.days:]
+    if not days:
+        print(f"No history in {quota_manager.history_path}")
+    for day, record in days:
+        sessions = record['sessions']
+        print(f"\n{day}: {record['used']:,} of {quota_manager.max_daily_quota:,} units used, "
+              f"{len(sessions)} session{'s' if len(sessions) != 1 else ''}")
+        for s in sessions:
+            rate = s['messages'] / s['seconds'] if s['seconds'] else 0.0
+            print(f"  {s['started'][11:16]}  {s['video_id']:<12} {s['seconds'] / 3600:5.2f} h "
+                  f"(expected {s['expected_hours']:.2f})  {s['polls']:>6,} polls  {s['units']:>6,} units  "
+                  f"{s['messages']:>8,} messages  {rate:6.2f} msg/s")
+
+    if args.hours:
+        print()
+        plan = quota_manager.forecast(args.hours * 3600, YouTubeLiveChatFetcher.LIVE_CHAT_MESSAGES_COST, args.video)
+        print(plan.describe())
+        if plan.message_rate is None:
+            print("No sessions in the history yet, so no message rate forecast.")
+
+
+if __name__ == '__main__':
+    main()
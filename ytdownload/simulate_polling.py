@@ -0,0 +1,135 @@
+# simulate_polling.py
+#   - Replays recorded live chat activity against livechat.py's polling
+#     policies and reports, per policy, the quota spent and the messages missed.
+#   - Input: a livechat.py chat log CSV (message arrival times from the
+#     Timestamp (ET) column), or a CSV of "seconds,items" rows giving how many
+#     messages arrived by each time. --synthetic generates a quiet stream with
+#     busy spells instead.
+#   - Model: each poll returns the messages that arrived since the previous
+#     poll, at most one 200-item page; the rest are counted as missed.
+#     Messages after the quota runs out are missed too.
+#   - Usage: python simulate_polling.py [FILE ...] [--synthetic] [--quota N]
+
+import argparse
+import bisect
+import csv
+import random
+from datetime import datetime
+from typing import List
+
+from livechat import AdaptivePollingPolicy, PlannedPollingPolicy, PollingPlan, PollingPolicy
+
+POLICIES = [PollingPolicy, AdaptivePollingPolicy, PlannedPollingPolicy]
+PAGE_SIZE = 200
+CALL_COST = 5
+
+
+def load_arrivals(path: str) -> List[float]:
+    """Sorted message arrival times in seconds from the start of the recording."""
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    if rows and rows[0] and rows[0][0] == 'Timestamp (ET)':
+        times = []
+        for row in rows[1:]:
+            try:
+                # '2024-01-15 14:30:22 EST' -> drop the zone name
+                times.append(datetime.strptime(row[0][:19], '%Y-%m-%d %H:%M:%S').timestamp())
+            except (ValueError, IndexError):
+                continue  # Termination reason row
+        times.sort()
+        return [t - times[0] for t in times] if times else []
+
+    # seconds,items: spread each row's messages evenly since the previous row
+    arrivals = []
+    previous = 0.0
+    for row in rows:
+        try:
+            seconds, items = float(row[0]), int(row[1])
+        except (ValueError, IndexError):
+            continue  # Header
+        step = (seconds - previous) / items if items else 0.0
+        arrivals.extend(previous + step * (i + 1) for i in range(items))
+        previous = seconds
+    return arrivals
+
+
+def synthetic_arrivals(hours: float = 4.0, seed: int = 1) -> List[float]:
+    """Poisson arrivals: ~0.5 msg/s baseline, 40 msg/s for 5 minutes every 40 minutes."""
+    rng = random.Random(seed)
+    arrivals = []
+    t = 0.0
+    end = hours * 3600
+    while t < end:
+        busy = (t % 2400) < 300
+        t += rng.expovariate(40.0 if busy else 0.5)
+        arrivals.append(t)
+    return arrivals
+
+
+def simulate(policy: PollingPolicy, arrivals: List[float], quota: int, hint_ms: int) -> dict:
+    end = arrivals[-1] if arrivals else 0.0
+    # The up-front plan gets the stream's average rate, as history of earlier sessions would give
+    policy.start(PollingPlan.make(quota, policy.expected_duration, CALL_COST,
+                                  len(arrivals) / end if end else None, hint_ms))
+    t = 0.0
+    remaining = quota
+    polls = received = missed = 0
+    delay_total = 0.0
+    index = 0
+    while remaining >= CALL_COST:
+        remaining -= CALL_COST
+        polls += 1
+        upto = bisect.bisect_right(arrivals, t, lo=index)
+        arrived = upto - index
+        got = min(arrived, PAGE_SIZE)
+        # The page holds the newest messages; older ones fell out of it
+        delay_total += sum(t - a for a in arrivals[upto - got:upto])
+        received += got
+        missed += arrived - got
+        index = upto
+        if t >= end:
+            break
+        t += policy.interval(hint_ms, got, t, remaining)
+    missed += len(arrivals) - index
+    return {
+        'polls': polls,
+        'quota': quota - remaining,
+        'received': received,
+        'missed': missed,
+        'mean_delay': delay_total / received if received else 0.0,
+    }
+
+
+def report(label: str, arrivals: List[float], quota: int, hint_ms: int, expected_hours: float = None) -> None:
+    duration = arrivals[-1] if arrivals else 0.0
+    expected = expected_hours * 3600 if expected_hours else duration
+    print(f"\n{label}: {len(arrivals):,} messages over {duration / 3600:.2f} h, quota {quota:,}")
+    print(f"{'policy':<10} {'polls':>7} {'quota':>7} {'received':>9} {'missed':>8} {'missed %':>9} {'delay s':>8}")
+    for policy_class in POLICIES:
+        result = simulate(policy_class(expected, CALL_COST), arrivals, quota, hint_ms)
+        total = result['received'] + result['missed']
+        pct = 100.0 * result['missed'] / total if total else 0.0
+        print(f"{policy_class.name:<10} {result['polls']:>7,} {result['quota']:>7,} {result['received']:>9,} "
+              f"{result['missed']:>8,} {pct:>8.2f}% {result['mean_delay']:>8.1f}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Compare live chat polling policies on recorded activity')
+    arg_parser.add_argument('files', nargs='*', help='chat_log_*.csv files or seconds,items CSVs')
+    arg_parser.add_argument('--synthetic', action='store_true', help='Also run a generated 4 h stream')
+    arg_parser.add_argument('--quota', type=int, default=10000, help='Quota available for the stream')
+    arg_parser.add_argument('--hint-ms', type=int, default=5000, help='pollingIntervalMillis to assume')
+    arg_parser.add_argument('--expected-hours', type=float,
+                            help='Expected duration given to the policies (default: the actual duration)')
+    args = arg_parser.parse_args()
+
+    if not args.files and not args.synthetic:
+        arg_parser.error('give recorded files and/or --synthetic')
+    for path in args.files:
+        report(path, load_arrivals(path), args.quota, args.hint_ms, args.expected_hours)
+    if args.synthetic:
+        report('synthetic', synthetic_arrivals(), args.quota, args.hint_ms, args.expected_hours)
+
+
+if __name__ == '__main__':
+    main()